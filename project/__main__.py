@@ -3,36 +3,140 @@ import sys
 if sys.version_info.major < 3 or sys.version_info.minor < 10:
     raise AssertionError(f"Python version 3.10 is required, you are running: {sys.version}")
 
-from project.scraper import Scraper
 from project.courses import Courses
-from project.data.prefs import browser, notification_method
-from project.utils import read_from_json, save_to_json, encode_string, create_webdriver
+from project.session import SessionCache
+from project.data.prefs import browser, backend, navigation, notification_method, workers, daemon_min_interval,\
+    daemon_max_interval, status_ttl, shared_ttl, metrics_path, driver_profile, batch, checks_per_hour, \
+    pipelined_startup, telegram_commands, mail_digest_window
+from project.utils import read_from_json, save_to_json, encode_string, telegram_chats
+from project.circuit_breaker import CircuitBreaker
+from project.startup import StartupPipeline
+from project.metrics import RunMetrics
+from typing import TYPE_CHECKING
 import logging
+import atexit
 import argparse
 import getpass
-import subprocess
-import time
+
+# The scraping backends pull in selenium or urllib3, they are imported once it is clear which one is needed
+if TYPE_CHECKING:
+    from project.scraper import Scraper
+    from project.status_store import StatusStore
+    from project.shared_cache import SharedResultCache
+    from project.scheduler import SignupScheduler
+    from project.recording import SessionRecording
+    from project.telegram_service import TelegramService
+    from project.mailer import MailDigest
+
+
+def create_scraper(courses: Courses, workers: int, store: 'StatusStore',
+                   shared_cache: 'SharedResultCache | None' = None, breaker: CircuitBreaker | None = None,
+                   scheduler: 'SignupScheduler | None' = None,
+                   recording: 'SessionRecording | None' = None,
+                   pipeline: StartupPipeline | None = None) -> 'Scraper':
+    """
+    Creates a Scraper for the backend set in ./data/prefs.py. The http backend needs a valid saved session, in case
+    there is none the browser is used instead, which saves a new session after logging in.
+
+    Args:
+        courses (Courses): The courses to scrape for.
+        workers (int): The number of sessions that check courses in parallel.
+        store (StatusStore): Where the outcome of every course is kept between runs.
+        shared_cache (SharedResultCache | None, optional): Where outcomes that are the same for every user are
+            shared with other users on this host. Defaults to None.
+        breaker (CircuitBreaker | None, optional): Stops checking while MyTUD is down. Pass the same breaker to
+            every Scraper the daemon creates, so it stays open when a crashed Scraper is replaced. Defaults to None.
+        scheduler (SignupScheduler | None, optional): Picks the courses to check within a budget of checks per
+            hour. Defaults to None.
+        recording (SessionRecording | None, optional): Where the scrape records what it saw of MyTUD, so it can be
+            replayed offline, see project.fakes.replay. Defaults to None.
+        pipeline (StartupPipeline | None, optional): The pipeline that started the program, its browser is used in
+            case it launched one and its metrics hold the startup. Defaults to None.
+
+    Returns:
+        Scraper: The Scraper to use.
+    """
+    metrics: RunMetrics = pipeline.metrics if pipeline is not None else RunMetrics()
+    if backend == "http":
+        from project.http_scraper import HttpScraper
+        scraper: HttpScraper | None = HttpScraper.from_session_cache(SessionCache(), courses, workers=workers,
+                                                                     store=store, ttl=status_ttl,
+                                                                     shared_cache=shared_cache, metrics=metrics,
+                                                                     breaker=breaker, scheduler=scheduler,
+                                                                     recording=recording)
+        if scraper is not None and scraper.has_valid_session():
+            return scraper
+        logging.warning("No valid session for the http backend, logging in with the browser for this run")
+    from project.selenium_scraper import SeleniumScraper
+    from project.utils import create_webdriver
+    driver = pipeline.take_driver() if pipeline is not None else None
+    if driver is None:
+        driver = create_webdriver(browser, metrics=metrics, profile=driver_profile)
+    return SeleniumScraper(driver, courses, workers=workers, session_cache=SessionCache(), navigation=navigation,
+                           profile=driver_profile, batch=batch, store=store, ttl=status_ttl, shared_cache=shared_cache,
+                           metrics=metrics, breaker=breaker, scheduler=scheduler, recording=recording)
 
 
 if __name__ == "__main__":
+    # Created first, so the metrics of the first scrape count from the start of the program
+    pipeline = StartupPipeline(RunMetrics())
+    atexit.register(pipeline.close)
     logging.basicConfig(format='%(asctime)s - %(name)s - %(message)s', level=logging.INFO)
 
     argparser = argparse.ArgumentParser(prog="RegistrateTUD", description="Get informed about upcoming exams!")
     argparser.add_argument("-a", "--add_courses", action="store_const", default=False,
                            help="Add courses to CSV file (default=False)", const=True)
+    argparser.add_argument("-I", "--import", default=None, metavar="PATH", dest="import_path",
+                           help="Adds the courses of a CSV or JSON Lines export to the CSV file, merging duplicates")
     argparser.add_argument("-i", "--initial_setup", action="store_const", default=False,
                            help="Runs the program as if it were the first time", const=True)
     argparser.add_argument("-q", "--quit", action="store_const", default=False,
                            help="Quits the script instantly at the end, without waiting for input", const=True)
+    argparser.add_argument("-w", "--workers", type=int, default=workers,
+                           help=f"Number of sessions that check courses in parallel (default={workers})")
+    argparser.add_argument("-d", "--daemon", action="store_const", default=False, const=True,
+                           help="Keeps running and scrapes again on an interval until stopped (default=False)")
+    argparser.add_argument("-T", "--tenants", action="store_const", default=False, const=True,
+                           help="Scrapes for every tenant in ./project/data/tenants, sharing as many browsers as "
+                                "there are workers (default=False)")
+    argparser.add_argument("-R", "--record", default=None, metavar="PATH",
+                           help="Records the responses and pages of MyTUD during a single run to this file, for "
+                                "replaying with project.fakes.replay")
     args: dict[str] = vars(argparser.parse_args())
     creds: dict[str] = read_from_json()
 
     if browser != "firefox" and browser != "chrome":
         raise ValueError("Browser preference must be firefox or chrome!")
 
+    if backend != "selenium" and backend != "http":
+        raise ValueError("Backend preference must be selenium or http!")
+
     if "t" not in notification_method and "m" not in notification_method:
         raise ValueError("Notification preferences must contain 't', 'm' or both!")
 
+    if pipelined_startup and not args["tenants"]:
+        # The browser starts while the courses and credentials are loaded below, a new login replaces the session
+        if backend == "selenium":
+            pipeline.launch_browser(browser, driver_profile, session_cache=SessionCache(),
+                                    navigate=not args["initial_setup"])
+        pipeline.preload(*[module for letter, module in (("m", "project.mailer"), ("t", "project.telegram_bot"))
+                           if letter in notification_method])
+
+    shared_cache: 'SharedResultCache | None' = None
+    if shared_ttl > 0:
+        from project.shared_cache import SharedResultCache
+        shared_cache = SharedResultCache(ttl=shared_ttl)
+
+    if args["tenants"]:
+        from project.tenants import TenantRegistry
+        from project.browser_pool import BrowserPool
+        from project.tenant_scheduler import TenantScheduler
+        from project.utils import create_webdriver
+        with BrowserPool(lambda: create_webdriver(browser, profile=driver_profile), size=args["workers"]) as pool:
+            TenantScheduler(TenantRegistry().tenants(), pool, backend=backend, navigation=navigation,
+                            ttl=status_ttl, shared_cache=shared_cache).run()
+        sys.exit(0)
+
     courses = Courses.create_courses_from_path("./project/courses.csv")
     if args["initial_setup"]:
         creds: dict[str] = {}
@@ -41,10 +145,14 @@ if __name__ == "__main__":
         net_pass: str = getpass.getpass("Please input the corresponding password (hidden): ")
         creds["net_pass"] = encode_string(net_pass)
         save_to_json(creds)
+        SessionCache().clear()
     if args["add_courses"] or args["initial_setup"]:
         logging.info("Adding courses...")
         courses.input_courses()
         courses.save()
+    if args["import_path"]:
+        courses.import_courses(args["import_path"])
+        courses.save()
 
     if not creds:
         raise ValueError("Credentials cannot be empty!")
@@ -55,16 +163,19 @@ if __name__ == "__main__":
             telegram_token: str = input("Please enter your bot token (check README.md for help): ")
             creds["telegram_token"] = telegram_token
             save_to_json(creds)
-        if creds.get("telegram_id", None) is None:
+        if not telegram_chats(creds):
             logging.warning("Telegram is selected as a notification method, but no telegram_id is set!")
-            print("Starting the telegram init, please register your ID by sending '/start' to the bot")
-            telegram_init = subprocess.Popen([sys.executable, "-m" ,"project.telegram_init"])
-            timeout, t = 300, 0
-            while t < timeout:
-                if read_from_json().get("telegram_id", None) is not None:
-                    telegram_init.terminate()
+            from project.telegram_init import register_chats
+            import asyncio
+            while True:
+                count: str = input("How many chats should receive the notifications? (default=1): ") or "1"
+                if count.isdecimal() and int(count) > 0:
                     break
-                time.sleep(1)
+                print(f"The number of chats must be a whole number of at least 1, not: '{count}'")
+            print("Please register every chat by sending '/start' to the bot within 5 minutes")
+            if not asyncio.run(register_chats(creds["telegram_token"], int(count), timeout=300)):
+                raise ValueError("No chat has been registered for the Telegram notifications!")
+            creds = read_from_json()
 
     if "m" in notification_method:
         if creds.get("sender_mail", None) is None or\
@@ -82,9 +193,58 @@ if __name__ == "__main__":
             creds["receiver_mail"] = input("Please input the receiver email: ")
             save_to_json(creds)
 
-    driver = create_webdriver(browser)
-    scraper = Scraper(driver, courses)
+    from project.status_store import StatusStore
+    store = StatusStore()
+    breaker = CircuitBreaker()
+    scheduler: 'SignupScheduler | None' = None
+    if checks_per_hour > 0:
+        from project.scheduler import SignupScheduler
+        scheduler = SignupScheduler(store, checks_per_hour)
+    if args["daemon"]:
+        if args["record"]:
+            logging.warning("Recording is only supported for a single run, the daemon is not recorded")
+        from project.daemon import WatchDaemon
+        telegram: 'TelegramService | None' = None
+        if "t" in notification_method and telegram_commands:
+            from project.telegram_service import TelegramService
+            try:
+                telegram = TelegramService(creds.get("telegram_token"), telegram_chats(creds))
+                telegram.start()
+            except (ValueError, RuntimeError) as e:
+                logging.warning(f"Not answering Telegram commands: {e}")
+                telegram = None
+        digest: 'MailDigest | None' = None
+        if "m" in notification_method and mail_digest_window > 0:
+            from project.mailer import Mailer, MailDigest
+            from project.utils import decode_string
+            digest = MailDigest(Mailer(creds["receiver_mail"], creds["sender_mail"], decode_string(creds["mail_pass"])),
+                                window=mail_digest_window)
+        daemon = WatchDaemon(lambda: create_scraper(courses, args["workers"], store, shared_cache, breaker, scheduler,
+                                                    pipeline=pipeline),
+                             notification_method, min_interval=daemon_min_interval,
+                             max_interval=daemon_max_interval, metrics_path=metrics_path, telegram=telegram,
+                             digest=digest)
+        try:
+            daemon.run()
+        finally:
+            if telegram is not None:
+                telegram.stop()
+        sys.exit(0)
+
+    recording: 'SessionRecording | None' = None
+    if args["record"]:
+        from project.recording import SessionRecording
+        from project.constants import MYTUD_URL
+        recording = SessionRecording(MYTUD_URL)
+    scraper: 'Scraper' = create_scraper(courses, args["workers"], store, shared_cache, breaker, scheduler, recording,
+                                        pipeline)
     scraper.scrape_for_courses()
+    if recording is not None:
+        recording.save(args["record"])
+        logging.info(f"Recorded {len(recording.exchanges)} responses and {len(recording.snapshots)} pages to "
+                     f"'{args['record']}'")
+    if metrics_path:
+        scraper.metrics.export(metrics_path)
     scraper.notify(notification_method)
 
     logging.info("Script executed successfully!")
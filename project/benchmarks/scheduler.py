@@ -0,0 +1,86 @@
+from project.scheduler import SignupScheduler, YEAR, DAY
+from project.status_store import StatusStore
+from project.status import CourseStatus
+from project.course import Course
+import statistics
+import tempfile
+import argparse
+import logging
+import random
+import os
+
+
+def simulate(courses: int, budget: int, learned: bool, days=16, step=300.0, seed=0) -> dict[str]:
+    """
+    Simulates the SignupScheduler over a sign up period. Half of the courses open within the first two weeks, the
+    other half a quarter later. With a learned history, every course opened around the same date (give or take two
+    days) last year, otherwise the scheduler has no history to go by.
+
+    Args:
+        courses (int): The number of courses.
+        budget (int): The number of checks per hour.
+        learned (bool): Whether the scheduler has last year's history.
+        days (int, optional): How many days to simulate. Defaults to 16.
+        step (float, optional): The seconds between two scrapes. Defaults to 300.0.
+        seed (int, optional): The seed of the opening dates. Defaults to 0.
+
+    Returns:
+        dict[str]: How many courses opened, the mean and 90th percentile of the minutes between a sign up opening
+            and it being noticed, and the checks per hour that were used.
+    """
+    rng: random.Random = random.Random(seed)
+    start: float = 1_700_000_000.0
+    openings: dict[str, float] = {
+        f"SIM{i:04d}": start + (rng.uniform(0, 14) + (0 if i % 2 == 0 else 90)) * DAY for i in range(courses)
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        store: StatusStore = StatusStore(os.path.join(directory, "status.db"))
+        if learned:
+            store.record({code: CourseStatus.CLOSED for code in openings}, start - YEAR - 20 * DAY)
+            for code, opened_at in openings.items():
+                store.record({code: CourseStatus.AVAILABLE}, opened_at - YEAR + rng.uniform(-2, 2) * DAY)
+                store.record({code: CourseStatus.CLOSED}, opened_at - YEAR + 20 * DAY)
+        store.record({code: CourseStatus.CLOSED for code in openings}, start - 1)
+
+        scheduler: SignupScheduler = SignupScheduler(store, budget)
+        remaining: list[Course] = [Course(code, f"Course {code}") for code in openings]
+        latencies: list[float] = []
+        checks: int = 0
+        now: float = start
+        while now < start + days * DAY:
+            for course in scheduler.due(remaining, now):
+                checks += 1
+                is_open: bool = now >= openings[course.code]
+                store.record({course.code: CourseStatus.AVAILABLE if is_open else CourseStatus.CLOSED}, now)
+                if is_open:
+                    latencies.append((now - openings[course.code]) / 60)
+                    remaining.remove(course)
+            now += step
+        store.close()
+
+    latencies.sort()
+    return {
+        "opened": len(latencies),
+        "mean": statistics.mean(latencies) if latencies else 0.0,
+        "p90": latencies[int(len(latencies) * 0.9)] if latencies else 0.0,
+        "checks_per_hour": checks / (days * 24),
+    }
+
+
+if __name__ == "__main__":
+    logging.basicConfig(format='%(asctime)s - %(name)s - %(message)s', level=logging.WARNING)
+
+    argparser = argparse.ArgumentParser(prog="bench_scheduler",
+                                        description="Simulate how fast the SignupScheduler notices opened sign ups")
+    argparser.add_argument("budgets", nargs="*", type=int, default=[10, 20, 40],
+                           help="Checks per hour to simulate (default=10 20 40)")
+    argparser.add_argument("-n", "--courses", type=int, default=40, help="Number of courses (default=40)")
+    argparser.add_argument("-d", "--days", type=int, default=16, help="Days to simulate (default=16)")
+    args: dict[str] = vars(argparser.parse_args())
+
+    print(f"{'budget':>8}{'history':>10}{'opened':>8}{'mean':>10}{'p90':>10}{'checks/h':>10}")
+    for budget in args["budgets"]:
+        for learned in (False, True):
+            result: dict[str] = simulate(args["courses"], budget, learned, args["days"])
+            print(f"{budget:>8}{'learned' if learned else 'none':>10}{result['opened']:>8}{result['mean']:>7.0f}min"
+                  f"{result['p90']:>7.0f}min{result['checks_per_hour']:>10.1f}")
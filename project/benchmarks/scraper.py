@@ -0,0 +1,197 @@
+from project.fakes.mytud import FakeMyTUD, DEFAULT_MIX
+from project.selenium_scraper import SeleniumScraper
+from project.utils import create_webdriver, save_to_json, encode_string
+from project.status import CourseStatus
+from project.courses import Courses
+from project.course import Course
+from typing import TYPE_CHECKING
+import statistics
+import tempfile
+import argparse
+import logging
+import time
+import json
+import os
+
+if TYPE_CHECKING:
+    from selenium.webdriver import Chrome, Firefox
+
+
+# Waits for the load event of the page and returns how long the page took to load in milliseconds and how many bytes
+# the page and its assets transferred, leaving out the requests of the app itself
+PAGE_LOAD_SCRIPT = """
+const done = arguments[arguments.length - 1];
+const report = () => {
+    const page = performance.getEntriesByType('navigation')[0];
+    const assets = performance.getEntriesByType('resource')
+        .filter(entry => entry.initiatorType !== 'fetch' && entry.initiatorType !== 'xmlhttprequest');
+    done([page.loadEventEnd - page.startTime,
+          assets.reduce((total, entry) => total + entry.transferSize, page.transferSize)]);
+};
+if (document.readyState === 'complete') setTimeout(report); else addEventListener('load', () => setTimeout(report));
+"""
+
+
+class TimedSeleniumScraper(SeleniumScraper):
+    """
+    A SeleniumScraper that records how long the login, the batch and every course check through the search bar take.
+    """
+    def __init__(self, *args, **kwargs):
+        """
+        The initialiser method for the TimedSeleniumScraper class, takes the same arguments as SeleniumScraper.
+        """
+        super().__init__(*args, **kwargs)
+        self.login_time: float = 0.0
+        self.batch_time: float = 0.0
+        self.check_times: list[float] = []
+
+    def _login(self) -> None:
+        start: float = time.perf_counter()
+        super()._login()
+        self.login_time = time.perf_counter() - start
+
+    def _check_batch(self, courses: list[Course], timeout=30.0) -> dict[str, CourseStatus]:
+        start: float = time.perf_counter()
+        statuses: dict[str, CourseStatus] = super()._check_batch(courses, timeout)
+        self.batch_time = time.perf_counter() - start
+        return statuses
+
+    def _check_course(self, course: Course) -> CourseStatus:
+        start: float = time.perf_counter()
+        status: CourseStatus = super()._check_course(course)
+        self.check_times.append(time.perf_counter() - start)
+        return status
+
+
+def browser_memory(driver: 'Chrome | Firefox') -> float | None:
+    """
+    Measures the memory of the browser as the proportional set size (PSS) of the webdriver and every process it
+    started, so memory the processes share is not counted more than once. Only works on Linux.
+
+    Args:
+        driver (Chrome | Firefox): The driver of the browser.
+
+    Returns:
+        float | None: The memory in MB, or None in case it cannot be measured on this system.
+    """
+    pids: list[int] = [driver.service.process.pid]
+    total: int = 0
+    try:
+        while pids:
+            pid: int = pids.pop()
+            for task in os.listdir(f"/proc/{pid}/task"):
+                with open(f"/proc/{pid}/task/{task}/children") as f:
+                    pids += [int(child) for child in f.read().split()]
+            with open(f"/proc/{pid}/smaps_rollup") as f:
+                total += next(int(line.split()[1]) for line in f if line.startswith("Pss:"))
+    except (OSError, StopIteration):
+        return None
+    return total / 1024
+
+
+def run(count: int, browser="firefox", navigation="spa", latency=0.0, mix=DEFAULT_MIX, seed=0,
+        profile="standard", batch=True) -> dict[str]:
+    """
+    Scrapes a fake MyTUD with the given number of courses in a headless browser.
+
+    Args:
+        count (int): The number of courses to scrape.
+        browser (str, optional): The browser to use, 'firefox' or 'chrome'. Defaults to "firefox".
+        navigation (str, optional): The navigation of the SeleniumScraper, 'spa' or 'refresh'. Defaults to "spa".
+        latency (float, optional): How many seconds every response of the fake is delayed by. Defaults to 0.0.
+        mix (dict[CourseStatus, float], optional): The result mix of the courses. Defaults to DEFAULT_MIX.
+        seed (int, optional): The seed of the result mix. Defaults to 0.
+        profile (str, optional): The driver profile, see create_webdriver. Defaults to "standard".
+        batch (bool, optional): Whether to check the courses at once before using the search bar, see
+            SeleniumScraper. Defaults to True.
+
+    Raises:
+        RuntimeError: In case the browser could not be started.
+
+    Returns:
+        dict[str]: The timings in seconds, how long a cold load of the login page took and how many bytes it
+            transferred, the memory of the browser in MB after the scrape and the number of courses with a wrong
+            outcome.
+    """
+    expected: dict[str, CourseStatus] = FakeMyTUD.generate_courses(count, mix, seed)
+    courses: Courses = Courses([Course(code, f"Course {code}") for code in expected])
+    with FakeMyTUD(expected, latency=latency) as fake, tempfile.TemporaryDirectory() as directory:
+        creds_path: str = os.path.join(directory, "creds.json")
+        save_to_json({"net_id": fake.credentials[0], "net_pass": encode_string(fake.credentials[1])}, creds_path)
+        driver = create_webdriver(browser, is_headless=True, profile=profile)
+        if driver is None:
+            raise RuntimeError(f"Could not start {browser}, see the README on how to set up the webdriver")
+        scraper = TimedSeleniumScraper(driver, courses, navigation=navigation, base_url=fake.url, batch=batch,
+                                       creds_path=creds_path)
+        try:
+            driver.get(fake.url + "login")
+            page_load, transferred = driver.execute_async_script(PAGE_LOAD_SCRIPT)
+            start: float = time.perf_counter()
+            scraper.scrape_for_courses(close=False)
+            total: float = time.perf_counter() - start
+            memory: float | None = browser_memory(driver)
+        finally:
+            scraper.quit()
+
+    times: list[float] = sorted(scraper.check_times) or [0.0]
+    return {
+        "courses": count,
+        "profile": profile,
+        "total": total,
+        "login": scraper.login_time,
+        "batch": scraper.batch_time,
+        "searched": len(scraper.check_times),
+        "page_load": page_load / 1000,
+        "transferred": int(transferred),
+        "memory": memory,
+        "mean": statistics.mean(times),
+        "median": statistics.median(times),
+        "p95": times[max(0, round(len(times) * 0.95) - 1)],
+        "wrong": sum(scraper.statuses.get(code) != status for code, status in expected.items()),
+    }
+
+
+if __name__ == "__main__":
+    logging.basicConfig(format='%(asctime)s - %(name)s - %(message)s', level=logging.WARNING)
+
+    argparser = argparse.ArgumentParser(prog="bench_scraper", description="Time the SeleniumScraper on a fake MyTUD")
+    argparser.add_argument("sizes", nargs="*", type=int, default=[10, 100, 1000],
+                           help="Numbers of courses to scrape (default=10 100 1000)")
+    argparser.add_argument("-b", "--browser", default="firefox", help="Browser to use (default=firefox)")
+    argparser.add_argument("-n", "--navigation", default="spa", help="Navigation of the scraper (default=spa)")
+    argparser.add_argument("-l", "--latency", type=float, default=0.0, help="Delay per response in seconds")
+    argparser.add_argument("-m", "--mix", type=FakeMyTUD.parse_mix, default=DEFAULT_MIX,
+                           help="Result mix of the courses, like 'closed=0.5,available=0.5'")
+    argparser.add_argument("-p", "--profiles", nargs="+", default=["standard", "lean"],
+                           help="Driver profiles to compare (default=standard lean)")
+    argparser.add_argument("-u", "--ui-only", action="store_true",
+                           help="Check every course through the search bar instead of all at once")
+    argparser.add_argument("-j", "--json", default=None, help="Also write the results to this JSON file")
+    args: dict[str] = vars(argparser.parse_args())
+
+    results: list[dict[str]] = []
+    print(f"{'courses':>8}{'profile':>10}{'total':>11}{'login':>11}{'load':>11}{'kB':>8}{'memory':>10}"
+          f"{'batch':>11}{'searched':>10}{'mean':>11}{'median':>11}{'p95':>11}{'wrong':>7}")
+    for size in args["sizes"]:
+        for profile in args["profiles"]:
+            result: dict[str] = run(size, args["browser"], args["navigation"], args["latency"], args["mix"],
+                                    profile=profile, batch=not args["ui_only"])
+            results.append(result)
+            memory: str = f"{result['memory']:>8.0f}MB" if result["memory"] is not None else f"{'-':>10}"
+            print(f"{result['courses']:>8}{profile:>10}{result['total']:>10.2f}s{result['login']:>10.2f}s"
+                  f"{result['page_load'] * 1000:>9.0f}ms{result['transferred'] / 1000:>8.0f}{memory}"
+                  f"{result['batch']:>10.2f}s{result['searched']:>10}"
+                  f"{result['mean'] * 1000:>9.0f}ms{result['median'] * 1000:>9.0f}ms{result['p95'] * 1000:>9.0f}ms"
+                  f"{result['wrong']:>7}")
+        if len(args["profiles"]) > 1:
+            base, *others = results[-len(args["profiles"]):]
+            for other in others:
+                saved: str = f"{base['memory'] - other['memory']:.0f} MB of memory, " \
+                    if base["memory"] is not None and other["memory"] is not None else ""
+                print(f"{'':>8}{other['profile']} saves {saved}"
+                      f"{(base['page_load'] - other['page_load']) * 1000:.0f} ms of page load and "
+                      f"{(base['transferred'] - other['transferred']) / 1000:.0f} kB per load "
+                      f"compared to {base['profile']}")
+    if args["json"]:
+        with open(args["json"], 'w') as f:
+            json.dump(results, f, indent=4)
@@ -0,0 +1,102 @@
+import subprocess
+import argparse
+import sys
+import os
+
+
+ROOT: str = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class Scenario:
+    """
+    A set of modules that gets imported together on one path through the program, the modules that path should
+    never load and how many microseconds the imports may take at most.
+    """
+    def __init__(self, modules: list[str], forbidden: list[str], budget_us: int):
+        """
+        The initialiser method for the Scenario class.
+
+        Args:
+            modules (list[str]): The modules this path imports.
+            forbidden (list[str]): The top-level packages this path should not load.
+            budget_us (int): The maximum import time of the path in microseconds.
+        """
+        self.modules: list[str] = modules
+        self.forbidden: list[str] = forbidden
+        self.budget_us: int = budget_us
+
+
+# The heavy dependencies, no path should load a dependency it does not use
+HEAVY: list[str] = ["selenium", "telegram", "smtplib", "urllib3", "sqlite3", "pandas", "numpy"]
+
+SCENARIOS: dict[str, Scenario] = {
+    "cli": Scenario(["project.__main__"], HEAVY, 100_000),
+    "mail notification": Scenario(["project.scraper", "project.mailer"],
+                                  [m for m in HEAVY if m != "smtplib"], 150_000),
+    "telegram notification": Scenario(["project.scraper", "project.telegram_bot"],
+                                      [m for m in HEAVY if m != "telegram"], 1_200_000),
+    "telegram commands": Scenario(["project.daemon", "project.telegram_service"],
+                                  [m for m in HEAVY if m != "telegram"], 1_200_000),
+    "http backend": Scenario(["project.http_scraper"], [m for m in HEAVY if m != "urllib3"], 300_000),
+    "selenium backend": Scenario(["project.selenium_scraper"],
+                                 [m for m in HEAVY if m not in ("selenium", "urllib3")], 500_000),
+}
+
+
+def measure(modules: list[str]) -> tuple[int, set[str]]:
+    """
+    Imports the modules in a fresh interpreter with '-X importtime' and reads the report it writes to stderr.
+
+    Args:
+        modules (list[str]): The modules to import.
+
+    Raises:
+        RuntimeError: In case the interpreter fails to import the modules.
+
+    Returns:
+        tuple[int, set[str]]: The total import time in microseconds and the names of all top-level packages that
+            have been imported. Imports done by the interpreter itself at startup (up to and including 'site') are
+            left out.
+    """
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", "; ".join(f"import {m}" for m in modules)],
+                             cwd=ROOT, capture_output=True, text=True)
+    if process.returncode != 0:
+        raise RuntimeError(f"Importing {modules} failed:\n{process.stderr}")
+
+    total: int = 0
+    imported: set[str] = set()
+    started: bool = False
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not started:
+            started = name.strip() == "site" and not name[1:].startswith(" ")
+            continue
+        imported.add(name.strip().split(".")[0])
+        if not name[1:].startswith(" "):
+            total += int(cumulative)
+    return total, imported
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser(prog="bench_startup", description="Check the import time of every path")
+    argparser.add_argument("-r", "--runs", type=int, default=5,
+                           help="Number of fresh interpreters per path, the fastest one counts (default=5)")
+    args: dict[str] = vars(argparser.parse_args())
+
+    failed: bool = False
+    print(f"{'path':<24}{'import time':>14}{'budget':>14}  result")
+    for name, scenario in SCENARIOS.items():
+        results: list[tuple[int, set[str]]] = [measure(scenario.modules) for _ in range(args["runs"])]
+        fastest: int = min(total for total, _ in results)
+        leaked: set[str] = set(scenario.forbidden) & results[0][1]
+        problems: list[str] = []
+        if fastest > scenario.budget_us:
+            problems.append("over budget")
+        if leaked:
+            problems.append(f"imports {', '.join(sorted(leaked))}")
+        failed = failed or bool(problems)
+        print(f"{name:<24}{fastest / 1000:>11.1f} ms{scenario.budget_us / 1000:>11.1f} ms  "
+              f"{'; '.join(problems) or 'ok'}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,163 @@
+from project.constants import MYTUD_URL, LOGIN_URL
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Iterator
+import threading
+import logging
+
+if TYPE_CHECKING:
+    from selenium.webdriver import Chrome, Firefox
+
+
+# Every origin a MyTUD session keeps cookies or storage on, these are wiped before a browser changes hands
+SESSION_ORIGINS: list[str] = [MYTUD_URL, LOGIN_URL]
+
+
+class BrowserPool:
+    """
+    This class keeps a bounded number of browsers alive so they can be handed from one user to the next, instead of
+    starting a browser per user. A browser is wiped of cookies and storage before it changes hands, and a browser
+    that was in use when something went wrong is quit instead of being handed out again.
+    """
+    def __init__(self, create_driver: Callable[[], 'Chrome | Firefox | None'], size=2):
+        """
+        The initialiser method for the BrowserPool class.
+
+        Args:
+            create_driver (Callable[[], Chrome | Firefox | None]): Creates a new browser, like create_webdriver.
+                Browsers are only created once they are needed.
+            size (int, optional): The maximum number of browsers alive at the same time. Defaults to 2.
+        """
+        if size < 1:
+            raise ValueError(f"The pool needs room for at least one browser, not: '{size}'")
+        self.create_driver: Callable[[], 'Chrome | Firefox | None'] = create_driver
+        self.size: int = size
+        self._idle: list['Chrome | Firefox'] = []
+        self._replacements: dict['Chrome | Firefox', 'Chrome | Firefox'] = {}
+        self._alive: int = 0
+        self._closed: bool = False
+        self._condition: threading.Condition = threading.Condition()
+
+    def __enter__(self) -> 'BrowserPool':
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.quit()
+
+    @contextmanager
+    def acquire(self) -> Iterator['Chrome | Firefox']:
+        """
+        Lends a browser for the duration of the with block, waiting in case all browsers are in use. The browser
+        goes back to the pool afterwards, or is quit in case the block raised.
+
+        Raises:
+            RuntimeError: In case the pool has been quit or a new browser could not be created.
+
+        Yields:
+            Chrome | Firefox: A browser without cookies or storage of a previous user.
+        """
+        driver: 'Chrome | Firefox' = self._take()
+        try:
+            yield driver
+        except BaseException:
+            self._discard(self._replaced(driver))
+            raise
+        self._release(self._replaced(driver))
+
+    def replace(self, old: 'Chrome | Firefox', new: 'Chrome | Firefox') -> None:
+        """
+        Takes a new browser in place of a lent one, for a user that had to start a new browser because the lent one
+        stopped responding. The new browser goes back to the pool at the end of the with block instead of the old
+        one, which is quit, so the pool keeps track of every browser it is responsible for.
+
+        Args:
+            old (Chrome | Firefox): The browser the pool lent out.
+            new (Chrome | Firefox): The browser that replaced it.
+        """
+        with self._condition:
+            self._replacements[old] = new
+
+    def quit(self) -> None:
+        """
+        Quits all idle browsers. Browsers that are still lent out are quit when they are returned.
+        """
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._alive -= len(idle)
+            self._condition.notify_all()
+        for driver in idle:
+            self._quit(driver)
+
+    def _take(self) -> 'Chrome | Firefox':
+        with self._condition:
+            self._condition.wait_for(lambda: self._closed or self._idle or self._alive < self.size)
+            if self._closed:
+                raise RuntimeError("The browser pool has been quit")
+            if self._idle:
+                return self._idle.pop()
+            self._alive += 1
+        driver: 'Chrome | Firefox | None' = None
+        try:
+            driver = self.create_driver()
+        finally:
+            if driver is None:
+                with self._condition:
+                    self._alive -= 1
+                    self._condition.notify()
+        if driver is None:
+            raise RuntimeError("Could not create a browser for the pool")
+        return driver
+
+    def _release(self, driver: 'Chrome | Firefox') -> None:
+        if self._closed:
+            self._discard(driver)
+            return
+        try:
+            self._wipe(driver)
+        except Exception as e:
+            logging.warning(f"Could not wipe the browser, quitting it instead: {e!r}")
+            self._discard(driver)
+            return
+        with self._condition:
+            self._idle.append(driver)
+            self._condition.notify()
+
+    def _replaced(self, driver: 'Chrome | Firefox') -> 'Chrome | Firefox':
+        """
+        Returns the browser that replaced a lent browser, quitting the lent one, or the lent browser itself.
+        """
+        with self._condition:
+            new: 'Chrome | Firefox | None' = self._replacements.pop(driver, None)
+        if new is None:
+            return driver
+        self._quit(driver)
+        return new
+
+    def _discard(self, driver: 'Chrome | Firefox') -> None:
+        with self._condition:
+            self._alive -= 1
+            self._condition.notify()
+        self._quit(driver)
+
+    @staticmethod
+    def _wipe(driver: 'Chrome | Firefox') -> None:
+        """
+        Removes the cookies and storage of the previous user. WebDriver can only delete the cookies of the page that
+        is open, so every session origin is visited. Chrome can clear all cookies at once, which also covers origins
+        MyTUD might redirect to in the future.
+        """
+        from selenium.webdriver import Chrome
+        if isinstance(driver, Chrome):
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        for origin in SESSION_ORIGINS:
+            driver.get(origin)
+            driver.delete_all_cookies()
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        driver.get("about:blank")
+
+    @staticmethod
+    def _quit(driver: 'Chrome | Firefox') -> None:
+        try:
+            driver.quit()
+        except Exception as e:
+            logging.debug(f"Could not quit the browser cleanly: {e!r}")
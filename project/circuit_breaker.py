@@ -0,0 +1,91 @@
+import threading
+import logging
+import time
+
+
+class CircuitBreaker:
+    """
+    This class stops a Scraper from hammering MyTUD while it is down. After a number of checks in a row failed, even
+    after retrying, the breaker opens and no further checks are allowed until a cool down has passed. Then a single
+    check is let through (the breaker is half-open) and every other caller is refused until that trial check
+    reports back: in case it succeeds the breaker closes again, otherwise it stays open for another cool down. The
+    breaker is thread safe, so parallel workers and tenants can share one.
+    """
+    def __init__(self, threshold=5, cooldown=600.0):
+        """
+        The initialiser method for the CircuitBreaker class.
+
+        Args:
+            threshold (int, optional): The number of failures in a row that opens the breaker. Defaults to 5.
+            cooldown (float, optional): How many seconds the breaker stays open before it lets a check through.
+                Defaults to 600.0.
+        """
+        if threshold < 1:
+            raise ValueError(f"The threshold must be at least 1, not: '{threshold}'")
+        self.threshold: int = threshold
+        self.cooldown: float = cooldown
+        self.failures: int = 0
+        self._opened_at: float | None = None
+        self._trial_at: float | None = None
+        self._lock: threading.Lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self.retry_in > 0
+
+    @property
+    def retry_in(self) -> float:
+        """
+        Returns:
+            float: How many seconds are left until the breaker lets a check through, 0 when it is closed or a trial
+                check can be made.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return 0.0
+            since: float = self._opened_at if self._trial_at is None else self._trial_at
+            return max(0.0, since + self.cooldown - time.monotonic())
+
+    def allow(self) -> bool:
+        """
+        Asks whether a check may be done now. Once the cool down has passed, only the first caller gets through as the
+        trial check, which has to report back with record_success or record_failure. In case it never does, for
+        example because its thread died, another trial is let through after one more cool down.
+
+        Returns:
+            bool: Whether a check may be done now.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            now: float = time.monotonic()
+            if now < self._opened_at + self.cooldown:
+                return False
+            if self._trial_at is not None and now < self._trial_at + self.cooldown:
+                return False
+            self._trial_at = now
+            logging.info("Letting a trial check through to see whether MyTUD is reachable again")
+            return True
+
+    def record_success(self) -> None:
+        """
+        Closes the breaker, MyTUD is reachable again.
+        """
+        with self._lock:
+            if self._opened_at is not None:
+                logging.info("MyTUD is reachable again, resuming checks")
+            self.failures = 0
+            self._opened_at = None
+            self._trial_at = None
+
+    def record_failure(self) -> None:
+        """
+        Counts a failed check and opens the breaker once the threshold has been reached.
+        """
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.threshold:
+                self._opened_at = time.monotonic()
+                self._trial_at = None
+                logging.warning(f"MyTUD failed {self.failures} times in a row, pausing checks for "
+                                f"{self.cooldown:.0f} seconds")
@@ -1,9 +1,55 @@
 # URLs
+MYTUD_URL = "https://my.tudelft.nl/"
+SIGN_UP_PATH = "#/inschrijven/cursus/:id"
 SIGN_UP_URL = "https://my.tudelft.nl/#/inschrijven/cursus/:id"
+LOGIN_URL = "https://login.tudelft.nl/"
+
+# MyTUD (OSIRIS) JSON endpoints, relative to MYTUD_URL
+API_SESSION_PATH = "student/osiris/owninfo"
+API_SEARCH_PATH = "student/osiris/student/cursussen_voor_cursusinschrijving/zoeken/"
+API_COURSE_PATH = "student/osiris/student/cursussen_voor_cursusinschrijving/{id}"
 
 # Identifiable strings
 NO_COURSES_FOUND = "Geen zoekresultaten"
 CLOSED_SIGNUP = "Inschrijving is gesloten"
 UNABLE_TO_SIGNUP = "Helaas"
 SIGNUP_AVAILABLE = "Selecteer een toetsgelegenheid"
-NOT_IN_PROGRAM = "geen deel uit van het vaste deel van je examenprogramma"
\ No newline at end of file
+NOT_IN_PROGRAM = "geen deel uit van het vaste deel van je examenprogramma"
+
+# Lean driver profile, the scraper only reads text so images, fonts and stylesheets are not downloaded
+LEAN_BLOCKED_URLS = [
+    "*.css", "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.webp", "*.ico",
+]
+LEAN_CHROME_ARGUMENTS = [
+    "--disable-extensions", "--disable-component-extensions-with-background-pages", "--disable-default-apps",
+    "--disable-background-networking", "--disable-component-update", "--disable-sync", "--disable-translate",
+    "--disable-features=Translate,MediaRouter,OptimizationHints", "--disable-gpu", "--no-first-run",
+    "--mute-audio", "--blink-settings=imagesEnabled=false", "--renderer-process-limit=1",
+]
+LEAN_CHROME_PREFERENCES = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.default_content_setting_values.notifications": 2,
+}
+LEAN_FIREFOX_PREFERENCES = {
+    "permissions.default.image": 2,
+    "gfx.downloadable_fonts.enabled": False,
+    "browser.display.use_document_fonts": 0,
+    "extensions.enabledScopes": 0,
+    "extensions.autoDisableScopes": 15,
+    "extensions.update.enabled": False,
+    "extensions.pocket.enabled": False,
+    "app.update.auto": False,
+    "browser.safebrowsing.malware.enabled": False,
+    "browser.safebrowsing.phishing.enabled": False,
+    "browser.safebrowsing.downloads.enabled": False,
+    "datareporting.healthreport.uploadEnabled": False,
+    "datareporting.policy.dataSubmissionEnabled": False,
+    "toolkit.telemetry.enabled": False,
+    "network.prefetch-next": False,
+    "network.dns.disablePrefetch": True,
+    "network.http.speculative-parallel-limit": 0,
+    "media.autoplay.default": 5,
+    "dom.ipc.processCount": 1,
+    "fission.autostart": False,
+}
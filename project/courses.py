@@ -1,22 +1,42 @@
-import pandas as pd
-import numpy as np
 import logging
+import json
+import itertools
+import csv
 import os
+import re
 from project.course import Course
+from typing import Iterator
+
+
+# The column names (or JSON keys) of the course code, name and completion in an export, compared in lower case
+IMPORT_CODE_KEYS: tuple[str, ...] = ("code", "course code", "course_code", "coursecode", "course")
+IMPORT_NAME_KEYS: tuple[str, ...] = ("name", "course name", "course_name", "title")
+IMPORT_COMPLETED_KEYS: tuple[str, ...] = ("completed", "passed", "done")
+# The values that mark a course as completed, in the courses.csv and in an export, compared in lower case
+COMPLETED_VALUES: tuple[str, ...] = ("true", "1", "yes", "y", "passed")
+# A normalised TU Delft course code, letters followed by letters, digits and hyphens of which at least one digit,
+# like 'CSE1100', 'AESB1210', 'AE1110-I', 'AR1A010' or 'EE4C12'
+COURSE_CODE_PATTERN: re.Pattern = re.compile(r"[A-Z]{2,}[A-Z0-9-]*\d[A-Z0-9-]*")
 
 
 class Courses:
     """
-    This class keeps track of all the courses the user has input in a list filled with Course objects.
+    This class keeps track of all the courses the user has input in a list filled with Course objects. Next to the
+    list, the courses are indexed by their code, so looking a course up and detecting duplicates does not require
+    going through the whole list.
     """
     def __init__(self, courses: list[Course]) -> None:
         """
         The initialiser for the Courses class.
 
         Args:
-            courses (list[Course]): A list of courses in the form of a Course object.
+            courses (list[Course]): A list of courses in the form of a Course object. In case a code occurs more
+                than once, only the first course with that code is kept.
         """
-        self.courses: list[Course] = courses
+        self.courses: list[Course] = []
+        self._index: dict[str, Course] = {}
+        for course in courses:
+            self.add(course)
 
     def __str__(self) -> str:
         """
@@ -31,6 +51,24 @@ class Courses:
             _ += f"{course.__str__()}\n"
         return _[:-1]
 
+    def __contains__(self, code: str) -> bool:
+        return self._key(code) in self._index
+
+    def __len__(self) -> int:
+        return len(self.courses)
+
+    def get(self, code: str) -> Course | None:
+        """
+        Looks a course up by its code.
+
+        Args:
+            code (str): The course code, case insensitive.
+
+        Returns:
+            Course | None: The course with the code, or None in case there is no such course.
+        """
+        return self._index.get(self._key(code))
+
     def input_courses(self) -> None:
         """
         Prompt the user to input additional courses. This function is run when the '-i' or '-a' argument is passed.
@@ -50,15 +88,17 @@ class Courses:
             print(new_course)
             retry = input("Is this course correct? (y/n): ")
             if retry.lower() == "y":
-                self.courses.append(new_course)
+                if not self.add(new_course):
+                    print(f"'{code}' has already been added!")
                 add_another = input("Are these all the courses you want to add? (y/n): ")
                 if add_another.lower() == "y":
                     break
     
-    def add(self, course: Course) -> None:
+    def add(self, course: Course) -> bool:
         """
         A shortcut for self.courses.append(). Mostly used to avoid awkwardness in cases when appending to
-        variables like all_courses, which would look like: all_courses.courses.append(course).
+        variables like all_courses, which would look like: all_courses.courses.append(course). Courses with a code
+        that is already in the list are not added again.
 
         Args:
             course (Course): The Course object to append to the courses list.
@@ -66,19 +106,81 @@ class Courses:
         Raises:
             ValueError: In case the course provided is not a Course object. This prevents everything from
                 breaking, down the line.
+
+        Returns:
+            bool: Whether the course has been added, False in case a course with the same code already exists.
         """
-        if isinstance(course, Course):
-            self.courses.append(course)
-        else:
+        if not isinstance(course, Course):
             raise ValueError(f"Course must be of class '{type(Course)}'")
+        key: str = self._key(course.code)
+        if key in self._index:
+            logging.warning(f"'{course.code}' is already in the courses, not adding it again")
+            return False
+        self._index[key] = course
+        self.courses.append(course)
+        return True
 
-    def save(self) -> None:
+    def import_courses(self, path: str) -> dict[str, int]:
         """
-        Converts the current courses in the list to a pandas DataFrame and saves it to a .csv.
+        Adds the courses of an export, like a programme export or a study guide dump, to the courses. The file is
+        read row by row, so only the courses themselves are kept in memory, not the rows. CSV files with a header
+        need a code column (see IMPORT_CODE_KEYS), files without one list the code, name and completion of a course
+        per row. JSON Lines files (.jsonl or
+        .ndjson) need an object per line with a code key. Codes are normalised (see normalise_code) and rows with
+        a code that does not look like one are skipped. In case a course is already known, it becomes completed
+        when any of its rows says so and it gets a name in case it had none. Call save() afterwards to write the
+        result.
+
+        Args:
+            path (str): The path to the export.
+
+        Raises:
+            ValueError: In case the file is not a .csv, .jsonl or .ndjson file.
+
+        Returns:
+            dict[str, int]: The number of rows that added a course, that merged into a known course and that were
+                skipped.
+        """
+        match os.path.splitext(path)[1].lower():
+            case ".csv":
+                rows: Iterator[tuple[str, str, bool]] = self._read_import_csv(path)
+            case ".jsonl" | ".ndjson":
+                rows = self._read_import_jsonl(path)
+            case extension:
+                raise ValueError(f"Import file must be a .csv, .jsonl or .ndjson, is '{extension}'")
+        counts: dict[str, int] = {"added": 0, "merged": 0, "skipped": 0}
+        for code, name, completed in rows:
+            code = self.normalise_code(code)
+            if not COURSE_CODE_PATTERN.fullmatch(code):
+                logging.warning(f"Skipping '{code}' in '{path}', it is not a course code")
+                counts["skipped"] += 1
+                continue
+            course: Course | None = self._index.get(code)
+            if course is None:
+                self.add(Course(code, name.strip(), completed))
+                counts["added"] += 1
+                continue
+            if completed and not course.completed:
+                course.complete()
+            if name.strip() and not course.name:
+                course.name = name.strip()
+            counts["merged"] += 1
+        logging.info(f"Imported '{path}': {counts['added']} courses added, {counts['merged']} rows merged into "
+                     f"known courses, {counts['skipped']} rows skipped")
+        return counts
+
+    def save(self, path="./project/courses.csv") -> None:
+        """
+        Saves the current courses in the list to a .csv. The file keeps the layout of the files earlier versions
+        wrote with pandas (an unnamed index column followed by Code, Name and Completed), so they stay compatible.
+
+        Args:
+            path (str, optional): The path to save the csv file to. Defaults to "./project/courses.csv".
         """
-        course_array: np.ndarray = np.array([[course.code, course.name, course.completed] for course in self.courses])
-        course_df: pd.DataFrame = pd.DataFrame(course_array, columns=["Code", "Name", "Completed"])
-        course_df.to_csv("./project/courses.csv")
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(["", "Code", "Name", "Completed"])
+            writer.writerows([i, course.code, course.name, course.completed] for i, course in enumerate(self.courses))
 
     def get_incomplete(self) -> 'Courses':
         """
@@ -93,15 +195,114 @@ class Courses:
         return Courses(incomplete_courses)
 
     @staticmethod
-    def _read_csv_to_array() -> np.ndarray:
+    def _key(code: str) -> str:
         """
-        A static method that returns a numpy.ndarray with all of the course information. Should not be called
-        directly since it is used when creating new Courses objects.
+        Returns the key a course code is indexed by. MyTUD does not distinguish between cases, so neither does this.
+        """
+        return Courses.normalise_code(code)
+
+    @staticmethod
+    def normalise_code(code: str) -> str:
+        """
+        Returns a course code the way MyTUD lists it, in upper case and without any whitespace, so 'cse 1100 ' and
+        'CSE1100' are the same course.
+
+        Args:
+            code (str): The course code.
+
+        Returns:
+            str: The normalised course code.
+        """
+        return "".join(code.split()).upper()
+
+    @staticmethod
+    def _parse_completed(value: str | bool | int | None) -> bool:
+        """
+        Reads whether a course is completed from a CSV cell or a JSON value, see COMPLETED_VALUES.
+
+        Args:
+            value (str | bool | int | None): The cell or value, None in case it is missing.
 
         Returns:
-            np.ndarray: An array containing all saved course information.
+            bool: Whether the course is completed.
+        """
+        if isinstance(value, str):
+            return value.strip().lower() in COMPLETED_VALUES
+        return bool(value)
+
+    @staticmethod
+    def _read_import_csv(path: str) -> Iterator[tuple[str, str, bool]]:
+        """
+        Reads a CSV export row by row, see import_courses. In case the first row has no known code column, the file
+        has no header and the first row is a course as well.
+
+        Yields:
+            tuple[str, str, bool]: The code, name and completion of a course.
+        """
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            reader = csv.reader(f)
+            first: list[str] = next(reader, [])
+            header: list[str] = [column.strip().lower() for column in first]
+            columns: list[int | None] = [next((header.index(key) for key in keys if key in header), None)
+                                         for keys in (IMPORT_CODE_KEYS, IMPORT_NAME_KEYS, IMPORT_COMPLETED_KEYS)]
+            rows: Iterator[list[str]] = reader
+            if columns[0] is None:
+                columns = [0, 1, 2]
+                rows = itertools.chain([first], reader)
+            for row in rows:
+                code, name, completed = [row[column] if column is not None and column < len(row) else ""
+                                         for column in columns]
+                yield code, name, Courses._parse_completed(completed)
+
+    @staticmethod
+    def _read_import_jsonl(path: str) -> Iterator[tuple[str, str, bool]]:
+        """
+        Reads a JSON Lines export line by line, see import_courses. Lines that are not a JSON object with a code are
+        skipped.
+
+        Yields:
+            tuple[str, str, bool]: The code, name and completion of a course.
+        """
+        with open(path, encoding='utf-8-sig') as f:
+            for number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    logging.warning(f"Skipping line {number} of '{path}', it is not valid JSON: {e}")
+                    continue
+                if not isinstance(row, dict):
+                    continue
+                row = {str(key).strip().lower(): value for key, value in row.items()}
+                code, name, completed = [next((row[key] for key in keys if row.get(key) is not None), None)
+                                         for keys in (IMPORT_CODE_KEYS, IMPORT_NAME_KEYS, IMPORT_COMPLETED_KEYS)]
+                if code is not None:
+                    yield str(code), str(name or ""), Courses._parse_completed(completed)
+
+    @staticmethod
+    def _read_csv_rows(path: str) -> Iterator[tuple[str, str, bool]]:
+        """
+        A static method that reads the csv file row by row and yields the course information of every row. Should
+        not be called directly since it is used when creating new Courses objects. Files with and without the index
+        column in front are both supported.
+
+        Args:
+            path (str): The path to the csv file.
+
+        Yields:
+            tuple[str, str, bool]: The code, name and completion of a course.
         """
-        return pd.read_csv("./project/courses.csv", names=["Code", "Name", "Completed"], header=0).to_numpy()
+        with open(path, newline='') as f:
+            reader = csv.reader(f)
+            header: list[str] | None = next(reader, None)
+            if header is None:
+                return
+            offset: int = max(len(header) - 3, 0)
+            for row in reader:
+                row = row[offset:] + [""] * (3 - len(row[offset:]))
+                if row[0]:
+                    yield row[0], row[1], Courses._parse_completed(row[2])
 
     @staticmethod
     def create_courses_from_path(path="./project/courses.csv") -> 'Courses':
@@ -124,7 +325,6 @@ class Courses:
         if not os.path.exists(path):
             logging.warning("No data file found! Creating empty object")
             return Courses([])
-        arr: np.ndarray = Courses._read_csv_to_array()
-        courses: list[Courses] = [Course(row[0], row[1], bool(row[2])) for row in arr]
+        courses: list[Course] = [Course(code, name, completed) for code, name, completed in Courses._read_csv_rows(path)]
         logging.info("Created courses from file")
         return Courses(courses)
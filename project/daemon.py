@@ -0,0 +1,153 @@
+from project.scraper import Scraper
+from project.status import CourseStatus
+from typing import TYPE_CHECKING, Callable
+import threading
+import logging
+import signal
+
+if TYPE_CHECKING:
+    from project.telegram_service import TelegramService
+    from project.mailer import MailDigest
+
+
+class WatchDaemon:
+    """
+    This class keeps a single Scraper, and with it a logged in browser, alive and scrapes again on an interval. The
+    interval tightens when the status of a course changes or a course shows a closed sign up (which means MyTUD
+    already lists the course, so the sign up could open soon) and relaxes while nothing changes. While the
+    CircuitBreaker of the Scraper is open, the daemon waits at least until it lets a check through again. With a
+    SignupScheduler, the daemon instead wakes up when the scheduler has the next course due. With a TelegramService,
+    the results of every scrape are handed to the bot, which answers commands from them in between scrapes. With a
+    MailDigest, the emails of the changes are collected into digests.
+    """
+    def __init__(self, create_scraper: Callable[[], Scraper], method: str, min_interval=300.0, max_interval=3600.0,
+                 backoff=1.5, metrics_path="", telegram: 'TelegramService | None' = None,
+                 digest: 'MailDigest | None' = None):
+        """
+        The initialiser method for the WatchDaemon class.
+
+        Args:
+            create_scraper (Callable[[], Scraper]): Creates a new Scraper. Called at the start and again whenever the
+                Scraper crashed, for example because the browser was closed.
+            method (str): User specified method of notification. Should be set in ./data/prefs.py.
+            min_interval (float, optional): The shortest time in seconds between two scrapes. Defaults to 300.0.
+            max_interval (float, optional): The longest time in seconds between two scrapes. Defaults to 3600.0.
+            backoff (float, optional): The factor the interval grows or shrinks by per scrape. Defaults to 1.5.
+            metrics_path (str, optional): The directory the metrics of every scrape are exported to, see
+                RunMetrics.export. Defaults to "", not exporting.
+            telegram (TelegramService | None, optional): A running Telegram bot to hand the results to and to send
+                the Telegram notifications through. Defaults to None.
+            digest (MailDigest | None, optional): Collects the emails of the changes into digests, the last one is
+                sent when the daemon stops. Defaults to None.
+        """
+        if not 0 < min_interval <= max_interval:
+            raise ValueError(f"The intervals must satisfy 0 < min <= max, not: '{min_interval}', '{max_interval}'")
+        self.create_scraper: Callable[[], Scraper] = create_scraper
+        self.method: str = method
+        self.min_interval: float = min_interval
+        self.max_interval: float = max_interval
+        self.backoff: float = backoff
+        self.metrics_path: str = metrics_path
+        self.telegram: 'TelegramService | None' = telegram
+        self.digest: 'MailDigest | None' = digest
+        self.interval: float = min_interval
+        self.scraper: Scraper | None = None
+        self._previous: dict[str, CourseStatus] = {}
+        self._stop_event: threading.Event = threading.Event()
+
+    def run(self) -> None:
+        """
+        Scrapes until a stop is requested, either by calling stop() or by sending SIGINT or SIGTERM. Should be
+        called from the main thread since it installs the signal handlers. The browser is quit on the way out.
+        """
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, self._handle_signal)
+
+        logging.info("Starting the watch daemon...")
+        try:
+            while not self._stop_event.is_set():
+                self._scrape_once()
+                if self._stop_event.is_set():
+                    break
+                logging.info(f"Next scrape in {self.interval:.0f} seconds")
+                self._stop_event.wait(self.interval)
+        finally:
+            self._discard_scraper()
+            if self.digest is not None:
+                self.digest.close()
+            logging.info("The watch daemon has stopped")
+
+    def stop(self) -> None:
+        """
+        Requests the daemon to stop after the current scrape.
+        """
+        self._stop_event.set()
+
+    def _scrape_once(self) -> None:
+        """
+        Runs a single scrape, notifies in case anything changed and picks the next interval. In case the scrape
+        crashes, the Scraper is discarded so a new one gets created for the next scrape. A notification that fails
+        is logged, it does not stop the daemon.
+        """
+        try:
+            if self.scraper is None:
+                self.scraper = self.create_scraper()
+            self.scraper.scrape_for_courses(close=False)
+        except Exception as e:
+            logging.error(f"The scrape crashed, starting a new session for the next one:\n{e!r}")
+            self._discard_scraper()
+            self.interval = self.min_interval
+            return
+
+        if self.metrics_path:
+            self.scraper.metrics.export(self.metrics_path)
+        # Courses that could not be checked are left out of the statuses, they keep their previous status
+        statuses: dict[str, CourseStatus] = dict(self.scraper.statuses)
+        changed: bool = any(self._previous.get(code) != status for code, status in statuses.items())
+        if self.telegram is not None:
+            self.telegram.update(self.scraper.courses, statuses, list(self.scraper.failures))
+        if changed:
+            try:
+                self.scraper.notify(self.method, telegram=self.telegram, digest=self.digest)
+            except Exception as e:
+                logging.error(f"Could not send the notification, the daemon keeps watching:\n{e!r}")
+        self.interval = self._next_interval(changed, statuses)
+        if self.scraper.scheduler is not None:
+            due_in: float = self.scraper.scheduler.next_due_in(self.scraper.courses.get_incomplete().courses)
+            self.interval = min(self.max_interval, max(self.min_interval, due_in))
+        if self.scraper.breaker.is_open:
+            self.interval = min(self.max_interval, max(self.interval, self.scraper.breaker.retry_in))
+        self._previous = {**self._previous, **statuses}
+
+    def _next_interval(self, changed: bool, statuses: dict[str, CourseStatus]) -> float:
+        """
+        Picks the time until the next scrape based on the outcome of the last one.
+
+        Args:
+            changed (bool): Whether any course status differs from the previous scrape.
+            statuses (dict[str, CourseStatus]): The outcome per course code of the last scrape.
+
+        Returns:
+            float: The next interval in seconds, between min_interval and max_interval.
+        """
+        if changed and self._previous:
+            return self.min_interval
+        if CourseStatus.CLOSED in statuses.values():
+            return max(self.min_interval, self.interval / self.backoff)
+        return min(self.max_interval, self.interval * self.backoff)
+
+    def _discard_scraper(self) -> None:
+        """
+        Quits the current Scraper, ignoring errors from a browser that has already crashed.
+        """
+        if self.scraper is None:
+            return
+        try:
+            self.scraper.quit()
+        except Exception as e:
+            logging.debug(f"Could not quit the scraper cleanly: {e!r}")
+        self.scraper = None
+
+    def _handle_signal(self, signum: int, _) -> None:
+        logging.info(f"Received {signal.Signals(signum).name}, stopping after the current scrape...")
+        self.stop()
@@ -3,6 +3,12 @@ from platform import system
 
 browser: str = "firefox"     # Put desired browser ('chrome' or 'firefox') here
 
+backend: str = "selenium"    # Put desired scraping backend ('selenium' or 'http') here
+
+navigation: str = "spa"      # How the browser returns to the search ('spa' clears it in the page, 'refresh' reloads)
+
+batch: bool = True           # Check all courses at once from inside the logged in page (search bar as fallback)
+
 match system():              # Put browser executable files here for your system in case of errors
     case "Windows":
         browser_path: str = "C:\\Program Files\\Mozilla Firefox\\firefox.exe"
@@ -11,4 +17,25 @@ match system():              # Put browser executable files here for your system
 
 browser_profile: str = ""
 
+driver_profile: str = "standard"  # 'lean' runs headless and skips images, fonts, stylesheets and extensions
+
+pipelined_startup: bool = True    # Start the browser and open MyTUD in the background while the courses are loaded
+
 notification_method: str = "m"  # Put desired method(s) here ('m' for email, 't' for 'telegram')
+
+mail_digest_window: int = 0       # With 'm' and '--daemon', seconds of changes collected into one email (0 disables)
+
+telegram_commands: bool = True    # With 't' and '--daemon', answer /status, /courses and /check <code> in Telegram
+
+workers: int = 1             # Number of sessions that check courses in parallel
+
+status_ttl: int = 0          # Seconds a checked course is not checked again (0 checks every course on every run)
+
+checks_per_hour: int = 0     # Budget of course checks per hour, spent on the courses most likely to open (0 disables)
+
+shared_ttl: int = 300        # Seconds a closed or missing course is shared with other users on this host (0 disables)
+
+daemon_min_interval: int = 300    # Shortest time in seconds between scrapes when running with '--daemon'
+daemon_max_interval: int = 3600   # Longest time in seconds between scrapes when running with '--daemon'
+
+metrics_path: str = ""       # Directory to write the run report and Prometheus metrics of every scrape to ('' disables)
@@ -0,0 +1,483 @@
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from project.constants import API_SESSION_PATH, API_SEARCH_PATH, API_COURSE_PATH, SIGN_UP_PATH, NO_COURSES_FOUND,\
+    CLOSED_SIGNUP, UNABLE_TO_SIGNUP, SIGNUP_AVAILABLE, NOT_IN_PROGRAM
+from project.status import CourseStatus
+import threading
+import argparse
+import logging
+import random
+import struct
+import json
+import time
+import zlib
+
+
+# The result mix of generated courses when none is given, every status the sign up page can show
+DEFAULT_MIX: dict[CourseStatus, float] = {
+    CourseStatus.NOT_FOUND: 0.2,
+    CourseStatus.CLOSED: 0.4,
+    CourseStatus.UNABLE: 0.1,
+    CourseStatus.AVAILABLE: 0.2,
+    CourseStatus.NOT_IN_PROGRAM: 0.1,
+}
+
+LOGIN_PAGE = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>TU Delft login (fake)</title><link rel="stylesheet" href="/assets/app.css"></head>
+<body>
+<img class="banner" src="/assets/banner.png" alt="">
+<form method="post" action="/login">
+    <input id="username" name="username" type="text">
+    <input id="password" name="password" type="password">
+    <button id="submit_button" type="submit">Login</button>
+    %ERROR%
+</form>
+</body>
+</html>
+"""
+
+# The app is loaded from <head>, so its source (which contains the markers) is not part of document.body.innerHTML
+APP_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8"><title>MyTUD (fake)</title><link rel="stylesheet" href="/assets/app.css">
+<script src="/app.js" defer></script>
+</head>
+<body>
+<img class="banner" src="/assets/banner.png" alt="">
+<div id="search-view">
+    <input class="searchbar-input" type="search" placeholder="Zoek een cursus">
+    <div id="results"></div>
+</div>
+<div id="course-view" style="display: none"></div>
+</body>
+</html>
+"""
+
+# Like MyTUD, the pages load a web font, a stylesheet and a large image, none of which the scrapers need
+ASSET_STYLESHEET = """
+@font-face { font-family: "Fake Sans"; src: url("/assets/font.woff2") format("woff2"); }
+body { font-family: "Fake Sans", sans-serif; margin: 0; }
+.banner { display: block; width: 100%; }
+.osi-ion-item { display: block; padding: 12px 16px; border-bottom: 1px solid #ddd; cursor: pointer; }
+"""
+
+# Searches after the user stops typing, opens a course in the same URL (like MyTUD, so a refresh returns to the
+# search) and goes back to the search on history.back()
+APP_SCRIPT = """
+const [searchPath, coursePath, debounce, noResults, pagesPath] = %CONFIG%;
+const input = document.querySelector('.searchbar-input');
+const results = document.getElementById('results');
+const searchView = document.getElementById('search-view');
+const courseView = document.getElementById('course-view');
+const entities = {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'};
+const escape = text => String(text).replace(/[&<>"]/g, c => entities[c]);
+let pending = null;
+let sequence = 0;
+let firstHit = null;
+
+// A replay shows the recorded page of a step instead of rendering it, without the inputs and scripts of the page
+const recordedPage = async (phase, code) => {
+    if (!pagesPath) {
+        return null;
+    }
+    const response = await fetch(`${pagesPath}${phase}/${encodeURIComponent(code)}`);
+    if (!response.ok) {
+        return null;
+    }
+    const page = new DOMParser().parseFromString(await response.text(), 'text/html');
+    page.querySelectorAll('input, script').forEach(element => element.remove());
+    return page.body.innerHTML;
+};
+
+input.addEventListener('input', () => {
+    clearTimeout(pending);
+    const current = ++sequence;
+    const query = input.value.trim();
+    results.innerHTML = '';
+    if (!query) {
+        return;
+    }
+    pending = setTimeout(async () => {
+        const response = await fetch(searchPath, {
+            method: 'POST',
+            headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify({query: {bool: {must: [{multi_match: {query: query}}]}}}),
+        });
+        const hits = (await response.json()).hits.hits;
+        const page = await recordedPage('search', query);
+        if (current !== sequence) {
+            return;
+        }
+        firstHit = hits.length === 0 ? null : String(hits[0]._source.id_cursus);
+        results.innerHTML = page ?? (hits.length === 0 ? `<p>${noResults}</p>` : hits.map(({_source: course}) =>
+            `<ion-item class="osi-ion-item" data-id="${course.id_cursus}">` +
+            `<h2>${escape(course.cursus)}</h2><p>${escape(course.cursus_lange_naam)}</p>` +
+            (course.inschrijfperiode.melding ? `<p>${escape(course.inschrijfperiode.melding)}</p>` : '') +
+            '</ion-item>'
+        ).join(''));
+    }, debounce);
+});
+
+const showSearch = () => {
+    courseView.style.display = 'none';
+    courseView.innerHTML = '';
+    searchView.style.display = '';
+};
+
+const showCourse = async id => {
+    searchView.style.display = 'none';
+    courseView.style.display = '';
+    courseView.innerHTML = '<p>Laden...</p>';
+    const course = await (await fetch(coursePath + id)).json();
+    const page = await recordedPage('course', course.cursus);
+    if (history.state?.course !== id) {
+        return;
+    }
+    courseView.innerHTML = page ?? (`<h1>${escape(course.cursus)}</h1>` +
+        course.meldingen.map(melding => `<p>${escape(melding)}</p>`).join('') +
+        course.toetsen.map(toets => `<ion-item>${escape(toets.toets)}: ${escape(toets.omschrijving)}</ion-item>`)
+            .join(''));
+};
+
+results.addEventListener('click', event => {
+    const item = event.target.closest('.osi-ion-item');
+    // The items of a recorded page have no ID, they open the course that was found
+    const id = item?.dataset.id ?? firstHit;
+    if (item && id) {
+        history.pushState({course: id}, '');
+        showCourse(id);
+    }
+});
+window.addEventListener('popstate', () => history.state?.course ? showCourse(history.state.course) : showSearch());
+history.replaceState(null, '');
+"""
+
+
+class FakeMyTUD:
+    """
+    A local stand-in for MyTUD, used to run the scrapers offline. It serves the JSON endpoints the HttpScraper uses
+    and a small app on top of them with the login form, search bar and course pages the SeleniumScraper uses. Every
+    course it knows gets a fixed CourseStatus, which decides what is shown for it.
+    """
+    def __init__(self, courses: dict[str, CourseStatus], host="127.0.0.1", port=0, latency=0.0,
+                 cookie=("JSESSIONID", "fake-session"), credentials=("student", "password"), debounce=0.3):
+        """
+        The initialiser method for the FakeMyTUD class.
+
+        Args:
+            courses (dict[str, CourseStatus]): The status to serve per course code. Unknown codes are not found.
+            host (str, optional): The address to listen on. Defaults to "127.0.0.1".
+            port (int, optional): The port to listen on, 0 picks a free one. Defaults to 0.
+            latency (float, optional): How many seconds every response is delayed by. Defaults to 0.0.
+            cookie (tuple[str, str], optional): The session cookie (name, value) requests need to carry, otherwise
+                they are redirected to the login page. Defaults to ("JSESSIONID", "fake-session").
+            credentials (tuple[str, str], optional): The net id and password the login form accepts.
+                Defaults to ("student", "password").
+            debounce (float, optional): How many seconds the app waits after the last key stroke before searching,
+                like MyTUD does. Defaults to 0.3.
+        """
+        self.courses: dict[str, CourseStatus] = {code.upper(): status for code, status in courses.items()}
+        self.latency: float = latency
+        self.cookie: tuple[str, str] = cookie
+        self.credentials: tuple[str, str] = credentials
+        self.debounce: float = debounce
+        # Where the app loads recorded pages from, only a replay has them, see ReplayMyTUD
+        self.pages_path: str | None = None
+        self._ids: dict[int, str] = dict(enumerate(self.courses, start=1))
+        self._assets: dict[str, tuple[bytes, str]] = self._create_assets()
+        self._server = ThreadingHTTPServer((host, port), self._create_handler())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> 'FakeMyTUD':
+        self.start()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    @property
+    def sign_up_url(self) -> str:
+        return self.url + SIGN_UP_PATH
+
+    def start(self) -> None:
+        """
+        Starts serving in a background thread.
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        logging.info(f"Fake MyTUD is listening on {self.url}")
+
+    def stop(self) -> None:
+        """
+        Stops serving and closes the socket.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+
+    @staticmethod
+    def parse_mix(value: str) -> dict[CourseStatus, float]:
+        """
+        Parses a result mix like 'closed=0.5,available=0.5'.
+
+        Args:
+            value (str): Comma separated STATUS=WEIGHT pairs.
+
+        Returns:
+            dict[CourseStatus, float]: The weight per status.
+        """
+        mix: dict[CourseStatus, float] = {}
+        for entry in value.split(","):
+            status, _, weight = entry.partition("=")
+            mix[CourseStatus(status.strip())] = float(weight or 1)
+        return mix
+
+    @staticmethod
+    def generate_courses(count: int, mix: dict[CourseStatus, float], seed=0) -> dict[str, CourseStatus]:
+        """
+        Generates course codes with statuses drawn from a mix, for benchmarks with many courses.
+
+        Args:
+            count (int): The number of courses.
+            mix (dict[CourseStatus, float]): The relative weight of every status.
+            seed (int, optional): The seed for the random draws, so runs can be compared. Defaults to 0.
+
+        Raises:
+            ValueError: In case the mix contains UNKNOWN, which the fake has no page for.
+
+        Returns:
+            dict[str, CourseStatus]: The status per course code, with codes like 'FAKE0001'.
+        """
+        if CourseStatus.UNKNOWN in mix:
+            raise ValueError("The fake cannot serve courses with an UNKNOWN status")
+        rng: random.Random = random.Random(seed)
+        statuses: list[CourseStatus] = rng.choices(list(mix), weights=list(mix.values()), k=count)
+        return {f"FAKE{i:04d}": status for i, status in enumerate(statuses, start=1)}
+
+    def session(self) -> dict[str]:
+        """
+        Returns a session in the format of the SessionCache that the fake accepts, so an HttpScraper can be created
+        with HttpScraper.from_session_cache.
+
+        Returns:
+            dict[str]: The session with the cookie of the fake.
+        """
+        host: str = self._server.server_address[0]
+        return {"cookies": [{"name": self.cookie[0], "value": self.cookie[1], "domain": host}], "local_storage": {}}
+
+    def search(self, query: str) -> dict[str]:
+        """
+        Builds the search response for a query.
+        """
+        hits: list[dict[str]] = []
+        for id_cursus, code in self._ids.items():
+            if code == query.strip().upper() and self.courses[code] != CourseStatus.NOT_FOUND:
+                closed: bool = self.courses[code] == CourseStatus.CLOSED
+                hits.append({"_source": {
+                    "id_cursus": id_cursus,
+                    "cursus": code,
+                    "cursus_lange_naam": f"Course {code}",
+                    "inschrijfperiode": {"melding": CLOSED_SIGNUP if closed else ""},
+                }})
+        return {"hits": {"total": len(hits), "hits": hits}}
+
+    def detail(self, id_cursus: int) -> dict[str] | None:
+        """
+        Builds the course response for a course ID, or returns None in case the ID is unknown.
+        """
+        code: str | None = self._ids.get(id_cursus)
+        if code is None:
+            return None
+        status: CourseStatus = self.courses[code]
+        detail: dict[str] = {"id_cursus": id_cursus, "cursus": code, "toetsen": [], "meldingen": []}
+        match status:
+            case CourseStatus.UNABLE:
+                detail["meldingen"].append(f"{UNABLE_TO_SIGNUP}, je kunt je niet inschrijven voor deze cursus.")
+            case CourseStatus.AVAILABLE:
+                detail["toetsen"].append({"id_toets": id_cursus, "toets": "T1", "omschrijving": SIGNUP_AVAILABLE})
+            case CourseStatus.NOT_IN_PROGRAM:
+                detail["meldingen"].append(f"Deze cursus maakt {NOT_IN_PROGRAM}.")
+        return detail
+
+    def respond(self, method: str, path: str, body: bytes) -> tuple[int, bytes, str] | None:
+        """
+        Answers a request of a logged in session before the fake does, so a subclass can serve other responses, see
+        ReplayMyTUD. By default the fake answers every request itself.
+
+        Args:
+            method (str): The HTTP method.
+            path (str): The requested path with its query, without the leading slash.
+            body (bytes): The body of the request, empty for a GET.
+
+        Returns:
+            tuple[int, bytes, str] | None: The status, body and content type of the response, or None in case the
+                fake should answer.
+        """
+        return None
+
+    @staticmethod
+    def _create_assets() -> dict[str, tuple[bytes, str]]:
+        """
+        Generates the assets of the pages, with sizes in the range of the ones MyTUD serves: a stylesheet of about
+        60 kB, a web font of 150 kB and a banner image of about 1 MB (a valid PNG with noise, so it does not
+        compress and the browser has to decode it).
+
+        Returns:
+            dict[str, tuple[bytes, str]]: The body and content type per path.
+        """
+        rng: random.Random = random.Random(0)
+        filler: str = "".join(f".filler-{i} {{ margin: {i % 16}px; color: #{i % 4096:03x}; }}\n" for i in range(1500))
+        width, height = 1200, 300
+        rows: bytes = b"".join(b"\x00" + rng.randbytes(width * 3) for _ in range(height))
+
+        def chunk(kind: bytes, data: bytes) -> bytes:
+            return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+        banner: bytes = (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+                         + chunk(b"IDAT", zlib.compress(rows, 1)) + chunk(b"IEND", b""))
+        return {
+            "assets/app.css": ((ASSET_STYLESHEET + filler).encode(), "text/css"),
+            "assets/font.woff2": (rng.randbytes(150_000), "font/woff2"),
+            "assets/banner.png": (banner, "image/png"),
+        }
+
+    def _create_handler(self) -> type[BaseHTTPRequestHandler]:
+        fake: FakeMyTUD = self
+        course_prefix: str = API_COURSE_PATH.split("{id}")[0]
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # The headers and the body are written separately, without this every response waits for a delayed ACK
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:
+                path: str = urlparse(self.path).path.lstrip("/")
+                if path == "app.js":
+                    pages: str | None = f"/{fake.pages_path}" if fake.pages_path else None
+                    config: str = json.dumps([f"/{API_SEARCH_PATH}", f"/{course_prefix}", fake.debounce * 1000,
+                                              NO_COURSES_FOUND, pages])
+                    self._send(APP_SCRIPT.replace("%CONFIG%", config).encode(), "text/javascript")
+                elif path in fake._assets:
+                    self._send(*fake._assets[path], cache=True)
+                elif path == "login" or (path == "" and not self._has_cookie()):
+                    self._send(LOGIN_PAGE.replace("%ERROR%", "").encode(), "text/html")
+                elif path == "":
+                    self._send(APP_PAGE.encode(), "text/html")
+                elif not self._authorised() or self._respond("GET", b""):
+                    return
+                elif path == API_SESSION_PATH:
+                    self._send_json({"id": "fake-student"})
+                elif path.startswith(course_prefix) and path[len(course_prefix):].isdigit():
+                    detail: dict[str] | None = fake.detail(int(path[len(course_prefix):]))
+                    self._send_json(detail, 200 if detail is not None else 404)
+                else:
+                    self._send_json({"error": "not found"}, 404)
+
+            def do_POST(self) -> None:
+                path: str = urlparse(self.path).path.lstrip("/")
+                body: bytes = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if path == "login":
+                    self._login(parse_qs(body.decode()))
+                    return
+                if not self._authorised() or self._respond("POST", body):
+                    return
+                if path != API_SEARCH_PATH:
+                    self._send_json({"error": "not found"}, 404)
+                    return
+                try:
+                    query: str = json.loads(body)["query"]["bool"]["must"][0]["multi_match"]["query"]
+                except (ValueError, KeyError, IndexError, TypeError):
+                    self._send_json({"error": "bad request"}, 400)
+                    return
+                self._send_json(fake.search(query))
+
+            def _login(self, form: dict[str, list[str]]) -> None:
+                if (form.get("username", [""])[0], form.get("password", [""])[0]) != fake.credentials:
+                    error: str = "<p>Gebruikersnaam of wachtwoord onjuist</p>"
+                    self._send(LOGIN_PAGE.replace("%ERROR%", error).encode(), "text/html")
+                    return
+                time.sleep(fake.latency)
+                self.send_response(303)
+                self.send_header("Set-Cookie", f"{fake.cookie[0]}={fake.cookie[1]}; Path=/")
+                self.send_header("Location", f"/{SIGN_UP_PATH}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def _respond(self, method: str, body: bytes) -> bool:
+                answer: tuple[int, bytes, str] | None = fake.respond(method, self.path.lstrip("/"), body)
+                if answer is None:
+                    return False
+                status, data, content_type = answer
+                self._send(data, content_type, status)
+                return True
+
+            def _has_cookie(self) -> bool:
+                name, value = fake.cookie
+                return f"{name}={value}" in self.headers.get("Cookie", "")
+
+            def _authorised(self) -> bool:
+                if self._has_cookie():
+                    return True
+                self.send_response(302)
+                self.send_header("Location", "/login")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return False
+
+            def _send_json(self, data: dict[str] | None, status=200) -> None:
+                self._send(json.dumps(data).encode(), "application/json", status)
+
+            def _send(self, body: bytes, content_type: str, status=200, cache=False) -> None:
+                time.sleep(fake.latency)
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                if cache:
+                    self.send_header("Cache-Control", "max-age=3600")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                logging.debug(f"Fake MyTUD: {format % args}")
+
+        return Handler
+
+
+if __name__ == "__main__":
+    logging.basicConfig(format='%(asctime)s - %(name)s - %(message)s', level=logging.INFO)
+
+    argparser = argparse.ArgumentParser(prog="FakeMyTUD", description="Serve fake MyTUD endpoints for offline runs")
+    argparser.add_argument("courses", nargs="*", metavar="CODE=STATUS",
+                           help=f"Course statuses to serve, one of: {', '.join(s.value for s in CourseStatus)}")
+    argparser.add_argument("-p", "--port", type=int, default=8080, help="Port to listen on (default=8080)")
+    argparser.add_argument("-l", "--latency", type=float, default=0.0, help="Delay per response in seconds")
+    argparser.add_argument("-s", "--session", default=None,
+                           help="Write a session file the HttpScraper can use to this path")
+    argparser.add_argument("-n", "--count", type=int, default=0,
+                           help="Number of courses to generate besides the ones given (default=0)")
+    argparser.add_argument("-m", "--mix", type=FakeMyTUD.parse_mix, default=DEFAULT_MIX,
+                           help="Result mix of the generated courses, like 'closed=0.5,available=0.5'")
+    args: dict[str] = vars(argparser.parse_args())
+
+    statuses: dict[str, CourseStatus] = FakeMyTUD.generate_courses(args["count"], args["mix"])
+    for entry in args["courses"]:
+        code, _, status = entry.partition("=")
+        statuses[code] = CourseStatus(status or CourseStatus.AVAILABLE.value)
+    fake = FakeMyTUD(statuses, port=args["port"], latency=args["latency"])
+    if args["session"]:
+        with open(args["session"], 'w') as f:
+            json.dump(fake.session(), f)
+    fake.start()
+    logging.info(f"Log in at {fake.sign_up_url} as '{fake.credentials[0]}' with password '{fake.credentials[1]}'")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        fake.stop()
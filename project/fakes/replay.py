@@ -0,0 +1,180 @@
+from project.fakes.mytud import FakeMyTUD
+from project.recording import SessionRecording, search_query
+from project.status import CourseStatus
+from project.courses import Courses
+from project.course import Course
+from project.utils import save_to_json, encode_string
+from urllib.parse import unquote
+import tempfile
+import argparse
+import logging
+import time
+import json
+import sys
+import os
+
+
+class ReplayMyTUD(FakeMyTUD):
+    """
+    A FakeMyTUD that answers with what a SessionRecording saw instead of made up responses. Every recorded exchange
+    is served by its method and path (and, for searches, the course code searched for) with its recorded status and
+    response, delayed by the time it took when it was recorded, or a fraction of that. The recorded pages are served
+    under pages/PHASE/CODE, where the app picks them up and shows them instead of rendering the responses itself, so
+    the browser reads the page MyTUD showed. The login form and the app are those of the FakeMyTUD, so both backends
+    can replay a recording. A search or course that has not been recorded is answered as if it does not exist.
+    """
+    def __init__(self, recording: SessionRecording, speed=1.0, **kwargs):
+        """
+        The initialiser method for the ReplayMyTUD class.
+
+        Args:
+            recording (SessionRecording): The recording to replay.
+            speed (float, optional): How many times faster than recorded to respond, 0 responds straight away.
+                Defaults to 1.0.
+            **kwargs: Passed on to FakeMyTUD, such as the port.
+        """
+        if speed < 0:
+            raise ValueError(f"The speed cannot be negative, not: '{speed}'")
+        statuses: dict[str, CourseStatus] = {code: CourseStatus(status) for code, status in recording.outcomes.items()}
+        super().__init__(statuses, **kwargs)
+        self.recording: SessionRecording = recording
+        self.speed: float = speed
+        self.misses: list[str] = []
+        self.pages_path = "pages/"
+        # The last exchange of every request wins, like in SessionRecording.exchange
+        self._exchanges: dict[tuple[str, str, str | None], dict[str]] = {
+            (exchange["method"], exchange["path"], search_query(exchange["body"])): exchange
+            for exchange in recording.exchanges
+        }
+
+    def respond(self, method: str, path: str, body: bytes) -> tuple[int, bytes, str] | None:
+        """
+        Answers with the recorded page or exchange of a request, see FakeMyTUD.respond.
+        """
+        if method == "GET" and path.startswith(self.pages_path):
+            phase, _, code = path[len(self.pages_path):].partition("/")
+            snapshot: dict[str] | None = self.recording.snapshot(unquote(code), phase)
+            return (200, snapshot["html"].encode(), "text/html") if snapshot is not None else None
+        try:
+            query: str | None = search_query(json.loads(body)) if body else None
+        except ValueError:
+            query = None
+        exchange: dict[str] | None = self._exchanges.get((method, path, query))
+        if exchange is None:
+            return None
+        self._delay(exchange)
+        return exchange["status"], exchange["response"].encode(), "application/json"
+
+    def search(self, query: str) -> dict[str]:
+        """
+        Only asked for a search that has not been recorded, which is answered as if the course does not exist.
+        """
+        self.misses.append(f"search {query}")
+        logging.warning(f"No search for '{query}' has been recorded, answering that it does not exist")
+        return {"hits": {"total": 0, "hits": []}}
+
+    def detail(self, id_cursus: int) -> dict[str] | None:
+        """
+        Only asked for a course that has not been recorded, which is answered as if it does not exist.
+        """
+        self.misses.append(f"course {id_cursus}")
+        logging.warning(f"No course {id_cursus} has been recorded, answering that it does not exist")
+        return None
+
+    def _delay(self, exchange: dict[str]) -> None:
+        if self.speed > 0:
+            time.sleep(exchange["elapsed"] / self.speed)
+
+
+def replay(recording: SessionRecording, backend="http", speed=1.0, browser="firefox", batch=True) -> dict[str]:
+    """
+    Scrapes the courses of a recording against a ReplayMyTUD and compares the outcomes with the recorded ones.
+
+    Args:
+        recording (SessionRecording): The recording to replay.
+        backend (str, optional): The backend to replay with, 'http' or 'selenium'. Defaults to "http".
+        speed (float, optional): How many times faster than recorded to respond. Defaults to 1.0.
+        browser (str, optional): The browser of the selenium backend, 'firefox' or 'chrome'. Defaults to "firefox".
+        batch (bool, optional): Whether the selenium backend checks the courses at once first. Defaults to True.
+
+    Raises:
+        ValueError: In case the backend is not 'http' or 'selenium'.
+        RuntimeError: In case the browser could not be started.
+
+    Returns:
+        dict[str]: How long the replay took, how long it was expected to take, the outcome per course code and the
+            courses whose outcome differs from the recorded one, as [code, recorded, replayed] each.
+    """
+    courses: Courses = Courses([Course(code, f"Course {code}") for code in recording.outcomes])
+    with ReplayMyTUD(recording, speed) as fake, tempfile.TemporaryDirectory() as directory:
+        if backend == "http":
+            from project.http_scraper import HttpScraper
+            cookies: dict[str, str] = dict([fake.cookie])
+            scraper = HttpScraper(courses, cookies, base_url=fake.url, retries=1)
+        elif backend == "selenium":
+            from project.selenium_scraper import SeleniumScraper
+            from project.utils import create_webdriver
+            creds_path: str = os.path.join(directory, "creds.json")
+            save_to_json({"net_id": fake.credentials[0], "net_pass": encode_string(fake.credentials[1])}, creds_path)
+            driver = create_webdriver(browser, is_headless=True)
+            if driver is None:
+                raise RuntimeError(f"Could not start {browser}, see the README on how to set up the webdriver")
+            scraper = SeleniumScraper(driver, courses, base_url=fake.url, batch=batch, creds_path=creds_path,
+                                      retries=1)
+        else:
+            raise ValueError(f"Backend needs to be 'http' or 'selenium', not: '{backend}'")
+        start: float = time.perf_counter()
+        try:
+            scraper.scrape_for_courses(close=False)
+        finally:
+            scraper.quit()
+        total: float = time.perf_counter() - start
+
+    outcomes: dict[str, str] = {code: status.value for code, status in scraper.statuses.items()}
+    return {
+        "total": total,
+        "expected": (recording.duration or 0.0) / speed if speed > 0 else 0.0,
+        "outcomes": outcomes,
+        "misses": fake.misses,
+        "mismatches": [[code, status, outcomes.get(code)] for code, status in recording.outcomes.items()
+                       if outcomes.get(code) != status],
+    }
+
+
+if __name__ == "__main__":
+    logging.basicConfig(format='%(asctime)s - %(name)s - %(message)s', level=logging.WARNING)
+
+    argparser = argparse.ArgumentParser(prog="ReplayMyTUD", description="Replay a recorded MyTUD session offline")
+    argparser.add_argument("recording", help="The recording, see the -R option of the main script")
+    argparser.add_argument("-b", "--backend", default="http", help="Backend to replay with (default=http)")
+    argparser.add_argument("-B", "--browser", default="firefox", help="Browser of the selenium backend "
+                                                                      "(default=firefox)")
+    argparser.add_argument("-s", "--speed", type=float, default=1.0,
+                           help="How many times faster than recorded to respond, 0 for no delay (default=1)")
+    argparser.add_argument("-u", "--ui-only", action="store_true",
+                           help="Check every course through the search bar instead of all at once")
+    argparser.add_argument("-S", "--serve", action="store_true",
+                           help="Only serve the recording on port 8080 instead of replaying it with a backend")
+    args: dict[str] = vars(argparser.parse_args())
+
+    session: SessionRecording = SessionRecording.load(args["recording"])
+    if args["serve"]:
+        with ReplayMyTUD(session, args["speed"], port=8080) as fake:
+            print(f"Serving {len(session.outcomes)} recorded courses on {fake.sign_up_url}")
+            try:
+                while True:
+                    time.sleep(1)
+            except KeyboardInterrupt:
+                pass
+        sys.exit(0)
+
+    result: dict[str] = replay(session, args["backend"], args["speed"], args["browser"], not args["ui_only"])
+    print(f"Replayed {len(session.outcomes)} courses in {result['total']:.2f}s, "
+          f"the recording took {session.duration or 0.0:.2f}s ({result['expected']:.2f}s at {args['speed']:g}x)")
+    for code, recorded, replayed in result["mismatches"]:
+        snapshot: dict[str] | None = session.snapshot(code, "course") or session.snapshot(code, "search")
+        shown: str = f", the recorded page showed '{snapshot['status']}'" if snapshot is not None else ""
+        print(f"'{code}' was '{recorded}' when recorded but '{replayed}' when replayed{shown}")
+    if result["misses"]:
+        print(f"{len(result['misses'])} requests had not been recorded: {', '.join(result['misses'])}")
+    sys.exit(1 if result["mismatches"] else 0)
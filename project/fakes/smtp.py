@@ -0,0 +1,164 @@
+from socketserver import ThreadingTCPServer, StreamRequestHandler
+import threading
+import argparse
+import logging
+import base64
+import time
+
+
+class FakeSMTP:
+    """
+    A local stand-in for an SMTP server, used to send email notifications offline. It accepts any login over plain
+    SMTP and keeps every email it receives in memory.
+    """
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, fail_first=0, max_messages=0):
+        """
+        The initialiser method for the FakeSMTP class.
+
+        Args:
+            host (str, optional): The address to listen on. Defaults to "127.0.0.1".
+            port (int, optional): The port to listen on, 0 picks a free one. Defaults to 0.
+            latency (float, optional): How many seconds every reply is delayed by. Defaults to 0.0.
+            fail_first (int, optional): The number of connections that are refused with a 421 reply before the
+                fake starts accepting them, to test retries. Defaults to 0.
+            max_messages (int, optional): The number of emails after which the fake drops a connection without a
+                reply, like servers that limit the emails per session, to test reconnecting. Defaults to 0, no limit.
+        """
+        self.latency: float = latency
+        self.fail_first: int = fail_first
+        self.max_messages: int = max_messages
+        self.connections: int = 0
+        self.messages: list[dict[str]] = []
+        self._lock: threading.Lock = threading.Lock()
+        self._server = ThreadingTCPServer((host, port), self._create_handler())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> 'FakeSMTP':
+        self.start()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.stop()
+
+    @property
+    def host(self) -> str:
+        return self._server.server_address[0]
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self) -> None:
+        """
+        Starts serving in a background thread.
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        logging.info(f"Fake SMTP is listening on {self.host}:{self.port}")
+
+    def stop(self) -> None:
+        """
+        Stops serving and closes the socket.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _create_handler(self) -> type[StreamRequestHandler]:
+        fake: FakeSMTP = self
+
+        class Handler(StreamRequestHandler):
+            def handle(self) -> None:
+                with fake._lock:
+                    fake.connections += 1
+                    refuse: bool = fake.connections <= fake.fail_first
+                if refuse:
+                    self._reply("421 Service not available, try again later")
+                    return
+
+                self._reply("220 fake.smtp ESMTP")
+                sender: str = ""
+                recipients: list[str] = []
+                received: int = 0
+                while line := self.rfile.readline():
+                    command, _, argument = line.decode().strip().partition(" ")
+                    match command.upper():
+                        case "EHLO":
+                            self._reply("250-fake.smtp", "250 AUTH PLAIN LOGIN")
+                        case "HELO" | "NOOP":
+                            self._reply("250 OK")
+                        case "AUTH":
+                            self._authenticate(argument)
+                        case "MAIL":
+                            sender, recipients = argument.partition(":")[2].strip("<> "), []
+                            self._reply("250 OK")
+                        case "RCPT":
+                            recipients.append(argument.partition(":")[2].strip("<> "))
+                            self._reply("250 OK")
+                        case "DATA":
+                            self._reply("354 End data with <CR><LF>.<CR><LF>")
+                            with fake._lock:
+                                fake.messages.append({"from": sender, "to": recipients, "data": self._read_data()})
+                            self._reply("250 OK")
+                            received += 1
+                            if received == fake.max_messages:
+                                return
+                        case "RSET":
+                            sender, recipients = "", []
+                            self._reply("250 OK")
+                        case "QUIT":
+                            self._reply("221 Bye")
+                            return
+                        case _:
+                            self._reply("502 Command not implemented")
+
+            def _authenticate(self, argument: str) -> None:
+                mechanism, _, initial = argument.partition(" ")
+                if mechanism.upper() == "LOGIN":
+                    for prompt in ("VXNlcm5hbWU6", "UGFzc3dvcmQ6"):
+                        self._reply(f"334 {prompt}")
+                        self.rfile.readline()
+                elif not initial:
+                    self._reply("334 ")
+                    initial = self.rfile.readline().decode().strip()
+                if mechanism.upper() == "PLAIN":
+                    user: str = base64.b64decode(initial).split(b"\0")[1].decode()
+                    logging.debug(f"Fake SMTP: login of '{user}'")
+                self._reply("235 Authentication successful")
+
+            def _read_data(self) -> str:
+                lines: list[str] = []
+                while (line := self.rfile.readline().decode()).rstrip("\r\n") != ".":
+                    if not line:
+                        break
+                    lines.append(line[1:] if line.startswith("..") else line)
+                return "".join(lines)
+
+            def _reply(self, *lines: str) -> None:
+                time.sleep(fake.latency)
+                self.wfile.write("".join(f"{line}\r\n" for line in lines).encode())
+
+        return Handler
+
+
+if __name__ == "__main__":
+    logging.basicConfig(format='%(asctime)s - %(name)s - %(message)s', level=logging.INFO)
+
+    argparser = argparse.ArgumentParser(prog="FakeSMTP", description="Serve a fake SMTP server for offline runs")
+    argparser.add_argument("-p", "--port", type=int, default=8025, help="Port to listen on (default=8025)")
+    argparser.add_argument("-l", "--latency", type=float, default=0.0, help="Delay per reply in seconds")
+    argparser.add_argument("-f", "--fail-first", type=int, default=0, help="Number of connections to refuse first")
+    argparser.add_argument("-m", "--max-messages", type=int, default=0,
+                           help="Number of emails after which a connection is dropped (default=0, no limit)")
+    args: dict[str] = vars(argparser.parse_args())
+
+    fake = FakeSMTP(port=args["port"], latency=args["latency"], fail_first=args["fail_first"],
+                    max_messages=args["max_messages"])
+    fake.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        fake.stop()
+    for message in fake.messages:
+        print(f"From {message['from']} to {', '.join(message['to'])}:\n{message['data']}")
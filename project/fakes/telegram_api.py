@@ -0,0 +1,226 @@
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qsl
+import threading
+import argparse
+import logging
+import json
+import time
+
+
+class FakeTelegramAPI:
+    """
+    A local stand-in for the Telegram Bot API, used to send Telegram notifications offline. It answers for a single
+    bot token and keeps every message sent through it in memory. Point a TelegramBot to it using its base_url.
+    Messages from users can be queued with push_message, which a bot receives by long polling getUpdates.
+    """
+    def __init__(self, token="123456:fake-token", host="127.0.0.1", port=0, latency=0.0, fail_first=0):
+        """
+        The initialiser method for the FakeTelegramAPI class.
+
+        Args:
+            token (str, optional): The bot token requests need to use. Defaults to "123456:fake-token".
+            host (str, optional): The address to listen on. Defaults to "127.0.0.1".
+            port (int, optional): The port to listen on, 0 picks a free one. Defaults to 0.
+            latency (float, optional): How many seconds every response is delayed by. Defaults to 0.0.
+            fail_first (int, optional): The number of sendMessage calls that fail with a 502 before the fake starts
+                accepting them, to test retries. Defaults to 0.
+        """
+        self.token: str = token
+        self.latency: float = latency
+        self.fail_first: int = fail_first
+        self.calls: int = 0
+        self.messages: list[dict[str]] = []
+        self.updates: list[dict[str]] = []
+        self._next_update_id: int = 1
+        self._lock: threading.Lock = threading.Lock()
+        self._new_update: threading.Condition = threading.Condition(self._lock)
+        self._stopped: bool = False
+        self._server = ThreadingHTTPServer((host, port), self._create_handler())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> 'FakeTelegramAPI':
+        self.start()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.stop()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/bot"
+
+    def start(self) -> None:
+        """
+        Starts serving in a background thread.
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        logging.info(f"Fake Telegram API is listening on {self.base_url}")
+
+    def stop(self) -> None:
+        """
+        Stops serving and closes the socket.
+        """
+        with self._new_update:
+            self._stopped = True
+            self._new_update.notify_all()
+        self._server.shutdown()
+        self._server.server_close()
+
+    def push_message(self, chat_id: int, text: str) -> dict[str]:
+        """
+        Queues a message from a user to the bot, a command in case it starts with a '/'.
+
+        Args:
+            chat_id (int): The chat, and user, the message comes from.
+            text (str): The text of the message, like '/check CSE1100'.
+
+        Returns:
+            dict[str]: The update the bot receives.
+        """
+        with self._new_update:
+            update_id: int = self._next_update_id
+            self._next_update_id += 1
+            message: dict[str] = {
+                "message_id": 1000 + update_id,
+                "date": int(time.time()),
+                "chat": {"id": chat_id, "type": "private"},
+                "from": {"id": chat_id, "is_bot": False, "first_name": "Student"},
+                "text": text,
+            }
+            if text.startswith("/"):
+                message["entities"] = [{"type": "bot_command", "offset": 0, "length": len(text.split()[0])}]
+            update: dict[str] = {"update_id": update_id, "message": message}
+            self.updates.append(update)
+            self._new_update.notify_all()
+        return update
+
+    def wait_for_messages(self, count: int, timeout=5.0) -> bool:
+        """
+        Waits until the bot has sent at least a number of messages.
+
+        Returns:
+            bool: Whether that many messages have been sent within the timeout.
+        """
+        deadline: float = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._lock:
+                if len(self.messages) >= count:
+                    return True
+            time.sleep(0.01)
+        return False
+
+    def call(self, method: str, parameters: dict[str]) -> tuple[int, dict[str]]:
+        """
+        Answers a single Bot API call.
+
+        Args:
+            method (str): The name of the Bot API method, like 'sendMessage'.
+            parameters (dict[str]): The parameters of the call.
+
+        Returns:
+            tuple[int, dict[str]]: The HTTP status and the Bot API response.
+        """
+        match method:
+            case "getUpdates":
+                return 200, {"ok": True, "result": self._get_updates(int(parameters.get("offset", 0) or 0),
+                                                                     float(parameters.get("timeout", 0) or 0))}
+            case "deleteWebhook" | "setMyCommands":
+                return 200, {"ok": True, "result": True}
+            case "getMe":
+                return 200, {"ok": True, "result": {"id": int(self.token.split(":")[0]), "is_bot": True,
+                                                    "first_name": "RegistrateTUD", "username": "fake_bot"}}
+            case "sendMessage":
+                with self._lock:
+                    self.calls += 1
+                    if self.calls <= self.fail_first:
+                        return 502, {"ok": False, "error_code": 502, "description": "Bad Gateway"}
+                    self.messages.append(parameters)
+                    message_id: int = len(self.messages)
+                return 200, {"ok": True, "result": {
+                    "message_id": message_id,
+                    "date": int(time.time()),
+                    "chat": {"id": int(parameters["chat_id"]), "type": "private"},
+                    "text": parameters.get("text", ""),
+                }}
+        return 404, {"ok": False, "error_code": 404, "description": "Not Found"}
+
+    def _get_updates(self, offset: int, timeout: float) -> list[dict[str]]:
+        """
+        Long polls for the updates from the offset on, like the Bot API: it answers as soon as there is an update or
+        once the timeout has passed. The updates before the offset have been handled and are forgotten.
+        """
+        deadline: float = time.monotonic() + timeout
+        with self._new_update:
+            if offset:
+                self.updates = [update for update in self.updates if update["update_id"] >= offset]
+            while not self._stopped:
+                pending: list[dict[str]] = [update for update in self.updates if update["update_id"] >= offset]
+                remaining: float = deadline - time.monotonic()
+                if pending or remaining <= 0:
+                    return pending
+                self._new_update.wait(remaining)
+            return []
+
+    def _create_handler(self) -> type[BaseHTTPRequestHandler]:
+        fake: FakeTelegramAPI = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # The headers and the body are written separately, without this every response waits for a delayed ACK
+            disable_nagle_algorithm = True
+
+            def do_POST(self) -> None:
+                body: bytes = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                prefix, _, method = urlparse(self.path).path.rpartition("/")
+                if prefix != f"/bot{fake.token}":
+                    self._send_json(401, {"ok": False, "error_code": 401, "description": "Unauthorized"})
+                    return
+                if "json" in self.headers.get("Content-Type", ""):
+                    parameters: dict[str] = json.loads(body or b"{}")
+                else:
+                    parameters: dict[str] = dict(parse_qsl(body.decode()))
+                self._send_json(*fake.call(method, parameters))
+
+            do_GET = do_POST
+
+            def _send_json(self, status: int, data: dict[str]) -> None:
+                time.sleep(fake.latency)
+                body: bytes = json.dumps(data).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # A bot that stops cancels its long poll, nobody is waiting for the answer anymore
+                    logging.debug("Fake Telegram API: the client went away before the response was sent")
+
+            def log_message(self, format: str, *args) -> None:
+                logging.debug(f"Fake Telegram API: {format % args}")
+
+        return Handler
+
+
+if __name__ == "__main__":
+    logging.basicConfig(format='%(asctime)s - %(name)s - %(message)s', level=logging.INFO)
+
+    argparser = argparse.ArgumentParser(prog="FakeTelegramAPI", description="Serve a fake Bot API for offline runs")
+    argparser.add_argument("-t", "--token", default="123456:fake-token", help="The bot token to accept")
+    argparser.add_argument("-p", "--port", type=int, default=8081, help="Port to listen on (default=8081)")
+    argparser.add_argument("-l", "--latency", type=float, default=0.0, help="Delay per response in seconds")
+    argparser.add_argument("-f", "--fail-first", type=int, default=0, help="Number of messages to fail first")
+    args: dict[str] = vars(argparser.parse_args())
+
+    fake = FakeTelegramAPI(args["token"], port=args["port"], latency=args["latency"], fail_first=args["fail_first"])
+    fake.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        fake.stop()
+    for message in fake.messages:
+        print(f"To {message['chat_id']}:\n{message.get('text', '')}")
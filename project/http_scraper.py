@@ -0,0 +1,171 @@
+from project.constants import MYTUD_URL, API_SESSION_PATH, API_SEARCH_PATH, API_COURSE_PATH
+from project.mytud_api import search_body, first_hit, classify_search, classify_detail
+from project.scraper import Scraper
+from project.courses import Courses
+from project.course import Course
+from project.status import CourseStatus
+from project.session import SessionCache
+from urllib.parse import urljoin, urlparse
+import urllib3
+import logging
+import json
+import time
+
+
+class HttpScraper(Scraper):
+    """
+    This Scraper backend calls the MyTUD JSON endpoints directly instead of driving a browser. It needs the cookies
+    of a logged in session, which the SeleniumScraper saves in the SessionCache after logging in. All requests go
+    through one pool of keep-alive connections, which is shared with the workers of a parallel scrape.
+    """
+    def __init__(self, courses: Courses, cookies: dict[str, str], workers=1, base_url=MYTUD_URL,
+                 pool: urllib3.PoolManager | None = None, timeout=10.0, **kwargs):
+        """
+        The initialiser method for the HttpScraper class.
+
+        Args:
+            courses (Courses): A Courses object with all of the courses the user has specified they are following.
+            cookies (dict[str, str]): The cookies of a logged in MyTUD session, by name.
+            workers (int, optional): The number of threads that check courses in parallel. Defaults to 1.
+            base_url (str, optional): The MyTUD URL the endpoints are relative to. Defaults to MYTUD_URL.
+            pool (urllib3.PoolManager | None, optional): The connection pool to send requests through. In case it
+                is None, a new pool with a connection per worker is created. Defaults to None.
+            timeout (float, optional): How many seconds a single request may take. Defaults to 10.0.
+            **kwargs: Passed on to Scraper, such as the StatusStore.
+        """
+        super().__init__(courses, workers, **kwargs)
+        self.cookies: dict[str, str] = cookies
+        self.base_url: str = base_url
+        self.timeout: float = timeout
+        self._owns_pool: bool = pool is None
+        self._pool: urllib3.PoolManager = pool or urllib3.PoolManager(maxsize=workers, retries=False)
+
+    @staticmethod
+    def from_session_cache(session_cache: SessionCache, courses: Courses, workers=1, base_url=MYTUD_URL,
+                           **kwargs) -> 'HttpScraper | None':
+        """
+        Creates an HttpScraper with the cookies of the saved session that belong to the MyTUD host.
+
+        Args:
+            session_cache (SessionCache): The cache the SeleniumScraper saved its session to.
+            courses (Courses): A Courses object with all of the courses the user has specified they are following.
+            workers (int, optional): The number of threads that check courses in parallel. Defaults to 1.
+            base_url (str, optional): The MyTUD URL the endpoints are relative to. Defaults to MYTUD_URL.
+            **kwargs: Passed on to the HttpScraper.
+
+        Returns:
+            HttpScraper | None: The scraper, or None in case no session has been saved yet.
+        """
+        session: dict[str] | None = session_cache.load()
+        if not session:
+            return None
+        host: str = urlparse(base_url).hostname or ""
+        cookies: dict[str, str] = {
+            cookie["name"]: cookie["value"] for cookie in session.get("cookies", [])
+            if host.endswith(cookie.get("domain", host).lstrip("."))
+        }
+        return HttpScraper(courses, cookies, workers=workers, base_url=base_url, **kwargs)
+
+    def has_valid_session(self) -> bool:
+        """
+        Checks whether MyTUD still accepts the cookies, without raising.
+
+        Returns:
+            bool: Whether the session is valid.
+        """
+        try:
+            self._login()
+            return True
+        except (PermissionError, ValueError, urllib3.exceptions.HTTPError) as e:
+            logging.info(f"The saved session cannot be used: {e}")
+            return False
+
+    def _login(self) -> None:
+        """
+        There is no login form to fill in without a browser, so this only checks that the session is still valid.
+
+        Raises:
+            PermissionError: In case MyTUD does not accept the session, for example because it has expired.
+        """
+        if not self.cookies:
+            raise PermissionError("No MyTUD session cookies are available")
+        self._request("GET", API_SESSION_PATH)
+
+    def _check_course(self, course: Course) -> CourseStatus:
+        """
+        Searches for the course and, in case the sign up is not closed, requests its details.
+
+        Args:
+            course (Course): The course to check.
+
+        Returns:
+            CourseStatus: The outcome of the check.
+        """
+        with self.metrics.phase("search", course.code):
+            search: dict[str] = self._request("POST", API_SEARCH_PATH, search_body(course.code))
+        status: CourseStatus | None = classify_search(search)
+        if status is not None:
+            return status
+        with self.metrics.phase("detail", course.code):
+            detail: dict[str] = self._request("GET", API_COURSE_PATH.format(id=first_hit(search)["id_cursus"]))
+        return classify_detail(detail)
+
+    def _create_worker(self, index: int, chunk: Courses) -> 'HttpScraper':
+        """
+        Every worker shares the cookies, the connection pool, the shared result cache and the circuit breaker of this
+        Scraper.
+        """
+        return HttpScraper(chunk, self.cookies, base_url=self.base_url, pool=self._pool, timeout=self.timeout,
+                           shared_cache=self.shared_cache, retries=self.retries, backoff=self.backoff,
+                           breaker=self.breaker, recording=self.recording)
+
+    def close(self) -> None:
+        """
+        The connection pool is shared with the workers, so it is only cleared by the Scraper that created it.
+        """
+        if self._owns_pool:
+            self._pool.clear()
+
+    def _request(self, method: str, path: str, body: dict[str] | None = None) -> dict[str]:
+        """
+        Sends a request to a MyTUD endpoint with the session cookies and returns the parsed JSON response.
+
+        Args:
+            method (str): The HTTP method.
+            path (str): The endpoint, relative to the base URL.
+            body (dict[str] | None, optional): A JSON body to send along. Defaults to None.
+
+        Raises:
+            PermissionError: In case MyTUD redirects to the login page or refuses the session.
+            ValueError: In case the response is not the expected JSON.
+
+        Returns:
+            dict[str]: The parsed JSON response.
+        """
+        headers: dict[str, str] = {
+            "Accept": "application/json",
+            "Cookie": "; ".join(f"{name}={value}" for name, value in self.cookies.items()),
+        }
+        data: bytes | None = None
+        if body is not None:
+            headers["Content-Type"] = "application/json"
+            data = json.dumps(body).encode()
+        self.metrics.count("round_trips")
+        start: float = time.perf_counter()
+        try:
+            response = self._pool.request(method, urljoin(self.base_url, path), body=data, headers=headers,
+                                          redirect=False, timeout=self.timeout)
+        except urllib3.exceptions.TimeoutError:
+            self.metrics.count("timeouts", "request")
+            raise
+        if self.recording is not None:
+            self.recording.add_exchange(method, path, body, response.status,
+                                        response.data.decode(errors="replace"), time.perf_counter() - start)
+        if response.status in (301, 302, 303, 307, 401, 403):
+            raise PermissionError(f"MyTUD refused the session ({response.status})")
+        if response.status != 200:
+            raise ValueError(f"Unexpected response from '{path}': {response.status}")
+        try:
+            return json.loads(response.data)
+        except ValueError:
+            raise ValueError(f"The response from '{path}' is not valid JSON")
@@ -1,27 +1,166 @@
 from project.courses import Courses
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Iterator
+from datetime import datetime
+import threading
 import logging
 import smtplib
+import asyncio
+import atexit
+import time
 import ssl
 
 
+class SMTPSessionPool:
+    """
+    This class keeps a logged in SMTP connection per server and account alive between emails, so only the first
+    email pays for the connection, the TLS handshake and the login. A connection is used for one email at a time. A
+    connection that has been idle for longer than most servers keep it open is replaced before it is used, and one
+    that turns out to be dropped while sending is discarded, so the next email reconnects.
+    """
+    def __init__(self, idle_timeout=240.0):
+        """
+        The initialiser method for the SMTPSessionPool class.
+
+        Args:
+            idle_timeout (float, optional): The seconds a connection may be idle before it is replaced instead of
+                reused. Defaults to 240.0, Gmail closes connections after five idle minutes.
+        """
+        self.idle_timeout: float = idle_timeout
+        self.connects: int = 0
+        self._connections: dict[tuple, tuple[smtplib.SMTP, float]] = {}
+        self._locks: dict[tuple, threading.Lock] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    @contextmanager
+    def session(self, smtp_host: str, port: int, user: str, password: str, use_ssl=True,
+                timeout=30.0) -> Iterator[smtplib.SMTP]:
+        """
+        Lends the connection to a server, logged in as user, for the duration of the with block. Waits in case the
+        connection is in use by another email.
+
+        Args:
+            smtp_host (str): The SMTP server.
+            port (int): The SMTP port of the server.
+            user (str): The account to log in with.
+            password (str): The password of the account.
+            use_ssl (bool, optional): Whether the SMTP server expects SSL. Defaults to True.
+            timeout (float, optional): The socket timeout in seconds. Defaults to 30.0.
+
+        Yields:
+            smtplib.SMTP: The logged in connection.
+        """
+        key: tuple = (smtp_host, port, user, use_ssl)
+        with self._lock:
+            lock: threading.Lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            server: smtplib.SMTP | None = None
+            with self._lock:
+                if key in self._connections:
+                    server, last_used = self._connections.pop(key)
+            if server is not None and time.monotonic() - last_used > self.idle_timeout:
+                self._quit(server)
+                server = None
+            if server is None:
+                server = self._connect(smtp_host, port, user, password, use_ssl, timeout)
+            server.timeout = timeout
+            if server.sock is not None:
+                server.sock.settimeout(timeout)
+            try:
+                yield server
+            except (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError):
+                # The connection cannot be trusted anymore, the next email connects again
+                self._quit(server)
+                raise
+            except BaseException:
+                # A refused email (like an unknown recipient) leaves the connection usable
+                self._keep(key, server)
+                raise
+            self._keep(key, server)
+
+    def close(self) -> None:
+        """
+        Logs out of all idle connections.
+        """
+        with self._lock:
+            connections, self._connections = self._connections, {}
+        for server, _ in connections.values():
+            self._quit(server)
+
+    def _connect(self, smtp_host: str, port: int, user: str, password: str, use_ssl: bool,
+                 timeout: float) -> smtplib.SMTP:
+        if use_ssl:
+            server = smtplib.SMTP_SSL(smtp_host, port, context=ssl.create_default_context(), timeout=timeout)
+        else:
+            server = smtplib.SMTP(smtp_host, port, timeout=timeout)
+        try:
+            server.login(user, password)
+        except BaseException:
+            self._quit(server)
+            raise
+        self.connects += 1
+        logging.debug(f"Connected to {smtp_host}:{port} as '{user}'")
+        return server
+
+    def _keep(self, key: tuple, server: smtplib.SMTP) -> None:
+        with self._lock:
+            self._connections[key] = (server, time.monotonic())
+
+    @staticmethod
+    def _quit(server: smtplib.SMTP) -> None:
+        try:
+            server.quit()
+        except Exception as e:
+            logging.debug(f"Could not log out of the SMTP server cleanly: {e!r}")
+            server.close()
+
+
+# Shared by every Mailer, so the emails of all users sending from the same account go over one connection
+SESSION_POOL: SMTPSessionPool = SMTPSessionPool()
+atexit.register(SESSION_POOL.close)
+# smtplib has no asyncio support, so send_mail_async sends from these threads
+SENDERS: ThreadPoolExecutor = ThreadPoolExecutor(thread_name_prefix="mailer")
+
+
 class Mailer:
     """
-    This class handles the email sending using smtplib. The default settings are setup to work with gmail.
+    This class handles the email sending using smtplib. The default settings are setup to work with gmail. Every
+    email goes out over a connection of the SMTPSessionPool, to all receivers at once.
     """
-    def __init__(self, receiver_email: str, sender_email="", pw=""):
+    def __init__(self, receiver_email: str | list[str], sender_email="", pw="", pool: SMTPSessionPool | None = None):
         """
         The initialiser method for the Mailer class.
 
         Args:
-            receiver_email (str): The email address that receives a notification.
+            receiver_email (str | list[str]): The email addresses that receive a notification, either as a list or
+                separated by commas.
             sender_email (str, optional): The email that sends the notification, currently setup to
                 work with gmail buy default. Defaults to "".
             pw (str, optional): The password for the sender email. Should not be accessed from
                 outside of the class. Defaults to "".
+            pool (SMTPSessionPool | None, optional): Where the connections to the SMTP server are kept. Defaults to
+                the pool shared by all Mailers.
         """
-        self.receiver_email: str = receiver_email
+        self.receivers: list[str] = receiver_email
         self.sender_email: str = sender_email
         self.email_pass: str = pw
+        self.pool: SMTPSessionPool = pool or SESSION_POOL
+        self._unfinished: dict[tuple[str, str], Future] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    @property
+    def receivers(self) -> list[str]:
+        return self._receivers
+
+    @receivers.setter
+    def receivers(self, value: str | list[str]) -> None:
+        if isinstance(value, str):
+            value = value.split(",")
+        receivers: list[str] = [receiver.strip() for receiver in value if receiver.strip()]
+        if not receivers:
+            raise ValueError("The receiver email is empty, make sure to set it using 'python __main__.py -i'")
+        self._receivers = receivers
 
     @property
     def sender_email(self) -> str:
@@ -54,17 +193,207 @@ class Mailer:
             port (int, optional): The SMTP port for the SMTP host. Defaults to 465.
             smtp_host (str, optional): The SMTP server that the email gets sent through. Defaults to "smtp.gmail.com".
         """
-        context = ssl.create_default_context()
-        subject: str = "No open sign ups found!"
-        body: str = "No open sign ups were found, you don't have to do anything."
+        try:
+            self.deliver(open_courses, port, smtp_host)
+        except Exception as e:
+            logging.error(f"An error occurred while sending the email:\n{e}")
 
+    async def send_mail_async(self, open_courses: Courses, port=465, smtp_host="smtp.gmail.com", use_ssl=True,
+                              timeout=30.0) -> None:
+        """
+        Sends the email like send_mail, without blocking the event loop. smtplib has no asyncio support, so the
+        email is sent from a worker thread. Errors are raised, so the caller can retry. A thread cannot be stopped, so
+        when the caller gives up waiting (like the Notifier does after its timeout) the email is still being sent.
+        Sending the same email again then waits for that attempt, instead of sending the email a second time.
+
+        Args:
+            open_courses (Courses): A Courses object with all courses that have open signups.
+            port (int, optional): The SMTP port for the SMTP host. Defaults to 465.
+            smtp_host (str, optional): The SMTP server that the email gets sent through. Defaults to "smtp.gmail.com".
+            use_ssl (bool, optional): Whether the SMTP server expects SSL. Defaults to True.
+            timeout (float, optional): The socket timeout in seconds. Defaults to 30.0.
+        """
+        mail: tuple[str, str] = self._create_mail(open_courses)
+        with self._lock:
+            delivery: Future | None = self._unfinished.pop(mail, None)
+        if delivery is not None and delivery.done() and (delivery.cancelled() or delivery.exception() is not None):
+            delivery = None
+        if delivery is None:
+            delivery = SENDERS.submit(self.send_message, *mail, port, smtp_host, use_ssl, timeout)
         try:
-            with smtplib.SMTP_SSL(smtp_host, port, context=context) as server:
-                server.login(self.sender_email, self.__email_pass)
-                if open_courses.courses:
-                    subject = "Open courses available!"
-                    body = f"The following courses are available for sign up:\n{open_courses}\n\n\n--RegistrateTUD"
-                msg: str = f"Subject: {subject}\n\n{body}"
-                server.sendmail(self.sender_email, self.receiver_email, msg)
+            # Cancelling the wait does not stop a thread that is already sending
+            await asyncio.wrap_future(delivery)
+        except asyncio.CancelledError:
+            with self._lock:
+                self._unfinished[mail] = delivery
+            raise
+
+    def deliver(self, open_courses: Courses, port=465, smtp_host="smtp.gmail.com", use_ssl=True, timeout=30.0) -> None:
+        """
+        Sends the email and raises on any error, see send_mail.
+
+        Args:
+            open_courses (Courses): A Courses object with all courses that have open signups.
+            port (int, optional): The SMTP port for the SMTP host. Defaults to 465.
+            smtp_host (str, optional): The SMTP server that the email gets sent through. Defaults to "smtp.gmail.com".
+            use_ssl (bool, optional): Whether the SMTP server expects SSL. Defaults to True.
+            timeout (float, optional): The socket timeout in seconds. Defaults to 30.0.
+        """
+        self.send_message(*self._create_mail(open_courses), port, smtp_host, use_ssl, timeout)
+
+    def send_message(self, subject: str, body: str, port=465, smtp_host="smtp.gmail.com", use_ssl=True,
+                     timeout=30.0) -> None:
+        """
+        Sends an email to all receivers over a pooled connection and raises on any error. In case the connection
+        turns out to have been dropped, the email is sent once more over a new connection.
+
+        Args:
+            subject (str): The subject of the email.
+            body (str): The text of the email.
+            port (int, optional): The SMTP port for the SMTP host. Defaults to 465.
+            smtp_host (str, optional): The SMTP server that the email gets sent through. Defaults to "smtp.gmail.com".
+            use_ssl (bool, optional): Whether the SMTP server expects SSL. Defaults to True.
+            timeout (float, optional): The socket timeout in seconds. Defaults to 30.0.
+        """
+        msg: str = f"Subject: {subject}\n\n{body}"
+        for attempt in range(2):
+            try:
+                with self.pool.session(smtp_host, port, self.sender_email, self.__email_pass, use_ssl,
+                                       timeout) as server:
+                    server.sendmail(self.sender_email, self.receivers, msg)
+                return
+            except (smtplib.SMTPServerDisconnected, ConnectionError) as e:
+                if attempt == 1:
+                    raise
+                logging.info(f"The SMTP connection was dropped, reconnecting: {e!r}")
+
+
+    @staticmethod
+    def _create_mail(open_courses: Courses) -> tuple[str, str]:
+        """
+        Returns:
+            tuple[str, str]: The subject and the body of the email about the open courses.
+        """
+        if open_courses.courses:
+            return ("Open courses available!",
+                    f"The following courses are available for sign up:\n{open_courses}\n\n\n--RegistrateTUD")
+        return "No open sign ups found!", "No open sign ups were found, you don't have to do anything."
+
+
+class MailDigest:
+    """
+    This class collects the emails of status changes that arrive within a window into a single digest email. The
+    window starts with the first change, the digest lists every change with the time it was noticed and ends with the
+    courses that are open according to the latest one. A digest that cannot be sent is kept and sent together with
+    the changes of the next window.
+    """
+    def __init__(self, mailer: Mailer, window=600.0, port=465, smtp_host="smtp.gmail.com", use_ssl=True,
+                 timeout=30.0):
+        """
+        The initialiser method for the MailDigest class.
+
+        Args:
+            mailer (Mailer): Sends the digest.
+            window (float, optional): The seconds changes are collected for before the digest is sent.
+                Defaults to 600.0.
+            port (int, optional): The SMTP port for the SMTP host. Defaults to 465.
+            smtp_host (str, optional): The SMTP server that the email gets sent through. Defaults to "smtp.gmail.com".
+            use_ssl (bool, optional): Whether the SMTP server expects SSL. Defaults to True.
+            timeout (float, optional): The socket timeout in seconds. Defaults to 30.0.
+        """
+        if window <= 0:
+            raise ValueError(f"The window of a digest must be positive, not: '{window}'")
+        self.mailer: Mailer = mailer
+        self.window: float = window
+        self.port: int = port
+        self.smtp_host: str = smtp_host
+        self.use_ssl: bool = use_ssl
+        self.timeout: float = timeout
+        self.sent: int = 0
+        self._pending: list[tuple[float, Courses, list[str]]] = []
+        self._timer: threading.Timer | None = None
+        self._lock: threading.Lock = threading.Lock()
+
+    def __enter__(self) -> 'MailDigest':
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def add(self, open_courses: Courses, changed: list[str] | None = None) -> None:
+        """
+        Adds the outcome of a scrape to the digest, starting the window in case it is the first one.
+
+        Args:
+            open_courses (Courses): The open courses according to the results of the scrape.
+            changed (list[str] | None, optional): The codes of the courses whose status changed. Defaults to None.
+        """
+        with self._lock:
+            self._pending.append((time.time(), open_courses, list(changed or [])))
+            if self._timer is None:
+                self._start_timer()
+        logging.info(f"Added the email to the digest, which is sent within {self.window:g} seconds")
+
+    def flush(self) -> bool:
+        """
+        Sends the collected changes right away.
+
+        Returns:
+            bool: Whether there was nothing to send or the digest has been sent.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            pending, self._pending = self._pending, []
+        if not pending:
+            return True
+        try:
+            self.mailer.send_message(*self._create_digest(pending), self.port, self.smtp_host, self.use_ssl,
+                                     self.timeout)
         except Exception as e:
-            logging.error(f"An error occurred while sending the email:\n{e}")
\ No newline at end of file
+            logging.error(f"Could not send the digest of {len(pending)} changes, retrying with the next window:\n{e!r}")
+            with self._lock:
+                self._pending = pending + self._pending
+                if self._timer is None:
+                    self._start_timer()
+            return False
+        self.sent += 1
+        logging.info(f"Sent the digest of {len(pending)} changes")
+        return True
+
+    def close(self) -> None:
+        """
+        Sends the collected changes and stops the window, called when the program stops.
+        """
+        self.flush()
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def _start_timer(self) -> None:
+        """
+        Starts the window, should be called with the lock held.
+        """
+        self._timer = threading.Timer(self.window, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    @staticmethod
+    def _create_digest(pending: list[tuple[float, Courses, list[str]]]) -> tuple[str, str]:
+        """
+        Returns:
+            tuple[str, str]: The subject and the body of the digest.
+        """
+        open_courses: Courses = pending[-1][1]
+        lines: list[str] = [f"{len(pending)} status changes were noticed:"]
+        for moment, _, changed in pending:
+            lines.append(f"{datetime.fromtimestamp(moment):%Y-%m-%d %H:%M}: {', '.join(changed) or 'unknown courses'}")
+        if open_courses.courses:
+            subject: str = "Open courses available!"
+            lines.append(f"\nThe following courses are available for sign up:\n{open_courses}")
+        else:
+            subject: str = "No open sign ups found!"
+            lines.append("\nNo open sign ups were found, you don't have to do anything.")
+        return subject, "\n".join(lines) + "\n\n\n--RegistrateTUD"
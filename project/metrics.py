@@ -0,0 +1,221 @@
+from project.utils import write_atomically
+from contextlib import contextmanager
+from typing import Iterator
+import threading
+import time
+import json
+import os
+
+
+class RunMetrics:
+    """
+    This class records where the time of a scrape goes: the duration of every phase (like the driver startup, the
+    login, searching and resetting the search), per course and in total, the number of round trips to the browser
+    or MyTUD and how often something timed out. The metrics can be exported as a JSON report and as a Prometheus text
+    file. Recording is thread safe, so parallel workers can record into the same instance.
+    """
+    def __init__(self):
+        """
+        The initialiser method for the RunMetrics class.
+        """
+        self.started_at: float = time.time()
+        self.duration: float | None = None
+        self.phases: dict[str, list[float]] = {}
+        self.courses: dict[str, dict[str, float]] = {}
+        self.statuses: dict[str, str] = {}
+        self.counters: dict[str, dict[str, int]] = {}
+        self._start: float = time.perf_counter()
+        self._lock: threading.Lock = threading.Lock()
+
+    @property
+    def finished(self) -> bool:
+        return self.duration is not None
+
+    @property
+    def elapsed(self) -> float:
+        """
+        Returns:
+            float: How many seconds have passed since the run started.
+        """
+        return time.perf_counter() - self._start
+
+    @contextmanager
+    def phase(self, name: str, course: str | None = None) -> Iterator[None]:
+        """
+        Times the with block as a phase. The time is recorded even when the block raises.
+
+        Args:
+            name (str): The name of the phase, like 'login' or 'search'.
+            course (str | None, optional): The code of the course the phase belongs to, in case it belongs to one.
+                Defaults to None.
+        """
+        start: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start, course)
+
+    def record(self, name: str, seconds: float, course: str | None = None) -> None:
+        """
+        Records the duration of a phase that has been timed elsewhere.
+
+        Args:
+            name (str): The name of the phase.
+            seconds (float): The duration.
+            course (str | None, optional): The code of the course the phase belongs to. Defaults to None.
+        """
+        with self._lock:
+            self.phases.setdefault(name, []).append(seconds)
+            if course is not None:
+                durations: dict[str, float] = self.courses.setdefault(course, {})
+                durations[name] = durations.get(name, 0.0) + seconds
+
+    def set_status(self, course: str, status: str) -> None:
+        """
+        Records the outcome of a course, including courses that were not checked since their outcome was known.
+
+        Args:
+            course (str): The course code.
+            status (str): The value of the CourseStatus.
+        """
+        with self._lock:
+            self.statuses[course] = status
+
+    def count(self, name: str, label="", amount=1) -> None:
+        """
+        Increases a counter, like 'round_trips' or 'timeouts'.
+
+        Args:
+            name (str): The name of the counter.
+            label (str, optional): What the count is about, for example the phase a timeout happened in.
+                Defaults to "".
+            amount (int, optional): How much to add. Defaults to 1.
+        """
+        with self._lock:
+            counter: dict[str, int] = self.counters.setdefault(name, {})
+            counter[label] = counter.get(label, 0) + amount
+
+    def total(self, name: str) -> int:
+        """
+        Returns:
+            int: The sum of a counter over all labels.
+        """
+        with self._lock:
+            return sum(self.counters.get(name, {}).values())
+
+    def merge(self, other: 'RunMetrics') -> None:
+        """
+        Adds everything another RunMetrics recorded, like the metrics of a parallel worker.
+
+        Args:
+            other (RunMetrics): The metrics to add.
+        """
+        with other._lock:
+            phases = {name: list(durations) for name, durations in other.phases.items()}
+            courses = {code: dict(durations) for code, durations in other.courses.items()}
+            statuses = dict(other.statuses)
+            counters = {name: dict(counter) for name, counter in other.counters.items()}
+        with self._lock:
+            for name, durations in phases.items():
+                self.phases.setdefault(name, []).extend(durations)
+            for code, durations in courses.items():
+                merged: dict[str, float] = self.courses.setdefault(code, {})
+                for name, seconds in durations.items():
+                    merged[name] = merged.get(name, 0.0) + seconds
+            self.statuses.update(statuses)
+            for name, counter in counters.items():
+                target: dict[str, int] = self.counters.setdefault(name, {})
+                for label, amount in counter.items():
+                    target[label] = target.get(label, 0) + amount
+
+    def finish(self) -> None:
+        """
+        Marks the run as done and records its total duration.
+        """
+        self.duration = time.perf_counter() - self._start
+
+    def to_dict(self) -> dict[str]:
+        """
+        Returns:
+            dict[str]: The run report, with a summary per phase and the durations and outcome per course.
+        """
+        with self._lock:
+            return {
+                "started_at": self.started_at,
+                "duration": self.duration if self.duration is not None else time.perf_counter() - self._start,
+                "phases": {
+                    name: {"count": len(durations), "total": sum(durations), "max": max(durations)}
+                    for name, durations in self.phases.items()
+                },
+                "courses": {
+                    code: {"status": self.statuses.get(code), "phases": dict(self.courses.get(code, {}))}
+                    for code in {**self.courses, **self.statuses}
+                },
+                "counters": {name: dict(counter) for name, counter in self.counters.items()},
+            }
+
+    def to_prometheus(self, prefix="registratetud") -> str:
+        """
+        Formats the metrics in the Prometheus text format, as read by the textfile collector of the node exporter.
+
+        Args:
+            prefix (str, optional): The prefix of every metric name. Defaults to "registratetud".
+
+        Returns:
+            str: The metrics, one sample per line.
+        """
+        report: dict[str] = self.to_dict()
+        lines: list[str] = [
+            f"# HELP {prefix}_run_duration_seconds Duration of the last scrape.",
+            f"# TYPE {prefix}_run_duration_seconds gauge",
+            f"{prefix}_run_duration_seconds {report['duration']:.6f}",
+            f"# HELP {prefix}_run_timestamp_seconds Start of the last scrape.",
+            f"# TYPE {prefix}_run_timestamp_seconds gauge",
+            f"{prefix}_run_timestamp_seconds {report['started_at']:.3f}",
+            f"# HELP {prefix}_phase_seconds Time spent per phase during the last scrape.",
+            f"# TYPE {prefix}_phase_seconds summary",
+        ]
+        for name, phase in report["phases"].items():
+            lines.append(f'{prefix}_phase_seconds_sum{{phase="{_escape(name)}"}} {phase["total"]:.6f}')
+            lines.append(f'{prefix}_phase_seconds_count{{phase="{_escape(name)}"}} {phase["count"]}')
+        lines += [
+            f"# HELP {prefix}_course_seconds Time spent per course and phase during the last scrape.",
+            f"# TYPE {prefix}_course_seconds gauge",
+        ]
+        for code, course in report["courses"].items():
+            for name, seconds in course["phases"].items():
+                lines.append(f'{prefix}_course_seconds{{course="{_escape(code)}",phase="{_escape(name)}"}} '
+                             f'{seconds:.6f}')
+        lines += [
+            f"# HELP {prefix}_courses Number of courses per outcome of the last scrape.",
+            f"# TYPE {prefix}_courses gauge",
+        ]
+        outcomes: dict[str, int] = {}
+        for course in report["courses"].values():
+            status: str = course["status"] or "unchecked"
+            outcomes[status] = outcomes.get(status, 0) + 1
+        for status, amount in outcomes.items():
+            lines.append(f'{prefix}_courses{{status="{_escape(status)}"}} {amount}')
+        for name, counter in report["counters"].items():
+            lines += [f"# HELP {prefix}_{name} Number of {name.replace('_', ' ')} during the last scrape.",
+                      f"# TYPE {prefix}_{name} gauge"]
+            for label, amount in counter.items():
+                lines.append(f'{prefix}_{name}{{label="{_escape(label)}"}} {amount}' if label
+                             else f"{prefix}_{name} {amount}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, directory: str) -> None:
+        """
+        Writes the run report to metrics.json and the Prometheus metrics to registratetud.prom in a directory. Both
+        files are replaced atomically, so the node exporter never reads a half written file.
+
+        Args:
+            directory (str): The directory to write to, like the textfile directory of the node exporter.
+        """
+        os.makedirs(directory, exist_ok=True)
+        write_atomically(os.path.join(directory, "metrics.json"), json.dumps(self.to_dict(), indent=4))
+        write_atomically(os.path.join(directory, "registratetud.prom"), self.to_prometheus())
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
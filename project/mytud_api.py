@@ -0,0 +1,94 @@
+from project.constants import CLOSED_SIGNUP, UNABLE_TO_SIGNUP, SIGNUP_AVAILABLE, NOT_IN_PROGRAM
+from project.status import CourseStatus
+
+
+def search_body(code: str) -> dict[str]:
+    """
+    Builds the body of a course search request, the same query the search bar on the sign up page sends.
+
+    Args:
+        code (str): The course code to search for.
+
+    Returns:
+        dict[str]: The JSON body for the search endpoint.
+    """
+    return {
+        "from": 0,
+        "size": 25,
+        "query": {"bool": {"must": [{"multi_match": {"query": code, "fields": ["cursus", "cursus_lange_naam"]}}]}},
+    }
+
+
+def first_hit(search: dict[str]) -> dict[str] | None:
+    """
+    Returns the first course of a search response. The sign up page also opens the first result.
+
+    Args:
+        search (dict[str]): The parsed JSON response of the search endpoint.
+
+    Raises:
+        ValueError: In case the response does not have the shape of a search response.
+
+    Returns:
+        dict[str] | None: The first course in the results, or None if nothing was found.
+    """
+    try:
+        hits: list[dict[str]] = search["hits"]["hits"]
+        return hits[0]["_source"] if hits else None
+    except (KeyError, IndexError, TypeError) as e:
+        raise ValueError(f"Malformed search response: {e!r}")
+
+
+def classify_search(search: dict[str]) -> CourseStatus | None:
+    """
+    Classifies a search response the same way the result list on the sign up page is read.
+
+    Args:
+        search (dict[str]): The parsed JSON response of the search endpoint.
+
+    Returns:
+        CourseStatus | None: NOT_FOUND or CLOSED, or None in case the course details still have to be checked.
+    """
+    hit: dict[str] | None = first_hit(search)
+    if hit is None:
+        return CourseStatus.NOT_FOUND
+    if _contains(hit, CLOSED_SIGNUP):
+        return CourseStatus.CLOSED
+    return None
+
+
+def classify_detail(detail: dict[str]) -> CourseStatus:
+    """
+    Classifies the details of a course the same way the course page is read, checking the markers in the same order.
+
+    Args:
+        detail (dict[str]): The parsed JSON response of the course endpoint.
+
+    Raises:
+        ValueError: In case the response does not have the shape of a course response.
+
+    Returns:
+        CourseStatus: The outcome for the course.
+    """
+    if not isinstance(detail, dict):
+        raise ValueError(f"Malformed course response: '{type(detail)}'")
+    if _contains(detail, UNABLE_TO_SIGNUP):
+        return CourseStatus.UNABLE
+    if _contains(detail, SIGNUP_AVAILABLE) or detail.get("toetsen"):
+        return CourseStatus.AVAILABLE
+    if _contains(detail, NOT_IN_PROGRAM):
+        return CourseStatus.NOT_IN_PROGRAM
+    return CourseStatus.UNKNOWN
+
+
+def _contains(value, marker: str) -> bool:
+    """
+    Looks for a marker string anywhere in the (nested) values of a JSON response.
+    """
+    if isinstance(value, str):
+        return marker in value
+    if isinstance(value, dict):
+        return any(_contains(v, marker) for v in value.values())
+    if isinstance(value, list):
+        return any(_contains(v, marker) for v in value)
+    return False
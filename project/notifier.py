@@ -0,0 +1,76 @@
+from typing import Awaitable, Callable
+import logging
+import asyncio
+
+
+class Notifier:
+    """
+    This class sends a notification over every configured channel at the same time on a single event loop. Every
+    channel gets its own timeout and is retried with an exponential backoff, so a slow or failing channel does not
+    hold up or break the others.
+    """
+    def __init__(self, channels: dict[str, Callable[[], Awaitable[None]]], timeout=30.0, retries=3, backoff=2.0):
+        """
+        The initialiser method for the Notifier class.
+
+        Args:
+            channels (dict[str, Callable[[], Awaitable[None]]]): Per channel name, a function that returns a new
+                coroutine sending the notification over that channel. A new coroutine is needed for every attempt.
+            timeout (float, optional): The time in seconds a single attempt of a channel may take. Defaults to 30.0.
+            retries (int, optional): The number of attempts per channel. Defaults to 3.
+            backoff (float, optional): The delay in seconds before the second attempt, doubling for every attempt
+                after that. Defaults to 2.0.
+        """
+        if retries < 1:
+            raise ValueError(f"A channel needs at least one attempt, not: '{retries}'")
+        self.channels: dict[str, Callable[[], Awaitable[None]]] = channels
+        self.timeout: float = timeout
+        self.retries: int = retries
+        self.backoff: float = backoff
+
+    def send(self) -> dict[str, bool]:
+        """
+        Sends over all channels and blocks until every channel has succeeded or run out of attempts.
+
+        Returns:
+            dict[str, bool]: Per channel name, whether the notification was sent.
+        """
+        return asyncio.run(self.send_async())
+
+    async def send_async(self) -> dict[str, bool]:
+        """
+        Sends over all channels concurrently, see send.
+
+        Returns:
+            dict[str, bool]: Per channel name, whether the notification was sent.
+        """
+        results: list[bool] = await asyncio.gather(
+            *(self._send_channel(name, send) for name, send in self.channels.items())
+        )
+        return dict(zip(self.channels, results))
+
+    async def _send_channel(self, name: str, send: Callable[[], Awaitable[None]]) -> bool:
+        """
+        Sends over a single channel, retrying failed and timed out attempts.
+
+        Args:
+            name (str): The name of the channel, used for logging.
+            send (Callable[[], Awaitable[None]]): Returns a new coroutine sending the notification.
+
+        Returns:
+            bool: Whether one of the attempts succeeded.
+        """
+        for attempt in range(1, self.retries + 1):
+            try:
+                await asyncio.wait_for(send(), self.timeout)
+                logging.info(f"Sent the {name} notification")
+                return True
+            except asyncio.TimeoutError:
+                logging.warning(f"Sending the {name} notification timed out after {self.timeout}s "
+                                f"(attempt {attempt}/{self.retries})")
+            except Exception as e:
+                logging.warning(f"Sending the {name} notification failed (attempt {attempt}/{self.retries}): {e!r}")
+            if attempt < self.retries:
+                await asyncio.sleep(self.backoff * 2 ** (attempt - 1))
+        logging.error(f"Could not send the {name} notification")
+        return False
@@ -0,0 +1,181 @@
+from project.status import CourseStatus
+from project.utils import write_atomically
+from urllib.parse import urlparse
+import threading
+import time
+import json
+
+
+class SessionRecording:
+    """
+    This class keeps what a scrape saw of MyTUD: every response of its JSON endpoints, a snapshot of the page after
+    every step of the search bar and the outcome of every course, together with how long each of them took. Saved
+    to a file, a recording can be served back by project.fakes.replay, so the scrapers can be tested offline against
+    the real shape of the pages and responses instead of a made up one.
+    """
+    def __init__(self, base_url: str = ""):
+        """
+        The initialiser method for the SessionRecording class.
+
+        Args:
+            base_url (str, optional): The MyTUD URL the recorded paths are relative to. Defaults to "".
+        """
+        self.base_url: str = base_url
+        self.recorded_at: float = time.time()
+        self.duration: float | None = None
+        self.exchanges: list[dict[str]] = []
+        self.snapshots: list[dict[str]] = []
+        self.outcomes: dict[str, str] = {}
+        self._start: float = time.perf_counter()
+        self._lock: threading.Lock = threading.Lock()
+
+    @staticmethod
+    def load(path: str) -> 'SessionRecording':
+        """
+        Reads a recording saved with save.
+
+        Args:
+            path (str): The JSON file of the recording.
+
+        Raises:
+            ValueError: In case the file is not a recording.
+
+        Returns:
+            SessionRecording: The recording.
+        """
+        with open(path) as f:
+            data: dict[str] = json.load(f)
+        if not isinstance(data, dict) or "exchanges" not in data or "snapshots" not in data:
+            raise ValueError(f"'{path}' is not a session recording")
+        recording: SessionRecording = SessionRecording(data.get("base_url", ""))
+        recording.recorded_at = data.get("recorded_at", recording.recorded_at)
+        recording.duration = data.get("duration")
+        recording.exchanges = data["exchanges"]
+        recording.snapshots = data["snapshots"]
+        recording.outcomes = data.get("outcomes", {})
+        return recording
+
+    def save(self, path: str) -> None:
+        """
+        Writes the recording to a JSON file, replacing it atomically.
+
+        Args:
+            path (str): The JSON file to write.
+        """
+        with self._lock:
+            data: dict[str] = {
+                "base_url": self.base_url,
+                "recorded_at": self.recorded_at,
+                "duration": self.duration,
+                "exchanges": list(self.exchanges),
+                "snapshots": list(self.snapshots),
+                "outcomes": dict(self.outcomes),
+            }
+        write_atomically(path, json.dumps(data))
+
+    def add_exchange(self, method: str, url: str, body: dict[str] | None, status: int, response: str,
+                     elapsed: float) -> None:
+        """
+        Records a request to MyTUD and its response.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The URL or the path relative to the base URL.
+            body (dict[str] | None): The JSON body that was sent along.
+            status (int): The HTTP status of the response.
+            response (str): The body of the response.
+            elapsed (float): How many seconds the request took.
+        """
+        exchange: dict[str] = {"offset": self._offset(), "method": method.upper(), "path": self.relative(url),
+                               "body": body, "status": status, "response": response, "elapsed": elapsed}
+        with self._lock:
+            self.exchanges.append(exchange)
+
+    def add_snapshot(self, course: str, phase: str, html: str, status: CourseStatus, elapsed: float) -> None:
+        """
+        Records the page the scraper read a course from.
+
+        Args:
+            course (str): The course code.
+            phase (str): The step the page belongs to, 'search' for the search results or 'course' for the page of
+                the course.
+            html (str): The inner HTML of the body of the page.
+            status (CourseStatus): What the scraper read from the page.
+            elapsed (float): How many seconds it took the page to show the result.
+        """
+        snapshot: dict[str] = {"offset": self._offset(), "course": course.upper(), "phase": phase, "html": html,
+                               "status": status.value, "elapsed": elapsed}
+        with self._lock:
+            self.snapshots.append(snapshot)
+
+    def add_outcome(self, course: str, status: CourseStatus) -> None:
+        """
+        Records the outcome of a course, which a replay is compared with.
+        """
+        with self._lock:
+            self.outcomes[course.upper()] = status.value
+
+    def finish(self, duration: float) -> None:
+        """
+        Records how long the scrape took, which a replay is compared with.
+
+        Args:
+            duration (float): The duration of the scrape in seconds.
+        """
+        self.duration = duration
+
+    def relative(self, url: str) -> str:
+        """
+        Returns:
+            str: The path of a URL relative to the base URL, without a leading slash.
+        """
+        if self.base_url and url.startswith(self.base_url):
+            url = url[len(self.base_url):]
+        elif "://" in url:
+            url = urlparse(url).path
+        return url.lstrip("/")
+
+    def exchange(self, method: str, path: str, query: str | None = None) -> dict[str] | None:
+        """
+        Looks up the last recorded exchange of a request.
+
+        Args:
+            method (str): The HTTP method.
+            path (str): The path relative to the base URL.
+            query (str | None, optional): For searches, the course code that was searched for. Defaults to None.
+
+        Returns:
+            dict[str] | None: The exchange, or None in case the request has not been recorded.
+        """
+        for exchange in reversed(self.exchanges):
+            if exchange["method"] != method.upper() or exchange["path"] != path.lstrip("/"):
+                continue
+            if query is None or search_query(exchange["body"]) == query.strip().upper():
+                return exchange
+        return None
+
+    def snapshot(self, course: str, phase: str) -> dict[str] | None:
+        """
+        Looks up the last recorded snapshot of a course, see add_snapshot.
+
+        Returns:
+            dict[str] | None: The snapshot, or None in case it has not been recorded.
+        """
+        for snapshot in reversed(self.snapshots):
+            if snapshot["course"] == course.strip().upper() and snapshot["phase"] == phase:
+                return snapshot
+        return None
+
+    def _offset(self) -> float:
+        return time.perf_counter() - self._start
+
+
+def search_query(body: dict[str] | None) -> str | None:
+    """
+    Returns:
+        str | None: The course code a search request body searches for, or None in case it is not a search.
+    """
+    try:
+        return body["query"]["bool"]["must"][0]["multi_match"]["query"].strip().upper()
+    except (KeyError, IndexError, TypeError, AttributeError):
+        return None
@@ -0,0 +1,170 @@
+from project.status_store import StatusStore
+from project.status import CourseStatus
+from project.course import Course
+import logging
+import math
+import time
+
+
+# How much a course is worth checking based on its last status. A closed sign up means MyTUD already lists the
+# course, so its sign up could open soon. A course that has never been checked is as important as an open one.
+STATUS_WEIGHTS: dict[CourseStatus | None, float] = {
+    None: 2.0,
+    CourseStatus.CLOSED: 2.0,
+    CourseStatus.AVAILABLE: 1.0,
+    CourseStatus.UNKNOWN: 1.0,
+    CourseStatus.UNABLE: 0.5,
+    CourseStatus.NOT_IN_PROGRAM: 0.5,
+    CourseStatus.NOT_FOUND: 0.2,
+}
+
+YEAR: float = 365.25 * 24 * 3600
+DAY: float = 24 * 3600
+
+
+class SignupScheduler:
+    """
+    This class decides which courses to check and in which order, within a budget of checks per hour. Exam sign ups
+    open in the same windows every academic year, so the scheduler learns from the history in the StatusStore when
+    the sign up of every course opened before. A course gets checked more often the closer the current date is to
+    one of those windows (or, for a course that has never opened, to a window in which the sign up of other courses
+    opened) and the more its last status suggests the sign up could open. Dormant courses are still checked, but
+    rarely.
+
+    The budget is divided over the courses by their weight, which gives every course an interval between checks.
+    A course is due once its interval has passed since its last check, the due courses are checked with the most
+    likely to open first. No more courses are handed out than the budget allows within the last hour. The checks are
+    counted from the StatusStore once they have been recorded, so runs that share the store share the budget.
+    """
+    def __init__(self, store: StatusStore, checks_per_hour=60.0, min_interval=300.0, max_interval=86400.0,
+                 spread=7.0, seasonal_boost=4.0):
+        """
+        The initialiser method for the SignupScheduler class.
+
+        Args:
+            store (StatusStore): Where the last check and the history of every course is kept.
+            checks_per_hour (float, optional): The total number of course checks per hour. Defaults to 60.0.
+            min_interval (float, optional): The shortest time in seconds between two checks of the same course.
+                Defaults to 300.0.
+            max_interval (float, optional): The longest time in seconds between two checks of the same course, so
+                dormant courses are not forgotten. Defaults to 86400.0.
+            spread (float, optional): How many days around a past opening a sign up is expected to open again.
+                Defaults to 7.0.
+            seasonal_boost (float, optional): How much more often a course is checked right at a past opening,
+                compared to outside of a window. Defaults to 4.0.
+        """
+        if checks_per_hour < 1:
+            raise ValueError(f"The budget must be at least 1 check per hour, not: '{checks_per_hour}'")
+        if not 0 < min_interval <= max_interval:
+            raise ValueError(f"The intervals must satisfy 0 < min <= max, not: '{min_interval}', '{max_interval}'")
+        self.store: StatusStore = store
+        self.checks_per_hour: float = checks_per_hour
+        self.min_interval: float = min_interval
+        self.max_interval: float = max_interval
+        self.spread: float = spread
+        self.seasonal_boost: float = seasonal_boost
+
+    def due(self, courses: list[Course], now: float | None = None) -> list[Course]:
+        """
+        Picks the courses to check now within what is left of the budget. The courses only count against the budget
+        once their outcome has been recorded in the StatusStore.
+
+        Args:
+            courses (list[Course]): The incomplete courses.
+            now (float | None, optional): The current time in seconds since the epoch. Defaults to time.time().
+
+        Returns:
+            list[Course]: The courses to check, the most likely to open first.
+        """
+        now = now or time.time()
+        remaining: int = self._remaining(now)
+        weights: dict[str, float] = self.weights([course.code for course in courses], now)
+        intervals: dict[str, float] = self.intervals(weights)
+        candidates: list[tuple[float, float, Course]] = []
+        for course in courses:
+            last: tuple[CourseStatus, float] | None = self.store.get(course.code)
+            overdue: float = math.inf if last is None else (now - last[1]) / intervals[course.code]
+            if overdue >= 1:
+                candidates.append((weights[course.code], overdue, course))
+        candidates.sort(key=lambda candidate: (candidate[0], candidate[1]), reverse=True)
+        if len(candidates) > remaining:
+            logging.info(f"{len(candidates)} courses are due, checking {remaining} within the budget of "
+                         f"{self.checks_per_hour:.0f} checks per hour")
+        return [course for _, _, course in candidates[:max(0, remaining)]]
+
+    def next_due_in(self, courses: list[Course], now: float | None = None) -> float:
+        """
+        Returns:
+            float: How many seconds are left until a course is due and the budget allows checking it.
+        """
+        now = now or time.time()
+        weights: dict[str, float] = self.weights([course.code for course in courses], now)
+        intervals: dict[str, float] = self.intervals(weights)
+        wait: float = self.max_interval
+        for course in courses:
+            last: tuple[CourseStatus, float] | None = self.store.get(course.code)
+            wait = min(wait, 0.0 if last is None else last[1] + intervals[course.code] - now)
+        checks: list[float] = self.store.checks_since(now - 3600)
+        if len(checks) >= int(self.checks_per_hour):
+            # The budget allows a check again once enough of the checks of the last hour are an hour old
+            wait = max(wait, checks[len(checks) - int(self.checks_per_hour)] + 3600 - now)
+        return max(0.0, wait)
+
+    def weights(self, codes: list[str], now: float) -> dict[str, float]:
+        """
+        Weighs how likely the sign up of every course is to open around now, see STATUS_WEIGHTS.
+
+        Args:
+            codes (list[str]): The course codes.
+            now (float): The current time in seconds since the epoch.
+
+        Returns:
+            dict[str, float]: The weight per course code, higher means checked more often and earlier.
+        """
+        openings: dict[str, list[float]] = self.store.changes(CourseStatus.AVAILABLE)
+        # The windows of all courses together, averaged so a single course with many openings does not dominate
+        prior: float = sum(self._seasonal(times, now) for times in openings.values()) / max(1, len(openings))
+        weights: dict[str, float] = {}
+        for code in codes:
+            last: tuple[CourseStatus, float] | None = self.store.get(code)
+            base: float = STATUS_WEIGHTS[last[0] if last is not None else None]
+            # A course that has opened before has its own windows, the others can only go by the other courses
+            seasonal: float = self._seasonal(openings[code], now) if code in openings else 0.5 * prior
+            weights[code] = base * (1 + self.seasonal_boost * seasonal)
+        return weights
+
+    def intervals(self, weights: dict[str, float]) -> dict[str, float]:
+        """
+        Divides the budget over the courses by weight.
+
+        Args:
+            weights (dict[str, float]): The weight per course code, see weights.
+
+        Returns:
+            dict[str, float]: The time in seconds between two checks per course code, between the minimum and the
+                maximum interval.
+        """
+        total: float = sum(weights.values()) or 1.0
+        return {
+            code: min(self.max_interval, max(self.min_interval, 3600 * total / (self.checks_per_hour * weight)))
+            for code, weight in weights.items()
+        }
+
+    def _seasonal(self, times: list[float], now: float) -> float:
+        """
+        Scores how close the current date is to the same date in the academic year as any of the given times, 1 right
+        at one of them and going to 0 a couple of spreads away.
+        """
+        score: float = 0.0
+        for moment in times:
+            offset: float = (now - moment) % YEAR
+            days: float = min(offset, YEAR - offset) / DAY
+            score = max(score, math.exp(-0.5 * (days / self.spread) ** 2))
+        return score
+
+    def _remaining(self, now: float) -> int:
+        """
+        Returns:
+            int: How many checks the budget still allows within the last hour, counted from the StatusStore.
+        """
+        return int(self.checks_per_hour) - len(self.store.checks_since(now - 3600))
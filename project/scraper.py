@@ -1,43 +1,84 @@
-from selenium.webdriver import Chrome, Firefox
-from selenium.webdriver.common.by import By
-from selenium.common.exceptions import TimeoutException
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as ec
-from project.constants import SIGN_UP_URL, NO_COURSES_FOUND, CLOSED_SIGNUP, UNABLE_TO_SIGNUP, SIGNUP_AVAILABLE, NOT_IN_PROGRAM
-from project.utils import read_from_json, decode_string
+from project.utils import read_from_json, decode_string, telegram_chats
 from project.courses import Courses
-from project.mailer import Mailer
-from project.telegram_bot import TelegramBot
-import time
+from project.course import Course
+from project.status import CourseStatus
+from project.metrics import RunMetrics
+from project.circuit_breaker import CircuitBreaker
+from concurrent.futures import ThreadPoolExecutor
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Callable, TypeVar
 import logging
+import time
+
+if TYPE_CHECKING:
+    from project.status_store import StatusStore
+    from project.shared_cache import SharedResultCache
+    from project.scheduler import SignupScheduler
+    from project.recording import SessionRecording
+    from project.telegram_service import TelegramService
+    from project.mailer import MailDigest
+
+T = TypeVar("T")
 
 
-class Scraper:
+class Scraper(ABC):
     """
     This class scrapes the MyTUD website for courses that have open exam signups and stores them in a
-    Courses object as a Course.
+    Courses object as a Course. How MyTUD is accessed is left to the backends that implement this class,
+    see SeleniumScraper and HttpScraper.
     """
-    def __init__(self, driver: Chrome | Firefox, courses: Courses):
+    def __init__(self, courses: Courses, workers=1, store: 'StatusStore | None' = None, ttl=0.0,
+                 creds_path="./project/data/creds.json", shared_cache: 'SharedResultCache | None' = None,
+                 metrics: RunMetrics | None = None, retries=3, backoff=2.0, breaker: CircuitBreaker | None = None,
+                 scheduler: 'SignupScheduler | None' = None, recording: 'SessionRecording | None' = None):
         """
         The initialiser method for the Scraper class.
 
         Args:
-            driver (Chrome | Firefox): The webdriver the scraper should use when scraping. NOTE: Firefox is
-                recommended since Chrome keeps on giving warnings. So far this has not impacted performance though.
             courses (Courses): A Courses object with all of the courses the user has specified they are following.
                 Using this instance a list of available courses will be generated.
+            workers (int, optional): The number of sessions that check courses in parallel. What a session is depends
+                on the backend. Defaults to 1.
+            store (StatusStore | None, optional): Where the outcome of every course is kept between runs. With a store,
+                notifications are only sent when the status of a course changed. Defaults to None.
+            ttl (float, optional): How many seconds a recorded outcome stays valid. Courses checked within this time
+                are not checked again and keep their recorded status. Only used with a store. Defaults to 0.0.
+            creds_path (str, optional): The creds.json to log in and notify with. Only needs to be changed when
+                running for more than one user, see TenantRegistry. Defaults to "./project/data/creds.json".
+            shared_cache (SharedResultCache | None, optional): Where outcomes that are the same for every user are
+                shared with the other Scrapers on this host. Courses another Scraper has recently found closed or
+                missing are not checked again. Defaults to None.
+            metrics (RunMetrics | None, optional): Where the first scrape records its timings, for example one that
+                already holds the driver startup. Every later scrape records into a new RunMetrics. Defaults to None.
+            retries (int, optional): The number of attempts for the login and for every course. Between attempts the
+                backend is recovered, see _recover. Defaults to 3.
+            backoff (float, optional): The seconds to wait before the second attempt, doubling for every attempt
+                after. Defaults to 2.0.
+            breaker (CircuitBreaker | None, optional): Stops checking courses once MyTUD seems to be down. Pass the
+                same breaker to every Scraper that should stop together. Defaults to a new CircuitBreaker.
+            scheduler (SignupScheduler | None, optional): Picks which courses to check on every scrape, and in which
+                order, within a budget of checks per hour. Replaces the time-to-live and is only used with a store.
+                Defaults to None, checking every course that is not fresh.
+            recording (SessionRecording | None, optional): Where the backend records what it saw of MyTUD, so the
+                scrape can be replayed offline later, see project.fakes.replay. Share it with the workers of a
+                parallel scrape. Defaults to None.
         """
         self.courses: Courses = courses
-        self.driver: Chrome | Firefox = driver
+        self.workers: int = workers
+        self.store: 'StatusStore | None' = store
+        self.ttl: float = ttl
+        self.creds_path: str = creds_path
+        self.shared_cache: 'SharedResultCache | None' = shared_cache
+        self.metrics: RunMetrics = metrics or RunMetrics()
+        self.retries: int = retries
+        self.backoff: float = backoff
+        self.breaker: CircuitBreaker = breaker or CircuitBreaker()
+        self.scheduler: 'SignupScheduler | None' = scheduler
+        self.recording: 'SessionRecording | None' = recording
+        self.statuses: dict[str, CourseStatus] = {}
+        self.failures: dict[str, Exception] = {}
+        self.changed: list[str] = []
         self.__available_courses: Courses = Courses([])
-    
-    def __exit__(self) -> None:
-        """
-        This method makes sure to kill the driver and release any resources it is hoarding when the script closes
-        or crashes. No need to do anything with this.
-        """
-        if self.driver is not None:
-            self.driver.quit()
 
     @property
     def courses(self) -> Courses:
@@ -52,147 +93,464 @@ class Scraper:
         # TODO: Registrate builds incomplete courses based off of the 'voortgang'
 
     @property
-    def driver(self) -> Chrome | Firefox:
-        return self.__driver
-
-    @driver.setter
-    def driver(self, driver: Chrome | Firefox) -> None:
-        if not isinstance(driver, Chrome) and not isinstance(driver, Firefox):
-            raise ValueError(f"Driver needs to be a Firefox or Chrome driver, not: '{type(driver)}'")
-        self.__driver = driver
-
-    def scrape_for_courses(self):
-        """
-        The main method of the Scraper class. This scrapes the MyTUD exam page for possible signups according to
-        the courses the user has provided after logging in with the credentials the user provided for MyTUD.
-
-            Step 1: Attempt to access the MyTUD website.
-            Step 2: In case a new session is required (basically always), attempt login using user credentials.
-            Step 3: Cycle through the incomplete courses and check if any signups are open.
-            Step 4: Close the driver.
-        """
-        creds: dict[str] = read_from_json()
-        d: Chrome | Firefox = self.driver
-        d.get(SIGN_UP_URL)
-        self._wait_for_element_by(By.XPATH, '//*[@id="submit_button"]')
-        logging.info("Attempting login...")
-
-        d.find_element(By.XPATH, '//*[@id="username"]').send_keys(creds["net_id"])
-        d.find_element(By.XPATH, '//*[@id="password"]').send_keys(decode_string(creds["net_pass"]))
-        d.find_element(By.XPATH, '//*[@id="submit_button"]').click()
-
-        for course in self._incomplete_courses.courses:
-            print("")
-            logging.info(f"Searching for: {course}...")
-            self._wait_for_element_by(By.CLASS_NAME, "searchbar-input")
-            d.find_element(By.CLASS_NAME, "searchbar-input").send_keys(course.code)
-            self._wait_until_in_page(NO_COURSES_FOUND, course.code, timeout=10)
-            if self._search_in_page(NO_COURSES_FOUND):
-                logging.info(f"'{course}' was not found, there is no sign up")
-                d.refresh()
+    def workers(self) -> int:
+        return self._workers
+
+    @workers.setter
+    def workers(self, value: int) -> None:
+        if value < 1:
+            raise ValueError(f"The number of workers must be at least 1, not: '{value}'")
+        self._workers = value
+
+    @property
+    def retries(self) -> int:
+        return self._retries
+
+    @retries.setter
+    def retries(self, value: int) -> None:
+        if value < 1:
+            raise ValueError(f"The number of attempts must be at least 1, not: '{value}'")
+        self._retries = value
+
+    @property
+    def available_courses(self) -> Courses:
+        return self.__available_courses
+
+    def scrape_for_courses(self, close=True):
+        """
+        The main method of the Scraper class. This scrapes MyTUD for possible signups according to the courses the
+        user has provided after logging in with the credentials the user provided for MyTUD.
+
+            Step 1: Log in, or reuse an existing session, using the backend.
+            Step 2: Check the incomplete courses all at once, in case the backend can, see _check_batch.
+            Step 3: Cycle through the courses the batch could not check and check if any signups are open.
+            Step 4: Close the backend.
+
+        In case more than one worker is set, the incomplete courses are split between that many sessions, which each
+        run the steps above. See _scrape_in_parallel. The results of a previous scrape are cleared first, so the same
+        Scraper can scrape again. The timings of the scrape are recorded in metrics.
+
+        A course that fails is retried, see _retry. In case it keeps failing, it is left out of the statuses and its
+        error is kept in failures instead, so the outcomes of the other courses are still recorded and notified. The
+        same goes for every course in case the login keeps failing. Once the CircuitBreaker opens, the remaining
+        courses are not checked anymore.
+
+        Args:
+            close (bool, optional): Whether to close the backend after the scrape. Pass False to keep the session
+                alive for another scrape. Defaults to True.
+        """
+        start: float = time.perf_counter()
+        self.statuses = {}
+        self.failures = {}
+        self.changed = []
+        self.__available_courses = Courses([])
+        if self.metrics.finished:
+            self.metrics = RunMetrics()
+        checked: list[Course] = self._skip_fresh(self._incomplete_courses.courses)
+        courses: list[Course] = self._skip_shared(checked)
+        in_parallel: bool = self.workers > 1 and len(courses) > 1
+        # The workers of a parallel scrape ask the breaker themselves, so only one of them makes the trial check
+        allowed: bool = not courses or (not self.breaker.is_open if in_parallel else self.breaker.allow())
+        if not allowed:
+            logging.warning(f"MyTUD seems to be down, not checking for another {self.breaker.retry_in:.0f} seconds")
+            for course in courses:
+                self._fail(course, ConnectionError("MyTUD seems to be down"))
+        elif in_parallel:
+            self._scrape_in_parallel(courses)
+        elif courses and self._log_in(courses):
+            if "first_check" not in self.metrics.phases:
+                # Counted from the start of the metrics, which __main__ creates before anything else is started
+                first_check: float = self.metrics.elapsed
+                self.metrics.record("first_check", first_check)
+                logging.info(f"Starting the first course check {first_check:.2f} seconds after starting")
+            with self.metrics.phase("batch"):
+                try:
+                    batched: dict[str, CourseStatus] = self._check_batch(courses)
+                except Exception as e:
+                    logging.warning(f"Could not check the courses at once, checking them one by one:\n{e!r}")
+                    batched = {}
+            for course in courses:
+                if course.code in batched:
+                    status: CourseStatus = batched[course.code]
+                elif not self.breaker.allow():
+                    self._fail(course, ConnectionError("MyTUD seems to be down"))
+                    continue
+                else:
+                    print("")
+                    logging.info(f"Searching for: {course}...")
+                    try:
+                        with self.metrics.phase("check", course.code):
+                            status = self._retry(course.code, lambda: self._check_course(course))
+                    except Exception as e:
+                        self._fail(course, e)
+                        continue
+                if self.shared_cache is not None:
+                    self.shared_cache.put(course.code, status)
+                if self.recording is not None:
+                    self.recording.add_outcome(course.code, status)
+                self._record(course, status)
+            logging.info("Completed scrape!")
+        if self.failures:
+            logging.warning(f"Could not check {len(self.failures)} of {len(courses)} courses: "
+                            f"{', '.join(self.failures)}")
+        if self.store is not None:
+            self.changed = self.store.record({course.code: self.statuses[course.code] for course in checked
+                                              if course.code in self.statuses})
+        self.metrics.finish()
+        if self.recording is not None:
+            self.recording.finish(time.perf_counter() - start)
+        logging.info(f"Scrape took {self.metrics.duration:.1f} seconds and {self.metrics.total('round_trips')} "
+                     f"round trips")
+        if close:
+            self.close()
+
+    def _log_in(self, courses: list[Course]) -> bool:
+        """
+        Logs in before the courses are checked, see _retry. In case the login keeps failing none of the courses can
+        be checked, so they are all recorded as failures and keep the status they had in the StatusStore.
+
+        Args:
+            courses (list[Course]): The courses that were going to be checked.
+
+        Returns:
+            bool: Whether the login succeeded.
+        """
+        try:
+            with self.metrics.phase("login"):
+                self._retry("login", self._login, relogin=False)
+            return True
+        except PermissionError as e:
+            # _retry does not report a refused login, but the breaker may have let it through as its trial check
+            self.breaker.record_failure()
+            error: Exception = e
+        except Exception as e:
+            error = e
+        logging.error(f"Could not log in, none of the {len(courses)} courses can be checked")
+        for course in courses:
+            self._fail(course, error)
+        return False
+
+    def _skip_fresh(self, courses: list[Course]) -> list[Course]:
+        """
+        Takes over the recorded status of the courses that have been checked within the time-to-live. With a
+        SignupScheduler, the scheduler picks the courses to check instead, in the order to check them in.
+
+        Args:
+            courses (list[Course]): The incomplete courses.
+
+        Returns:
+            list[Course]: The courses that still have to be checked.
+        """
+        if self.store is None or (self.scheduler is None and self.ttl <= 0):
+            return courses
+        if self.scheduler is not None:
+            to_check: list[Course] = self.scheduler.due(courses)
+        else:
+            to_check = [course for course in courses if not self.store.is_fresh(course.code, self.ttl)]
+        codes: set[str] = {course.code for course in to_check}
+        for course in courses:
+            last: tuple[CourseStatus, float] | None = self.store.get(course.code)
+            if course.code in codes or last is None:
                 continue
-            elif self._search_in_page(CLOSED_SIGNUP):
+            self.statuses[course.code] = last[0]
+            self.metrics.set_status(course.code, last[0].value)
+            if last[0] == CourseStatus.AVAILABLE:
+                self.__available_courses.add(course)
+        if len(to_check) < len(courses):
+            reason: str = "are not due" if self.scheduler is not None else "have been checked recently"
+            logging.info(f"Skipping {len(courses) - len(to_check)} courses that {reason}")
+        return to_check
+
+    def _skip_shared(self, courses: list[Course]) -> list[Course]:
+        """
+        Takes over the outcomes another Scraper has shared for courses that are closed or missing for everyone.
+
+        Args:
+            courses (list[Course]): The courses that have not been checked recently.
+
+        Returns:
+            list[Course]: The courses that still have to be checked for this user.
+        """
+        if self.shared_cache is None:
+            return courses
+        to_check: list[Course] = []
+        for course in courses:
+            status: CourseStatus | None = self.shared_cache.get(course.code)
+            if status is None:
+                to_check.append(course)
+            else:
+                self._record(course, status)
+        if len(to_check) < len(courses):
+            logging.info(f"Took over the shared outcome of {len(courses) - len(to_check)} courses")
+        return to_check
+
+    def _record(self, course: Course, status: CourseStatus) -> None:
+        """
+        Logs the outcome of a course check and adds the course to the available courses if it is open.
+
+        Args:
+            course (Course): The course that has been checked.
+            status (CourseStatus): The outcome the backend reported for the course.
+        """
+        self.statuses[course.code] = status
+        self.metrics.set_status(course.code, status.value)
+        match status:
+            case CourseStatus.NOT_FOUND:
+                logging.info(f"'{course}' was not found, there is no sign up")
+            case CourseStatus.CLOSED:
                 logging.info(f"The signup for '{course}' is closed")
-                d.refresh()
-                continue
-            d.find_element(By.CSS_SELECTOR, ".osi-ion-item").click()
-            
-            i: int = 0
-            while True or i < 6:
-                i += 1
-                if self._search_in_page(UNABLE_TO_SIGNUP):
-                    logging.info(f"You are not able to sign up for '{course}'")
-                    break
-                elif self._search_in_page(SIGNUP_AVAILABLE):
-                    logging.info(f"'{course}' is open for sign up!")
-                    self.__available_courses.add(course)
-                    break
-                elif self._search_in_page(NOT_IN_PROGRAM):
-                    logging.warning(f"'{course}' is not part of your default course program!")
-                    break
-                time.sleep(0.5)
-            d.refresh()
-        logging.info("Completed scrape!")
-        d.close()
-
-    def notify(self, method: str):
-        """
-        Attempts to send a notification to the user with the courses for which exams are open for sign up. 
-        Multiple methods are possible by appending the method letter to the string in ./data/prefs.py.
-            'm': Creates a Mailer object to send an email with to a user specified one.
-            't': Creates a TelegramBot object to send a text to a chat, specified in the telegram init, using
-                the token provided by the user.
+            case CourseStatus.UNABLE:
+                logging.info(f"You are not able to sign up for '{course}'")
+            case CourseStatus.AVAILABLE:
+                logging.info(f"'{course}' is open for sign up!")
+                self.__available_courses.add(course)
+            case CourseStatus.NOT_IN_PROGRAM:
+                logging.warning(f"'{course}' is not part of your default course program!")
+            case _:
+                logging.warning(f"Could not determine the sign up status of '{course}'")
+
+    def _fail(self, course: Course, error: Exception) -> None:
+        """
+        Records that a course could not be checked. The course keeps the status it had in the StatusStore.
 
         Args:
-            method (str): User specified method of notification. Should be set in ./data/prefs.py.
+            course (Course): The course that could not be checked.
+            error (Exception): Why it could not be checked.
         """
-        if "m" in method:
-            creds: dict[str] = read_from_json()
-            logging.info(f"Sending email ({creds.get('sender_mail')} -> {creds.get('receiver_mail')})...")
-            notifier = Mailer(creds["receiver_mail"], creds["sender_mail"], decode_string(creds["mail_pass"]))
-            notifier.send_mail(self.__available_courses)
-        
-        if "t" in method:
-            creds: dict[str] = read_from_json()
-            logging.info(f"Sending Telegram to {creds.get('telegram_id')}...")
-            notifier = TelegramBot(creds.get("telegram_token", None), creds.get("telegram_id", None))
-            notifier.send_notification(self.__available_courses)
+        logging.error(f"Could not check '{course}':\n{error!r}")
+        self.failures[course.code] = error
+        self.metrics.set_status(course.code, "failed")
+
+    def _retry(self, label: str, action: Callable[[], T], relogin=True) -> T:
+        """
+        Runs an action up to the number of retries, waiting longer after every failed attempt and recovering the
+        backend in between. The outcome is reported to the CircuitBreaker. A PermissionError is raised straight away,
+        since a refused session or wrong credentials do not fix themselves.
 
-    def _wait_for_element_by(self, by: By, name: str, timeout=30) -> None:
+        Args:
+            label (str): What the action is about, like a course code, used in the log and the metrics.
+            action (Callable[[], T]): The action to run.
+            relogin (bool, optional): Whether to log in again after recovering, for actions that need a logged in
+                session. Defaults to True.
+
+        Raises:
+            Exception: The error of the last attempt, in case all attempts failed.
+
+        Returns:
+            T: The result of the first attempt that succeeded.
+        """
+        for attempt in range(1, self.retries + 1):
+            try:
+                result: T = action()
+                self.breaker.record_success()
+                return result
+            except PermissionError:
+                # MyTUD refused the session or the credentials, trying again will not help
+                raise
+            except Exception as e:
+                if attempt == self.retries:
+                    self.metrics.count("failures", label)
+                    self.breaker.record_failure()
+                    raise
+                delay: float = self.backoff * 2 ** (attempt - 1)
+                logging.warning(f"Attempt {attempt} of {self.retries} for '{label}' failed, retrying in "
+                                f"{delay:.0f} seconds:\n{e!r}")
+                self.metrics.count("retries", label)
+                time.sleep(delay)
+                try:
+                    self._recover(e)
+                    if relogin:
+                        self._login()
+                except Exception as recover_error:
+                    logging.warning(f"Could not recover from the failure:\n{recover_error!r}")
+
+    def _scrape_in_parallel(self, courses: list[Course]) -> None:
         """
-        Tells the driver to pause the script until a certain element is loaded in the page. WARNING: Sometimes
-        WebDriverWait.until will trigger before the page has time to update causing the script to continue prematurely. 
-        This is the case especially when using filters, so use _wait_until_in_page in those cases!
+        Splits the courses between the workers and lets every worker scrape its share in its own logged in session.
+        The results are merged back in the original course order, so the available courses are the same as they
+        would be after a sequential scrape.
 
         Args:
-            by (By): The method of pointing to a specific element. Usually XPATH, CSS_SELECTOR or CLASS_NAME.
-            name (str): A string with the name or path to a specific element.
-            timeout (int, optional): How many seconds to pause for before throwing an error. Defaults to 30.
+            courses (list[Course]): The courses to check.
+        """
+        workers: int = min(self.workers, len(courses))
+        chunks: list[Courses] = [Courses(courses[i::workers]) for i in range(workers)]
+        logging.info(f"Splitting {len(courses)} courses over {workers} workers...")
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results: list[dict[str, CourseStatus]] = list(executor.map(self._run_worker, range(workers), chunks))
+
+        for course in courses:
+            for statuses in results:
+                if course.code in statuses:
+                    self.statuses[course.code] = statuses[course.code]
+                    if statuses[course.code] == CourseStatus.AVAILABLE:
+                        self.__available_courses.add(course)
+        logging.info("Completed parallel scrape!")
+
+    def _run_worker(self, index: int, chunk: Courses) -> dict[str, CourseStatus]:
+        """
+        Scrapes a share of the courses in a separate Scraper created by the backend. The first worker may share the
+        session of this Scraper, so it is left open and taken over, see _adopt. The other workers are quit once they
+        are done. In case a worker fails as a whole, for example because it cannot log in, the courses it has not
+        checked are recorded as failures and the other workers carry on.
+
+        Args:
+            index (int): The index of the worker. The first worker may reuse the session of this Scraper.
+            chunk (Courses): The courses this worker should check.
+
+        Returns:
+            dict[str, CourseStatus]: The outcome per course code of the chunk.
         """
         try:
-            element_present = ec.presence_of_element_located((by, name))
-            WebDriverWait(self.driver, timeout).until(element_present)
-        except TimeoutException:
-            logging.warning(f"Timeout occurred after {timeout} seconds. Quitting...")
-            self.driver.quit()
-    
-    def _search_in_page(self, text: str) -> bool:
+            worker: Scraper = self._create_worker(index, chunk)
+        except Exception as e:
+            for course in chunk.courses:
+                self._fail(course, e)
+            return {}
+        try:
+            worker.scrape_for_courses(close=False)
+        except Exception as e:
+            for course in chunk.courses:
+                if course.code not in worker.statuses and course.code not in worker.failures:
+                    worker._fail(course, e)
+        finally:
+            self.metrics.merge(worker.metrics)
+            self.failures.update(worker.failures)
+            if index != 0:
+                worker.quit()
+            else:
+                self._adopt(worker)
+        return worker.statuses
+
+    @abstractmethod
+    def _login(self) -> None:
+        """
+        Makes sure the backend has a logged in MyTUD session before the courses are checked.
         """
-        Shortcut to run a JS command inside the driver to look for a string of text inside the HTML of the page. A
-        more reliable way of looking for text in the page than using driver.page_source.
+
+    @abstractmethod
+    def _check_course(self, course: Course) -> CourseStatus:
+        """
+        Looks up a single course on MyTUD and returns whether it can be signed up for.
 
         Args:
-            text (str): The string to look for inside of the HTML.
+            course (Course): The course to check.
 
         Returns:
-            bool: Whether the text has been found in the page or not.
+            CourseStatus: The outcome of the check.
         """
-        return self.driver.execute_script(f'return document.body.innerHTML.includes("{text}")')
 
-    def _wait_until_in_page(self, *texts: str, timeout=30.0) -> bool:
+    def _check_batch(self, courses: list[Course]) -> dict[str, CourseStatus]:
         """
-        Waits until one of the specified strings is found in the page. Uses _search_in_page.
+        Checks many courses at once, for backends that have a faster way to do so than checking them one by one.
+        Courses left out of the result are checked with _check_course, so a backend only returns the outcomes it
+        is sure of. By default no course is checked in a batch.
 
         Args:
-            timeout (float, optional): How many seconds to wait before throwing an exception. Defaults to 30.0.
+            courses (list[Course]): The courses to check.
 
-        Raises:
-            TimeoutError: In case the timeout in seconds has been exceeded. Prevents infinite waits in case the
-                page front-end changes.
+        Returns:
+            dict[str, CourseStatus]: The outcome per course code of the courses that have been checked.
+        """
+        return {}
+
+    def _recover(self, error: Exception) -> None:
+        """
+        Brings the backend back into a state where it can check courses after an attempt failed, for example by
+        replacing a session that died. By default nothing needs to be done.
+
+        Args:
+            error (Exception): The error of the failed attempt.
+        """
+
+    def _adopt(self, worker: 'Scraper') -> None:
+        """
+        Takes over the session of the first worker of a parallel scrape, which may have replaced the session it
+        shared with this Scraper while recovering. By default nothing needs to be done.
+
+        Args:
+            worker (Scraper): The first worker.
+        """
+
+    @abstractmethod
+    def _create_worker(self, index: int, chunk: Courses) -> 'Scraper':
+        """
+        Creates a Scraper of the same backend that checks a share of the courses, used when scraping in parallel.
+
+        Args:
+            index (int): The index of the worker. The first worker may reuse the session of this Scraper.
+            chunk (Courses): The courses the worker should check.
 
         Returns:
-            bool: Whether one of the phrases has been found in the page or not.
-        """
-        t: float = 0.0
-        increment: float = 0.5
-        complete: bool = False
-        while t < timeout and not complete:
-            for text in texts:
-                complete = self._search_in_page(text)
-                if complete:
-                    break
-            time.sleep(increment)
-            t += increment
-        if t >= timeout:
-            raise TimeoutError(f"Could not find '{text}' in page!")
-        return complete
+            Scraper: A Scraper with a single worker.
+        """
+
+    def close(self) -> None:
+        """
+        Called after a scrape has been completed. Backends override this to release the page or connection they used.
+        """
+
+    def quit(self) -> None:
+        """
+        Releases all resources of the backend. Called for the extra workers of a parallel scrape.
+        """
+        self.close()
+
+    def notify(self, method: str, timeout=30.0, retries=3, telegram: 'TelegramService | None' = None,
+               digest: 'MailDigest | None' = None):
+        """
+        Attempts to send a notification to the user with the courses for which exams are open for sign up. With a
+        StatusStore, this only happens when the status of a course changed during the last scrape. Multiple methods
+        are possible by appending the method letter to the string in ./data/prefs.py. All methods are sent at the
+        same time by a Notifier, so a slow method does not hold up the others. The notifier of a method is only
+        imported when that method is used, so a run does not pay for loading the other one.
+            'm': Creates a Mailer object to send an email with to a user specified one.
+            't': Creates a TelegramBot object to send a text to a chat, specified in the telegram init, using
+                the token provided by the user.
+
+        Args:
+            method (str): User specified method of notification. Should be set in ./data/prefs.py.
+            timeout (float, optional): The time in seconds a single attempt of a method may take. Defaults to 30.0.
+            retries (int, optional): The number of attempts per method. Defaults to 3.
+            telegram (TelegramService | None, optional): A running Telegram bot to send the Telegram notification
+                through, instead of connecting a new TelegramBot. Defaults to None.
+            digest (MailDigest | None, optional): Collects the emails into a digest instead of sending an email
+                right away. Defaults to None.
+        """
+        if self.store is not None and not self.changed:
+            logging.info("No course status has changed since the last run, not sending a notification")
+            return
+
+        from project.notifier import Notifier
+        creds: dict[str] = read_from_json(self.creds_path)
+        channels: dict[str] = {}
+
+        if "m" in method and digest is not None:
+            digest.add(self.__available_courses, self.changed)
+        elif "m" in method:
+            from project.mailer import Mailer
+            logging.info(f"Sending email ({creds.get('sender_mail')} -> {creds.get('receiver_mail')})...")
+            mailer = Mailer(creds["receiver_mail"], creds["sender_mail"], decode_string(creds["mail_pass"]))
+            channels["email"] = lambda: mailer.send_mail_async(self.__available_courses, timeout=timeout)
+
+        if "t" in method and telegram is not None:
+            logging.info(f"Sending Telegram to {', '.join(telegram.chat_ids)}...")
+            # Every chat is a channel of its own, so a chat that fails is retried without messaging the others again
+            for chat in telegram.chat_ids:
+                channels["telegram" if len(telegram.chat_ids) == 1 else f"telegram {chat}"] = \
+                    lambda chat=chat: telegram.send_notification_async(self.__available_courses, chat)
+        elif "t" in method:
+            from project.telegram_bot import TelegramBot
+            chats: list[str] = telegram_chats(creds)
+            if not chats:
+                logging.error("No Telegram chat has been registered, run the telegram init to register one")
+            else:
+                logging.info(f"Sending Telegram to {', '.join(chats)}...")
+            # Every chat is a channel of its own, so a chat that fails is retried without messaging the others again
+            for chat in chats:
+                bot = TelegramBot(creds.get("telegram_token", None), chat)
+                channels["telegram" if len(chats) == 1 else f"telegram {chat}"] = \
+                    lambda bot=bot: bot.send_notification_async(self.__available_courses)
+
+        Notifier(channels, timeout=timeout, retries=retries).send()
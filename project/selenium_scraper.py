@@ -0,0 +1,611 @@
+from selenium.webdriver import Chrome, Firefox
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import TimeoutException, JavascriptException
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as ec
+from project.constants import MYTUD_URL, SIGN_UP_PATH, NO_COURSES_FOUND, API_SEARCH_PATH, API_COURSE_PATH
+from project.mytud_api import search_body, first_hit, classify_search, classify_detail
+from project.utils import read_from_json, decode_string, create_webdriver
+from project.scraper import Scraper
+from project.courses import Courses
+from project.course import Course
+from project.status import CourseStatus, STATUS_MARKERS
+from project.session import SessionCache
+from project.metrics import RunMetrics
+import time
+import json
+import logging
+
+
+# Resolves with the first of arguments[0] found in the page as soon as it appears, or null after arguments[1] ms
+WAIT_FOR_TEXT_SCRIPT = """
+const [texts, timeout, done] = [arguments[0], arguments[1], arguments[arguments.length - 1]];
+const match = () => texts.find(text => document.body.innerHTML.includes(text)) ?? null;
+const found = match();
+if (found !== null) {
+    done(found);
+    return;
+}
+const observer = new MutationObserver(() => {
+    const found = match();
+    if (found !== null) {
+        observer.disconnect();
+        clearTimeout(timer);
+        done(found);
+    }
+});
+const timer = setTimeout(() => {
+    observer.disconnect();
+    done(null);
+}, timeout);
+observer.observe(document.body, {childList: true, subtree: true, characterData: true});
+"""
+
+# Returns the status of the first [status, marker] pair in arguments[0] whose marker is in the page, or null
+CLASSIFY_PAGE_SCRIPT = """
+const html = document.body.innerHTML;
+const match = arguments[0].find(([status, marker]) => html.includes(marker));
+return match ? match[0] : null;
+"""
+
+# Goes back from a course to the result list, clears the search bar and resolves with true once none of the markers
+# in arguments[0] are left in the page, or with false in case that does not happen within arguments[1] ms
+RESET_SEARCH_SCRIPT = """
+const [markers, timeout, done] = [arguments[0], arguments[1], arguments[arguments.length - 1]];
+const searchbar = () => [...document.querySelectorAll('.searchbar-input')].find(input => input.offsetParent !== null);
+if (!searchbar()) {
+    history.back();
+}
+const start = Date.now();
+const poll = () => {
+    const input = searchbar();
+    if (input && input.value) {
+        input.value = '';
+        input.dispatchEvent(new Event('input', {bubbles: true}));
+    }
+    if (input && !markers.some(marker => document.body.innerHTML.includes(marker))) {
+        done(true);
+    } else if (Date.now() - start > timeout) {
+        done(false);
+    } else {
+        setTimeout(poll, 50);
+    }
+};
+poll();
+"""
+
+# Sends all requests in arguments[0] ([method, url, body] each) at once with the session of the page and resolves with
+# the response text per request, or null for a request that failed or did not finish within arguments[1] ms
+BATCH_FETCH_SCRIPT = """
+const [requests, timeout, done] = [arguments[0], arguments[1], arguments[arguments.length - 1]];
+const controller = new AbortController();
+const timer = setTimeout(() => controller.abort(), timeout);
+const send = ([method, url, body]) => fetch(url, {
+    method: method,
+    credentials: 'same-origin',
+    signal: controller.signal,
+    headers: body === null ? {'Accept': 'application/json'}
+                           : {'Accept': 'application/json', 'Content-Type': 'application/json'},
+    body: body === null ? undefined : JSON.stringify(body),
+}).then(response => response.ok ? response.text() : null).catch(() => null);
+Promise.all(requests.map(send)).then(results => {
+    clearTimeout(timer);
+    done(results);
+});
+"""
+
+# Records every fetch and XMLHttpRequest of the page as [method, url, JSON body, status, response text, seconds] in
+# window.__registrateNetwork, installed once per page so it can be run before every course
+NETWORK_RECORDER_SCRIPT = """
+if (window.__registrateRecorder) {
+    return;
+}
+window.__registrateRecorder = true;
+window.__registrateNetwork = [];
+const parse = body => {
+    try {
+        return typeof body === 'string' ? JSON.parse(body) : null;
+    } catch (e) {
+        return null;
+    }
+};
+const record = (method, url, body, status, text, start) => window.__registrateNetwork.push([
+    method.toUpperCase(), new URL(url, location.href).href, parse(body), status, text,
+    (performance.now() - start) / 1000,
+]);
+const originalFetch = window.fetch;
+window.fetch = async (input, init = {}) => {
+    const start = performance.now();
+    const method = init.method ?? input.method ?? 'GET';
+    const url = input.url ?? String(input);
+    const response = await originalFetch(input, init);
+    response.clone().text().then(text => record(method, url, init.body, response.status, text, start), () => null);
+    return response;
+};
+const open = XMLHttpRequest.prototype.open;
+const send = XMLHttpRequest.prototype.send;
+XMLHttpRequest.prototype.open = function (method, url, ...rest) {
+    this.__registrateRequest = [method, String(url)];
+    return open.call(this, method, url, ...rest);
+};
+XMLHttpRequest.prototype.send = function (body) {
+    const start = performance.now();
+    this.addEventListener('loadend', () => record(...this.__registrateRequest, body, this.status,
+        ['', 'text'].includes(this.responseType) ? this.responseText : JSON.stringify(this.response), start));
+    return send.call(this, body);
+};
+"""
+
+# Returns the inner HTML of the body and the requests the recorder has seen since the last call
+SNAPSHOT_SCRIPT = """
+return [document.body.innerHTML, (window.__registrateNetwork ?? []).splice(0)];
+"""
+
+
+class SeleniumScraper(Scraper):
+    """
+    This Scraper backend drives a Chrome or Firefox browser through the MyTUD sign up page, the same way a user
+    would: it logs in, types every course code in the search bar and reads the result from the page.
+    """
+    def __init__(self, driver: Chrome | Firefox, courses: Courses, workers=1, session_cache: SessionCache | None = None,
+                 navigation="spa", base_url=MYTUD_URL, profile="standard", batch=True, **kwargs):
+        """
+        The initialiser method for the SeleniumScraper class.
+
+        Args:
+            driver (Chrome | Firefox): The webdriver the scraper should use when scraping. NOTE: Firefox is
+                recommended since Chrome keeps on giving warnings. So far this has not impacted performance though.
+            courses (Courses): A Courses object with all of the courses the user has specified they are following.
+                Using this instance a list of available courses will be generated.
+            workers (int, optional): The number of browser sessions that check courses in parallel. The given driver
+                is used as the first session, any additional ones are created with create_webdriver. Defaults to 1.
+            session_cache (SessionCache | None, optional): Where to save the session after logging in and where to
+                restore it from before the next login. In case it is None, every run logs in. Defaults to None.
+            navigation (str, optional): How to get back to an empty search after a course has been checked. 'spa'
+                clears the search bar within the running page and only refreshes when the page is in an unexpected
+                state, 'refresh' always reloads the page. Defaults to "spa".
+            base_url (str, optional): The MyTUD URL the sign up page is relative to. Only needs to be changed to
+                scrape a local stand-in, like the one in project.fakes.mytud. Defaults to MYTUD_URL.
+            profile (str, optional): The driver profile the drivers of additional workers are created with, see
+                create_webdriver. Defaults to "standard".
+            batch (bool, optional): Whether to first check all courses at once through the MyTUD endpoints from
+                inside the logged in page, see _check_batch. Courses the batch cannot check go through the search
+                bar. Defaults to True.
+            **kwargs: Passed on to Scraper, such as the StatusStore.
+        """
+        super().__init__(courses, workers, **kwargs)
+        self.driver: Chrome | Firefox = driver
+        self.session_cache: SessionCache | None = session_cache
+        self.navigation: str = navigation
+        self.base_url: str = base_url
+        self.profile: str = profile
+        self.batch: bool = batch
+
+    def __exit__(self) -> None:
+        """
+        This method makes sure to kill the driver and release any resources it is hoarding when the script closes
+        or crashes. No need to do anything with this.
+        """
+        if self.driver is not None:
+            self.driver.quit()
+
+    @property
+    def driver(self) -> Chrome | Firefox:
+        return self.__driver
+
+    @driver.setter
+    def driver(self, driver: Chrome | Firefox) -> None:
+        if not isinstance(driver, Chrome) and not isinstance(driver, Firefox):
+            raise ValueError(f"Driver needs to be a Firefox or Chrome driver, not: '{type(driver)}'")
+        self.__driver = driver
+
+    @property
+    def navigation(self) -> str:
+        return self._navigation
+
+    @navigation.setter
+    def navigation(self, value: str) -> None:
+        if value != "spa" and value != "refresh":
+            raise ValueError(f"Navigation needs to be 'spa' or 'refresh', not: '{value}'")
+        self._navigation = value
+
+    def _login(self) -> None:
+        """
+        Makes sure the driver is logged in on the sign up page. A driver that is still on the sign up page from a
+        previous scrape is left as is. Otherwise a saved session is restored first, in case it is still valid MyTUD
+        shows the search bar straight away and the login form is skipped. If not, the login form is filled in with
+        the user credentials and the new session is saved for the next run.
+        """
+        d: Chrome | Firefox = self.driver
+        self._count_round_trips()
+        if d.find_elements(By.CLASS_NAME, "searchbar-input"):
+            return
+        # The StartupPipeline may have opened the login form already while the program was starting
+        if not d.find_elements(By.XPATH, '//*[@id="submit_button"]') and \
+                not self.open_sign_up(d, self.base_url, self.session_cache):
+            return
+
+        creds: dict[str] = read_from_json(self.creds_path)
+        logging.info("Attempting login...")
+        d.find_element(By.XPATH, '//*[@id="username"]').send_keys(creds["net_id"])
+        d.find_element(By.XPATH, '//*[@id="password"]').send_keys(decode_string(creds["net_pass"]))
+        d.find_element(By.XPATH, '//*[@id="submit_button"]').click()
+        if self.session_cache is not None:
+            self._wait_for_element_by(By.CLASS_NAME, "searchbar-input")
+            self.session_cache.save(d)
+
+    @staticmethod
+    def open_sign_up(driver: Chrome | Firefox, base_url=MYTUD_URL, session_cache: SessionCache | None = None) -> bool:
+        """
+        Restores the saved session, in case there is one, and opens the sign up page until it shows the search bar
+        or the login form. Also used by the StartupPipeline, to get there while the program is still starting.
+
+        Args:
+            driver (Chrome | Firefox): The driver to open the page in.
+            base_url (str, optional): The MyTUD URL the sign up page is relative to. Defaults to MYTUD_URL.
+            session_cache (SessionCache | None, optional): Where the session is saved. Defaults to None.
+
+        Returns:
+            bool: Whether the login form has to be filled in.
+        """
+        restored: bool = session_cache is not None and session_cache.restore(driver, base_url)
+        driver.get(base_url + SIGN_UP_PATH)
+        WebDriverWait(driver, 30).until(ec.any_of(
+            ec.presence_of_element_located((By.XPATH, '//*[@id="submit_button"]')),
+            ec.presence_of_element_located((By.CLASS_NAME, "searchbar-input")),
+        ))
+        if not driver.find_elements(By.XPATH, '//*[@id="submit_button"]'):
+            logging.info("Saved session is still valid, skipping login")
+            return False
+        if restored:
+            logging.info("Saved session has expired")
+        return True
+
+    def _check_course(self, course: Course) -> CourseStatus:
+        """
+        Searches for the course in the search bar, opens it in case the sign up is not closed and reads the status
+        from the page. The search is reset afterwards, see _reset_search.
+
+        Args:
+            course (Course): The course to check.
+
+        Raises:
+            TimeoutError: In case the course page does not show a status in time.
+
+        Returns:
+            CourseStatus: The outcome of the check.
+        """
+        d: Chrome | Firefox = self.driver
+        if self.recording is not None:
+            d.execute_script(NETWORK_RECORDER_SCRIPT)
+        with self.metrics.phase("search", course.code):
+            self._wait_for_element_by(By.CLASS_NAME, "searchbar-input")
+            start: float = time.perf_counter()
+            d.find_element(By.CLASS_NAME, "searchbar-input").send_keys(course.code)
+            self._wait_until_in_page(NO_COURSES_FOUND, course.code, timeout=10)
+        with self.metrics.phase("classify", course.code):
+            status: CourseStatus = self._classify_page(CourseStatus.NOT_FOUND, CourseStatus.CLOSED)
+        self._snapshot(course, "search", status, time.perf_counter() - start)
+        if status != CourseStatus.UNKNOWN:
+            with self.metrics.phase("reset", course.code):
+                self._reset_search()
+            return status
+
+        with self.metrics.phase("open", course.code):
+            start = time.perf_counter()
+            d.find_element(By.CSS_SELECTOR, ".osi-ion-item").click()
+            try:
+                status = self._wait_for_status(CourseStatus.UNABLE, CourseStatus.AVAILABLE,
+                                               CourseStatus.NOT_IN_PROGRAM)
+            except TimeoutError:
+                # A page that never shows a status is a failed check, so it is retried and counted by the breaker
+                self._snapshot(course, "course", status, time.perf_counter() - start)
+                raise
+        self._snapshot(course, "course", status, time.perf_counter() - start)
+        with self.metrics.phase("reset", course.code):
+            self._reset_search()
+        return status
+
+    def _check_batch(self, courses: list[Course], timeout=30.0) -> dict[str, CourseStatus]:
+        """
+        The browser already holds a logged in MyTUD session, so instead of typing every course in the search bar,
+        the page itself sends the search requests of all courses at once with fetch, followed by the detail requests
+        of the courses whose sign up is not closed. That is two scripts for all courses, instead of several round
+        trips per course. The responses are classified the same way the HttpScraper does. A course with a response
+        that is missing, malformed or cannot be classified is left to the search bar.
+
+        Args:
+            courses (list[Course]): The courses to check.
+            timeout (float, optional): How many seconds each of the two scripts may take. Defaults to 30.0.
+
+        Returns:
+            dict[str, CourseStatus]: The outcome per course code of the courses that have been checked.
+        """
+        if not self.batch or not courses:
+            return {}
+        statuses: dict[str, CourseStatus] = {}
+        details: dict[str, int] = {}
+        searches: list[str | None] = self._fetch_all(
+            [["POST", self.base_url + API_SEARCH_PATH, search_body(course.code)] for course in courses], timeout)
+        for course, search in zip(courses, searches):
+            try:
+                parsed: dict[str] = json.loads(search)
+                status: CourseStatus | None = classify_search(parsed)
+                if status is None:
+                    details[course.code] = int(first_hit(parsed)["id_cursus"])
+                else:
+                    statuses[course.code] = status
+            except (TypeError, ValueError, KeyError) as e:
+                logging.debug(f"Malformed search response for '{course}': {e!r}")
+
+        responses: list[str | None] = self._fetch_all(
+            [["GET", self.base_url + API_COURSE_PATH.format(id=id_cursus), None] for id_cursus in details.values()],
+            timeout)
+        for code, detail in zip(details, responses):
+            try:
+                status = classify_detail(json.loads(detail))
+                if status != CourseStatus.UNKNOWN:
+                    statuses[code] = status
+            except (TypeError, ValueError) as e:
+                logging.debug(f"Malformed course response for '{code}': {e!r}")
+
+        if len(statuses) < len(courses):
+            self.metrics.count("fallbacks", "batch", len(courses) - len(statuses))
+            logging.info(f"Checked {len(statuses)} of {len(courses)} courses at once, searching for the others")
+        else:
+            logging.info(f"Checked all {len(courses)} courses at once")
+        return statuses
+
+    def _fetch_all(self, requests: list[list], timeout: float) -> list[str | None]:
+        """
+        Sends requests from inside the page at once, see BATCH_FETCH_SCRIPT.
+
+        Args:
+            requests (list[list]): The [method, url, JSON body or None] of every request.
+            timeout (float): How many seconds all requests together may take.
+
+        Returns:
+            list[str | None]: The response text per request, None for every request in case the script failed or
+                returned something other than one result per request.
+        """
+        if not requests:
+            return []
+        self._set_script_timeout(timeout)
+        start: float = time.perf_counter()
+        try:
+            results = self.driver.execute_async_script(BATCH_FETCH_SCRIPT, requests, timeout * 1000)
+        except (JavascriptException, TimeoutException) as e:
+            self.metrics.count("timeouts" if isinstance(e, TimeoutException) else "errors", "batch")
+            logging.debug(f"Could not send the requests from the page: {e}")
+            return [None] * len(requests)
+        if not isinstance(results, list) or len(results) != len(requests):
+            logging.debug(f"Unexpected result of the batched requests: {type(results)}")
+            return [None] * len(requests)
+        if self.recording is not None:
+            # The requests run at the same time, so each of them is recorded with the time all of them took
+            elapsed: float = time.perf_counter() - start
+            for (method, url, body), result in zip(requests, results):
+                if result is not None:
+                    self.recording.add_exchange(method, url, body, 200, result, elapsed)
+        return results
+
+    def _snapshot(self, course: Course, phase: str, status: CourseStatus, elapsed: float) -> None:
+        """
+        Records the page and the requests the page sent for it in the SessionRecording, in case there is one. A
+        snapshot that cannot be taken is left out, it does not fail the check.
+
+        Args:
+            course (Course): The course that is being checked.
+            phase (str): 'search' after the search results appeared, 'course' after the course page appeared.
+            status (CourseStatus): What has been read from the page.
+            elapsed (float): How many seconds the page took to show the result.
+        """
+        if self.recording is None:
+            return
+        try:
+            html, requests = self.driver.execute_script(SNAPSHOT_SCRIPT)
+        except JavascriptException as e:
+            logging.debug(f"Could not take a snapshot of the page: {e}")
+            return
+        for method, url, body, response_status, response, seconds in requests:
+            self.recording.add_exchange(method, url, body, response_status, response, seconds)
+        self.recording.add_snapshot(course.code, phase, html, status, elapsed)
+
+    def _reset_search(self, timeout=2.0) -> None:
+        """
+        Returns to an empty search for the next course. With the 'spa' navigation this goes back to the result list
+        and clears the search bar inside the running MyTUD app, which avoids reloading the whole app. The page is
+        only refreshed in case the search bar cannot be found or the old results do not disappear in time.
+
+        Args:
+            timeout (float, optional): How many seconds the in-app reset may take before refreshing. Defaults to 2.0.
+        """
+        if self.navigation == "spa":
+            self._set_script_timeout(timeout)
+            markers: list[str] = list(STATUS_MARKERS.values())
+            try:
+                if self.driver.execute_async_script(RESET_SEARCH_SCRIPT, markers, timeout * 1000):
+                    return
+                logging.debug("The page did not return to an empty search, refreshing instead")
+            except JavascriptException as e:
+                logging.debug(f"Could not reset the search in the page, refreshing instead: {e}")
+            self.metrics.count("refreshes", "fallback")
+        else:
+            self.metrics.count("refreshes", "navigation")
+        self.driver.refresh()
+
+    def _create_worker(self, index: int, chunk: Courses) -> 'SeleniumScraper':
+        """
+        The first worker reuses the driver of this Scraper, the other workers get a new driver of the same browser
+        type and profile.
+
+        Raises:
+            RuntimeError: In case a driver could not be created for the worker.
+        """
+        metrics: RunMetrics = RunMetrics()
+        if index == 0:
+            driver: Chrome | Firefox = self.driver
+        else:
+            driver = create_webdriver("chrome" if isinstance(self.driver, Chrome) else "firefox", metrics=metrics,
+                                      profile=self.profile)
+            if driver is None:
+                raise RuntimeError(f"Could not create a webdriver for worker {index}")
+        return SeleniumScraper(driver, chunk, session_cache=self.session_cache, navigation=self.navigation,
+                               base_url=self.base_url, profile=self.profile, batch=self.batch,
+                               creds_path=self.creds_path, shared_cache=self.shared_cache, metrics=metrics,
+                               retries=self.retries, backoff=self.backoff, breaker=self.breaker,
+                               recording=self.recording)
+
+    def _recover(self, error: Exception) -> None:
+        """
+        Reloads the page to get rid of whatever state the failed attempt left it in. In case the browser does not
+        respond anymore, for example because it crashed or its session expired, it is replaced by a new browser of
+        the same type and profile, which still has to log in.
+
+        Raises:
+            RuntimeError: In case a new browser could not be started.
+        """
+        try:
+            self.driver.refresh()
+            return
+        except Exception as e:
+            logging.warning(f"The browser session is gone, starting a new browser:\n{e!r}")
+        browser: str = "chrome" if isinstance(self.driver, Chrome) else "firefox"
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logging.debug(f"Could not quit the old browser cleanly: {e!r}")
+        driver: Chrome | Firefox | None = create_webdriver(browser, metrics=self.metrics, profile=self.profile)
+        if driver is None:
+            raise RuntimeError(f"Could not start a new {browser} browser")
+        self.driver = driver
+        self.metrics.count("restarts", "driver")
+
+    def _adopt(self, worker: 'SeleniumScraper') -> None:
+        """
+        The first worker shares the driver of this Scraper, in case it started a new browser that one is kept.
+        """
+        if worker.driver is not self.driver:
+            self.driver = worker.driver
+
+    def close(self) -> None:
+        self.driver.close()
+
+    def quit(self) -> None:
+        self.driver.quit()
+
+    def _wait_for_element_by(self, by: By, name: str, timeout=30) -> None:
+        """
+        Tells the driver to pause the script until a certain element is loaded in the page. WARNING: Sometimes
+        WebDriverWait.until will trigger before the page has time to update causing the script to continue prematurely.
+        This is the case especially when using filters, so use _wait_until_in_page in those cases!
+
+        Args:
+            by (By): The method of pointing to a specific element. Usually XPATH, CSS_SELECTOR or CLASS_NAME.
+            name (str): A string with the name or path to a specific element.
+            timeout (int, optional): How many seconds to pause for before throwing an error. Defaults to 30.
+
+        Raises:
+            TimeoutError: In case the element did not appear within the timeout. The driver is left running, so the
+                failed course can be retried, see Scraper._retry.
+        """
+        try:
+            element_present = ec.presence_of_element_located((by, name))
+            WebDriverWait(self.driver, timeout).until(element_present)
+        except TimeoutException:
+            self.metrics.count("timeouts", "wait_for_element")
+            raise TimeoutError(f"Could not find '{name}' in page after {timeout} seconds!")
+
+    def _classify_page(self, *statuses: CourseStatus) -> CourseStatus:
+        """
+        Checks the page for the markers of all given statuses in a single script run, instead of searching the page
+        once per marker. The statuses are checked in the order given, so the first match wins.
+
+        Args:
+            statuses (CourseStatus): The statuses to check for. Defaults to all statuses that have a marker.
+
+        Returns:
+            CourseStatus: The first status whose marker is in the page, or UNKNOWN if none of them are.
+        """
+        pairs: list[list[str]] = [[status.value, STATUS_MARKERS[status]] for status in statuses or STATUS_MARKERS]
+        found: str | None = self.driver.execute_script(CLASSIFY_PAGE_SCRIPT, pairs)
+        return CourseStatus(found) if found is not None else CourseStatus.UNKNOWN
+
+    def _wait_for_status(self, *statuses: CourseStatus, timeout=30.0) -> CourseStatus:
+        """
+        Waits until the marker of one of the given statuses is found in the page. Uses _wait_until_in_page.
+
+        Args:
+            statuses (CourseStatus): The statuses to wait for, the first one in the order given wins.
+            timeout (float, optional): How many seconds to wait before throwing an exception. Defaults to 30.0.
+
+        Raises:
+            TimeoutError: In case none of the markers appeared before the timeout.
+
+        Returns:
+            CourseStatus: The status whose marker has been found.
+        """
+        markers: dict[str, CourseStatus] = {STATUS_MARKERS[status]: status for status in statuses}
+        return markers[self._wait_until_in_page(*markers, timeout=timeout)]
+
+    def _wait_until_in_page(self, *texts: str, timeout=30.0) -> str:
+        """
+        Waits until one of the specified strings is found in the page. Instead of polling the page, this installs a
+        MutationObserver through execute_async_script which reports back as soon as the page changes to contain one
+        of the strings, so it only costs a single round trip to the driver.
+
+        Args:
+            timeout (float, optional): How many seconds to wait before throwing an exception. Defaults to 30.0.
+
+        Raises:
+            TimeoutError: In case the timeout in seconds has been exceeded. Prevents infinite waits in case the
+                page front-end changes.
+
+        Returns:
+            str: The first of the strings (in the order given) that has been found in the page.
+        """
+        self._set_script_timeout(timeout)
+        deadline: float = time.monotonic() + timeout
+        while (remaining := deadline - time.monotonic()) > 0:
+            try:
+                found: str | None = self.driver.execute_async_script(WAIT_FOR_TEXT_SCRIPT, list(texts), remaining * 1000)
+            except JavascriptException:
+                # The page navigated away while observing, observe the new page for the time that is left. The page
+                # may not be able to run scripts yet, so wait as long as the old polling interval before trying again
+                time.sleep(min(0.5, max(0.0, deadline - time.monotonic())))
+                continue
+            if found is not None:
+                return found
+        self.metrics.count("timeouts", "wait_until_in_page")
+        raise TimeoutError(f"Could not find any of {texts} in page!")
+
+    def _count_round_trips(self) -> None:
+        """
+        Makes the driver count every command it sends to the browser in the metrics of this Scraper. All WebDriver
+        commands go through driver.execute, which is wrapped once per driver. The metrics the wrapper counts in are
+        swapped on every scrape, since a driver outlives the metrics of a single scrape and can be handed to a worker.
+        """
+        d: Chrome | Firefox = self.driver
+        if not hasattr(d, "_registrate_metrics"):
+            execute = d.execute
+
+            def counted_execute(driver_command: str, params: dict | None = None) -> dict:
+                d._registrate_metrics.count("round_trips")
+                return execute(driver_command, params)
+
+            d.execute = counted_execute
+        d._registrate_metrics = self.metrics
+
+    def _set_script_timeout(self, timeout: float) -> None:
+        """
+        Makes sure the driver lets asynchronous scripts run for at least the given timeout, so the scripts can
+        report their own timeout instead of the driver interrupting them. The timeout is kept on the driver itself,
+        since the driver can be replaced by _recover or handed over by a worker or a pool, and a new driver starts at
+        the 30 seconds WebDriver defaults to.
+
+        Args:
+            timeout (float): How many seconds the script needs.
+        """
+        if timeout + 1 > getattr(self.driver, "_registrate_script_timeout", 30.0):
+            self.driver.set_script_timeout(timeout + 1)
+            self.driver._registrate_script_timeout = timeout + 1
@@ -0,0 +1,92 @@
+from project.constants import MYTUD_URL
+from project.utils import write_atomically
+from typing import TYPE_CHECKING
+import logging
+import json
+import os
+
+if TYPE_CHECKING:
+    from selenium.webdriver import Chrome, Firefox
+
+
+class SessionCache:
+    """
+    This class saves the cookies and local storage of a logged in MyTUD session to disk, so a later run can restore
+    them in a new driver and skip the login form as long as the session has not expired.
+    """
+    def __init__(self, path="./project/data/session.json"):
+        """
+        The initialiser method for the SessionCache class.
+
+        Args:
+            path (str, optional): The file the session gets saved to. This file contains a valid login, so treat it
+                like the creds.json. Defaults to "./project/data/session.json".
+        """
+        self.path: str = path
+
+    def save(self, driver: 'Chrome | Firefox') -> None:
+        """
+        Saves the cookies and local storage of the page the driver currently has open. Should be called after the
+        login has been completed. The file is replaced atomically, since several workers can save at the same time.
+
+        Args:
+            driver (Chrome | Firefox): A driver with a logged in MyTUD page open.
+        """
+        session: dict[str] = {
+            "cookies": driver.get_cookies(),
+            "local_storage": driver.execute_script("return Object.assign({}, window.localStorage);"),
+        }
+        write_atomically(self.path, json.dumps(session), mode=0o600)
+        logging.info("Saved the MyTUD session")
+
+    def load(self) -> dict[str] | None:
+        """
+        Reads the saved session from disk.
+
+        Returns:
+            dict[str] | None: The saved cookies and local storage, or None in case no (readable) session was saved.
+        """
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Could not read the saved session, ignoring it: {e}")
+            return None
+
+    def restore(self, driver: 'Chrome | Firefox', url=MYTUD_URL) -> bool:
+        """
+        Opens MyTUD in the driver and restores the saved cookies and local storage. Whether the session is still
+        valid can only be seen after navigating to the sign up page, which is left to the Scraper.
+
+        Args:
+            driver (Chrome | Firefox): The driver to restore the session in.
+            url (str, optional): The MyTUD URL the session belongs to. Defaults to MYTUD_URL.
+
+        Returns:
+            bool: Whether a saved session was found and restored.
+        """
+        from selenium.common.exceptions import WebDriverException
+        session: dict[str] | None = self.load()
+        if not session:
+            return False
+        driver.get(url)
+        for cookie in session.get("cookies", []):
+            try:
+                driver.add_cookie(cookie)
+            except WebDriverException:
+                logging.debug(f"Skipping cookie '{cookie.get('name')}' for domain '{cookie.get('domain')}'")
+        driver.execute_script(
+            "for (const [key, value] of Object.entries(arguments[0])) window.localStorage.setItem(key, value);",
+            session.get("local_storage", {}),
+        )
+        logging.info("Restored the saved MyTUD session")
+        return True
+
+    def clear(self) -> None:
+        """
+        Removes the saved session, for example after it turned out to be expired.
+        """
+        if os.path.exists(self.path):
+            os.remove(self.path)
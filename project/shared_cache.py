@@ -0,0 +1,101 @@
+from project.status import CourseStatus
+import threading
+import sqlite3
+import time
+
+
+# The outcomes that are the same for every user, the other outcomes depend on the program of the user
+GLOBAL_STATUSES: set[CourseStatus] = {CourseStatus.NOT_FOUND, CourseStatus.CLOSED}
+
+
+class SharedResultCache:
+    """
+    This class shares the outcomes of a course that are the same for every user (not found, or a closed sign up)
+    between all Scrapers on the same host for a short time, so a course many users follow is only searched once
+    per time-to-live. Outcomes are kept in a SQLite database, which every process on the host can open, or only in
+    memory when the Scrapers sharing them all run in this process.
+    """
+    def __init__(self, path="./project/data/shared.db", ttl=300.0):
+        """
+        The initialiser method for the SharedResultCache class.
+
+        Args:
+            path (str | None, optional): The SQLite database file shared with other processes, created when it does
+                not exist yet. In case it is None, outcomes are only shared within this process.
+                Defaults to "./project/data/shared.db".
+            ttl (float, optional): How many seconds a shared outcome stays valid. Defaults to 300.0.
+        """
+        self.path: str | None = path
+        self.ttl: float = ttl
+        self._entries: dict[str, tuple[CourseStatus, float]] = {}
+        self._lock: threading.Lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+        if path is not None:
+            self._connection = sqlite3.connect(path, check_same_thread=False, timeout=10.0)
+            with self._connection:
+                self._connection.execute("PRAGMA journal_mode=WAL")
+                self._connection.execute(
+                    "CREATE TABLE IF NOT EXISTS shared (code TEXT PRIMARY KEY, status TEXT NOT NULL, "
+                    "checked_at REAL NOT NULL)"
+                )
+
+    def get(self, code: str, now: float | None = None) -> CourseStatus | None:
+        """
+        Looks up the shared outcome of a course.
+
+        Args:
+            code (str): The course code.
+            now (float | None, optional): The current time in seconds since the epoch. Defaults to time.time().
+
+        Returns:
+            CourseStatus | None: The outcome, or None in case no user has checked the course within the
+                time-to-live or the course turned out to be open.
+        """
+        now = now or time.time()
+        code = code.strip().upper()
+        with self._lock:
+            if self._connection is None:
+                entry: tuple[CourseStatus, float] | None = self._entries.get(code)
+            else:
+                row = self._connection.execute("SELECT status, checked_at FROM shared WHERE code = ?",
+                                               (code,)).fetchone()
+                entry = (CourseStatus(row[0]), row[1]) if row else None
+        if entry is None or now - entry[1] >= self.ttl:
+            return None
+        return entry[0]
+
+    def put(self, code: str, status: CourseStatus, checked_at: float | None = None) -> None:
+        """
+        Shares the outcome of a course check. Global outcomes are stored, an outcome that shows the course is open
+        removes the stored one, since the sign up has opened since. UNKNOWN outcomes are ignored.
+
+        Args:
+            code (str): The course code.
+            status (CourseStatus): The outcome of the check.
+            checked_at (float | None, optional): The time of the check in seconds since the epoch.
+                Defaults to time.time().
+        """
+        if status == CourseStatus.UNKNOWN:
+            return
+        checked_at = checked_at or time.time()
+        code = code.strip().upper()
+        with self._lock:
+            if self._connection is None and status in GLOBAL_STATUSES:
+                self._entries[code] = (status, checked_at)
+            elif self._connection is None:
+                self._entries.pop(code, None)
+            elif status in GLOBAL_STATUSES:
+                with self._connection:
+                    self._connection.execute(
+                        "INSERT OR REPLACE INTO shared (code, status, checked_at) VALUES (?, ?, ?)",
+                        (code, status.value, checked_at),
+                    )
+            else:
+                with self._connection:
+                    self._connection.execute("DELETE FROM shared WHERE code = ?", (code,))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
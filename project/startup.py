@@ -0,0 +1,107 @@
+from project.session import SessionCache
+from project.metrics import RunMetrics
+from project.constants import MYTUD_URL
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import TYPE_CHECKING
+import importlib
+import logging
+import time
+
+if TYPE_CHECKING:
+    from selenium.webdriver import Chrome, Firefox
+
+
+class StartupPipeline:
+    """
+    This class runs the slow steps of starting a run in the background, while __main__ reads the credentials, loads
+    the courses and asks for anything that is missing. Starting the browser takes several seconds, so it is launched
+    first and opens the sign up page as soon as it is up, restoring the saved session on the way. The modules of the
+    notifiers are imported at the same time, so notifying after the scrape does not have to wait for them.
+    """
+    def __init__(self, metrics: RunMetrics | None = None):
+        """
+        The initialiser method for the StartupPipeline class.
+
+        Args:
+            metrics (RunMetrics | None, optional): Where to record how long the steps took, pass the metrics of the
+                first scrape. Defaults to None.
+        """
+        self.metrics: RunMetrics = metrics or RunMetrics()
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="startup")
+        self._driver: 'Future[Chrome | Firefox | None] | None' = None
+
+    def launch_browser(self, browser: str, profile="standard", base_url=MYTUD_URL,
+                       session_cache: SessionCache | None = None, navigate=True) -> None:
+        """
+        Starts the browser in the background, see create_webdriver, and opens the sign up page with it, see
+        SeleniumScraper.open_sign_up. The browser can be taken once with take_driver.
+
+        Args:
+            browser (str): The browser to start, 'firefox' or 'chrome'.
+            profile (str, optional): The driver profile. Defaults to "standard".
+            base_url (str, optional): The MyTUD URL the sign up page is relative to. Defaults to MYTUD_URL.
+            session_cache (SessionCache | None, optional): The saved session to restore before opening the sign up
+                page. Defaults to None.
+            navigate (bool, optional): Whether to open the sign up page, pass False in case the saved session is
+                about to be replaced. Defaults to True.
+        """
+        self._driver = self._executor.submit(self._launch, browser, profile, base_url, session_cache, navigate)
+
+    def preload(self, *modules: str) -> None:
+        """
+        Imports modules in the background, so they are loaded by the time they are needed.
+
+        Args:
+            modules (str): The modules to import, like 'project.mailer'.
+        """
+        for module in modules:
+            self._executor.submit(self._import, module)
+
+    def take_driver(self) -> 'Chrome | Firefox | None':
+        """
+        Waits for the browser launched with launch_browser and hands it over. Later calls return None, so the caller
+        creates its own driver instead.
+
+        Returns:
+            Chrome | Firefox | None: The driver, or None in case no browser was launched, it has been taken already or
+                it could not be started.
+        """
+        if self._driver is None:
+            return None
+        future, self._driver = self._driver, None
+        start: float = time.perf_counter()
+        driver: 'Chrome | Firefox | None' = future.result()
+        self.metrics.record("startup_wait", time.perf_counter() - start)
+        return driver
+
+    def close(self) -> None:
+        """
+        Waits for the background steps and quits the browser in case it has not been taken.
+        """
+        future, self._driver = self._driver, None
+        self._executor.shutdown(wait=True)
+        if future is not None and future.result() is not None:
+            future.result().quit()
+
+    def _launch(self, browser: str, profile: str, base_url: str, session_cache: SessionCache | None,
+                navigate: bool) -> 'Chrome | Firefox | None':
+        from project.utils import create_webdriver
+        driver: 'Chrome | Firefox | None' = create_webdriver(browser, metrics=self.metrics, profile=profile)
+        if driver is None or not navigate:
+            return driver
+        from project.selenium_scraper import SeleniumScraper
+        start: float = time.perf_counter()
+        try:
+            SeleniumScraper.open_sign_up(driver, base_url, session_cache)
+        except Exception as e:
+            # The scraper opens the page again when it logs in, so this only costs the head start
+            logging.warning(f"Could not open the sign up page while starting:\n{e!r}")
+        self.metrics.record("open_sign_up", time.perf_counter() - start)
+        return driver
+
+    @staticmethod
+    def _import(module: str) -> None:
+        try:
+            importlib.import_module(module)
+        except ImportError as e:
+            logging.debug(f"Could not preload '{module}': {e!r}")
@@ -0,0 +1,24 @@
+from project.constants import NO_COURSES_FOUND, CLOSED_SIGNUP, UNABLE_TO_SIGNUP, SIGNUP_AVAILABLE, NOT_IN_PROGRAM
+from enum import Enum
+
+
+class CourseStatus(Enum):
+    """
+    The outcome of checking a single course on MyTUD. Every Scraper backend reports one of these per course.
+    """
+    NOT_FOUND = "not_found"
+    CLOSED = "closed"
+    UNABLE = "unable"
+    AVAILABLE = "available"
+    NOT_IN_PROGRAM = "not_in_program"
+    UNKNOWN = "unknown"
+
+
+# The string MyTUD shows on the sign up page for each status, in the order the page is checked in
+STATUS_MARKERS: dict[CourseStatus, str] = {
+    CourseStatus.NOT_FOUND: NO_COURSES_FOUND,
+    CourseStatus.CLOSED: CLOSED_SIGNUP,
+    CourseStatus.UNABLE: UNABLE_TO_SIGNUP,
+    CourseStatus.AVAILABLE: SIGNUP_AVAILABLE,
+    CourseStatus.NOT_IN_PROGRAM: NOT_IN_PROGRAM,
+}
@@ -0,0 +1,145 @@
+from project.status import CourseStatus
+import threading
+import sqlite3
+import time
+
+# How many seconds the individual checks are kept, which is all the SignupScheduler needs to keep to its budget
+CHECK_HISTORY: float = 24 * 3600
+
+
+class StatusStore:
+    """
+    This class keeps the last outcome of every course, and when it was checked, in a small SQLite database. This
+    lets a run skip courses that have been checked recently and only notify when the status of a course changed.
+    Every change is also kept as history, which the SignupScheduler learns the sign up windows from, and every check
+    of the last day is logged, which the SignupScheduler keeps its budget with across runs.
+    """
+    def __init__(self, path="./project/data/status.db"):
+        """
+        The initialiser method for the StatusStore class.
+
+        Args:
+            path (str, optional): The SQLite database file, created when it does not exist yet.
+                Defaults to "./project/data/status.db".
+        """
+        self.path: str = path
+        self._lock: threading.Lock = threading.Lock()
+        self._connection: sqlite3.Connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS statuses ("
+                "code TEXT PRIMARY KEY, status TEXT NOT NULL, checked_at REAL NOT NULL, changed_at REAL NOT NULL)"
+            )
+            has_history: bool = self._connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'changes'").fetchone() is not None
+            if not has_history:
+                # Databases from before the history start it with the last change of every course
+                self._connection.execute(
+                    "CREATE TABLE changes (code TEXT NOT NULL, status TEXT NOT NULL, changed_at REAL NOT NULL)")
+                self._connection.execute("INSERT INTO changes SELECT code, status, changed_at FROM statuses")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS changes_by_status ON changes (status, code)")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS checks (code TEXT NOT NULL, checked_at REAL NOT NULL)")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS checks_by_time ON checks (checked_at)")
+
+    def get(self, code: str) -> tuple[CourseStatus, float] | None:
+        """
+        Returns the last recorded outcome of a course.
+
+        Args:
+            code (str): The course code.
+
+        Returns:
+            tuple[CourseStatus, float] | None: The status and the time it was checked at (seconds since the epoch),
+                or None in case the course has never been checked.
+        """
+        with self._lock:
+            row = self._connection.execute("SELECT status, checked_at FROM statuses WHERE code = ?", (code,)).fetchone()
+        return (CourseStatus(row[0]), row[1]) if row else None
+
+    def is_fresh(self, code: str, ttl: float, now: float | None = None) -> bool:
+        """
+        Checks whether a course has been checked within the time-to-live.
+
+        Args:
+            code (str): The course code.
+            ttl (float): How many seconds an outcome stays valid.
+            now (float | None, optional): The current time in seconds since the epoch. Defaults to time.time().
+
+        Returns:
+            bool: Whether the course does not need to be checked again yet.
+        """
+        last: tuple[CourseStatus, float] | None = self.get(code)
+        return last is not None and (now or time.time()) - last[1] < ttl
+
+    def record(self, statuses: dict[str, CourseStatus], checked_at: float | None = None) -> list[str]:
+        """
+        Records the outcome of a scrape. UNKNOWN outcomes only update the check time, so a single failed check does
+        not overwrite (and later flip back) the last known status. Every outcome is logged as a check, see checks_since.
+
+        Args:
+            statuses (dict[str, CourseStatus]): The outcome per course code.
+            checked_at (float | None, optional): The time of the scrape in seconds since the epoch.
+                Defaults to time.time().
+
+        Returns:
+            list[str]: The codes of the courses whose status differs from the one recorded before. Courses that are
+                recorded for the first time count as changed.
+        """
+        checked_at = checked_at or time.time()
+        changed: list[str] = []
+        with self._lock, self._connection:
+            for code, status in statuses.items():
+                row = self._connection.execute("SELECT status FROM statuses WHERE code = ?", (code,)).fetchone()
+                if status == CourseStatus.UNKNOWN:
+                    self._connection.execute("UPDATE statuses SET checked_at = ? WHERE code = ?", (checked_at, code))
+                elif row is None or row[0] != status.value:
+                    changed.append(code)
+                    self._connection.execute(
+                        "INSERT OR REPLACE INTO statuses (code, status, checked_at, changed_at) VALUES (?, ?, ?, ?)",
+                        (code, status.value, checked_at, checked_at),
+                    )
+                    self._connection.execute("INSERT INTO changes (code, status, changed_at) VALUES (?, ?, ?)",
+                                             (code, status.value, checked_at))
+                else:
+                    self._connection.execute("UPDATE statuses SET checked_at = ? WHERE code = ?", (checked_at, code))
+            self._connection.executemany("INSERT INTO checks (code, checked_at) VALUES (?, ?)",
+                                         [(code, checked_at) for code in statuses])
+            self._connection.execute("DELETE FROM checks WHERE checked_at < ?", (checked_at - CHECK_HISTORY,))
+        return changed
+
+    def checks_since(self, since: float) -> list[float]:
+        """
+        Returns when the courses were checked after a moment, by any run that shares this database.
+
+        Args:
+            since (float): The moment in seconds since the epoch, at most a day ago.
+
+        Returns:
+            list[float]: The time of every check after the moment in seconds since the epoch, oldest first.
+        """
+        with self._lock:
+            rows = self._connection.execute("SELECT checked_at FROM checks WHERE checked_at > ? ORDER BY checked_at",
+                                            (since,)).fetchall()
+        return [row[0] for row in rows]
+
+    def changes(self, status: CourseStatus) -> dict[str, list[float]]:
+        """
+        Returns when courses changed to a status, for example when their sign up opened.
+
+        Args:
+            status (CourseStatus): The status the courses changed to.
+
+        Returns:
+            dict[str, list[float]]: Per course code, the times of the changes in seconds since the epoch, oldest first.
+        """
+        with self._lock:
+            rows = self._connection.execute("SELECT code, changed_at FROM changes WHERE status = ? ORDER BY changed_at",
+                                            (status.value,)).fetchall()
+        changes: dict[str, list[float]] = {}
+        for code, changed_at in rows:
+            changes.setdefault(code, []).append(changed_at)
+        return changes
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
@@ -1,16 +1,18 @@
-from telegram.ext import Updater
+from telegram.request import HTTPXRequest
+from telegram import Bot
 from telegram.constants import ParseMode
 from project.utils import read_from_json
 from project.courses import Courses
 from project.course import Course
 import logging
+import asyncio
 
 
 class TelegramBot:
     """
     This class handles the notification sending after scraping has been completed.
     """
-    def __init__(self, token, chat_id) -> None:
+    def __init__(self, token, chat_id, base_url="https://api.telegram.org/bot") -> None:
         """
         The initialiser method for the TelegramBot class.
 
@@ -19,10 +21,12 @@ class TelegramBot:
                 be sensitive.
             chat_id (_type_): The chat ID set during the initialisation for the telegram notification method. This
                 is the chat the notification gets sent to.
+            base_url (str, optional): The Bot API endpoint, the token is appended to it. Only needs to be changed to
+                send to a local stand-in. Defaults to "https://api.telegram.org/bot".
         """
         self.token: str = token
         self.chat_id: str = chat_id
-        self.updater: Updater = Updater(token=self.token, use_context=True)
+        self.base_url: str = base_url
 
     @property
     def token(self) -> str:
@@ -62,12 +66,27 @@ class TelegramBot:
             open_courses (Courses): The open courses according to the results of the scrape. Provided
                 in the Scraper class.
         """
-        parse_mode: ParseMode = ParseMode.MARKDOWN_V2
+        asyncio.run(self.send_notification_async(open_courses))
+
+    async def send_notification_async(self, open_courses: Courses) -> None:
+        """
+        Sends the notification like send_notification, from within a running event loop.
+
+        Args:
+            open_courses (Courses): The open courses according to the results of the scrape.
+        """
+        # HTTP/2 is only negotiated over TLS, a plain HTTP endpoint (like a local stand-in) needs HTTP/1.1
+        request = HTTPXRequest(http_version="2" if self.base_url.startswith("https") else "1.1")
+        async with Bot(token=self.token, base_url=self.base_url, request=request) as bot:
+            await bot.send_message(chat_id=self.chat_id, text=self._create_body(open_courses),
+                                   parse_mode=ParseMode.MARKDOWN_V2)
+
+    @staticmethod
+    def _create_body(open_courses: Courses) -> str:
         if open_courses.courses:
             body: str = f"The following courses are available for sign up:\n\n{open_courses}\n\n"+\
                          "Press [here](https://my.tudelft.nl/#/inschrijven/cursus/:id) to go"+\
-                         " to the sign up page\n\n\-\-RegistrateTUD"
+                         " to the sign up page\n\n\\-\\-RegistrateTUD"
         else:
             body: str = "No open sign ups were found, you don't have to do anything."
-        body = body.replace("(False)", "\(False\)")
-        self.updater.bot.send_message(chat_id=self.chat_id, text=body, parse_mode=parse_mode)
+        return body.replace("(False)", "\\(False\\)")
@@ -1,32 +1,89 @@
-from telegram.ext import Updater, CallbackContext, CommandHandler, Dispatcher
-from telegram import Update
-from project.utils import read_from_json, save_to_json
+from telegram.request import HTTPXRequest
+from telegram import Bot, Update
+from project.utils import read_from_json, save_to_json, telegram_chats
+import argparse
 import logging
+import asyncio
 
-logging.basicConfig(format='%(asctime)s - %(name)s - %(message)s', level=logging.INFO)
-logging.info("Running the telegram initializer...")
-creds = read_from_json()
-updater: Updater = Updater(creds.get("telegram_token", None), use_context=True)
-dp: Dispatcher = updater.dispatcher
 
-
-def tgc_start(update: Update, context: CallbackContext):
+async def register_chats(token: str, count=1, timeout=300.0, jpath="./project/data/creds.json",
+                         base_url="https://api.telegram.org/bot", poll_timeout=10) -> list[str]:
     """
-    This method registers the telegram text using the Dispatcher CommandHandler from
-    the python_telegram_bot library. The user ID gets saved to the ./data/creds.json file.
+    Registers the chats that send '/start' to the bot as receivers of the Telegram notifications. The bot long polls
+    for messages, so it returns as soon as the last chat has sent '/start' instead of checking on an interval. Every
+    chat is saved to the creds.json the moment it registers, the first one as telegram_id and all of them (together
+    with the chats registered before) as telegram_ids, so a chat is not lost in case the setup is stopped.
 
     Args:
-        update (Update): Provided by the Telegram API. This contains data regarding the message sent.
-        context (CallbackContext): Provided by the Telegram API. This is obsolete.
+        token (str): The token of the Telegram bot.
+        count (int, optional): The number of chats to register. Defaults to 1.
+        timeout (float, optional): The seconds to wait for all chats, the chats that registered in time are kept.
+            Defaults to 300.0.
+        jpath (str, optional): The creds.json to save the chats to. Defaults to "./project/data/creds.json".
+        base_url (str, optional): The Bot API endpoint, the token is appended to it. Only needs to be changed to
+            run against a local stand-in. Defaults to "https://api.telegram.org/bot".
+        poll_timeout (int, optional): How many seconds a single long poll may wait. Defaults to 10.
+
+    Returns:
+        list[str]: The chat IDs that registered, in the order they sent '/start'.
+    """
+    registered: list[str] = []
+    # HTTP/2 is only negotiated over TLS, a plain HTTP endpoint (like a local stand-in) needs HTTP/1.1
+    http_version: str = "2" if base_url.startswith("https") else "1.1"
+    offset: int | None = None
+
+    async def poll() -> None:
+        nonlocal offset
+        while len(registered) < count:
+            updates: tuple[Update, ...] = await bot.get_updates(offset=offset, timeout=poll_timeout,
+                                                                allowed_updates=[Update.MESSAGE])
+            for update in updates:
+                if len(registered) == count:
+                    break
+                offset = update.update_id + 1
+                message = update.effective_message
+                if message is None or not message.text or message.text.split()[0].split("@")[0] != "/start":
+                    continue
+                chat: str = str(message.chat_id)
+                if chat not in registered:
+                    registered.append(chat)
+                    _save_chat(chat, jpath)
+                    logging.info(f"Received start command from '{chat}' ({len(registered)}/{count})")
+                await message.reply_text("Your chat ID has been successfully recorded!")
+
+    async with Bot(token=token, base_url=base_url, request=HTTPXRequest(http_version=http_version),
+                   get_updates_request=HTTPXRequest(http_version=http_version)) as bot:
+        try:
+            await asyncio.wait_for(poll(), timeout)
+        except asyncio.TimeoutError:
+            logging.warning(f"Only {len(registered)} of {count} chats registered within {timeout:g} seconds")
+        if offset is not None:
+            # Confirms the handled messages, otherwise the bot receives them again the next time it polls
+            await bot.get_updates(offset=offset, timeout=0)
+    return registered
+
+
+def _save_chat(chat: str, jpath: str) -> None:
+    """
+    Adds a registered chat to the creds.json, which is read again so nothing saved in the meantime is overwritten.
     """
-    creds["telegram_id"] = str(update.message.chat_id)
-    logging.info(f"Received start command from '{creds['telegram_id']}'")
-    save_to_json(creds)
-    update.message.reply_text("Your chat ID has been successfully recorded!")
+    creds: dict[str] = read_from_json(jpath)
+    chats: list[str] = telegram_chats(creds)
+    if chat not in chats:
+        chats.append(chat)
+    creds["telegram_id"] = chats[0]
+    creds["telegram_ids"] = chats
+    save_to_json(creds, jpath)
 
 
 if __name__ == "__main__":
-    dp.add_handler(CommandHandler("start", tgc_start))
-    updater.start_polling()
-    logging.info("Telegram bot has started")
-    
\ No newline at end of file
+    logging.basicConfig(format='%(asctime)s - %(name)s - %(message)s', level=logging.INFO)
+    argparser = argparse.ArgumentParser(prog="telegram_init", description="Register the chats to notify on Telegram")
+    argparser.add_argument("-n", "--count", type=int, default=1, help="Number of chats to register (default=1)")
+    argparser.add_argument("-t", "--timeout", type=float, default=300.0,
+                           help="Seconds to wait for the chats to send '/start' (default=300)")
+    args: dict[str] = vars(argparser.parse_args())
+    logging.info("Running the telegram initializer, send '/start' to the bot from every chat to register...")
+    chats: list[str] = asyncio.run(register_chats(read_from_json().get("telegram_token"), args["count"],
+                                                  args["timeout"]))
+    logging.info(f"Registered {len(chats)} chats: {', '.join(chats)}")
@@ -0,0 +1,321 @@
+from telegram.ext import Application, BaseRateLimiter, CommandHandler, ContextTypes, filters
+from telegram.request import HTTPXRequest
+from telegram.constants import ParseMode
+from telegram.error import RetryAfter
+from telegram import Update
+from project.telegram_bot import TelegramBot
+from project.courses import Courses
+from project.course import Course
+from project.status import CourseStatus
+from typing import Any, Callable, Coroutine
+import threading
+import logging
+import asyncio
+import bisect
+import time
+
+
+# How the outcome of a course is described in a reply
+STATUS_TEXT: dict[CourseStatus, str] = {
+    CourseStatus.NOT_FOUND: "not found on MyTUD",
+    CourseStatus.CLOSED: "the sign up is closed",
+    CourseStatus.UNABLE: "you are not able to sign up",
+    CourseStatus.AVAILABLE: "open for sign up!",
+    CourseStatus.NOT_IN_PROGRAM: "not part of your course program",
+    CourseStatus.UNKNOWN: "could not be determined",
+}
+
+
+class MessageRateLimiter(BaseRateLimiter):
+    """
+    This class keeps the messages of a bot within the limits of the Bot API: at most one message per second to the
+    same chat and thirty per second in total. A message that would exceed them waits for its turn, a message the
+    Bot API still refuses with a RetryAfter is sent once more after the time it asks for. The turns of all chats are
+    spread out by the overall limit, but a chat with messages waiting does not hold up the turns of other chats.
+    """
+    def __init__(self, per_chat=1.0, overall=30.0):
+        """
+        The initialiser method for the MessageRateLimiter class.
+
+        Args:
+            per_chat (float, optional): The seconds between two messages to the same chat. Defaults to 1.0.
+            overall (float, optional): The number of messages per second to all chats together. Defaults to 30.0.
+        """
+        self.per_chat: float = per_chat
+        self.overall: float = overall
+        self._turns: list[float] = []
+        self._next_chat: dict[str, float] = {}
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+    async def process_request(self, callback: Callable[..., Coroutine[Any, Any, Any]], args: Any,
+                              kwargs: dict[str, Any], endpoint: str, data: dict[str, Any],
+                              rate_limit_args: None) -> Any:
+        """
+        Waits for the turn of a message, calls without a chat (like getUpdates) are not limited.
+        """
+        chat: str | None = str(data["chat_id"]) if data.get("chat_id") is not None else None
+        if chat is not None:
+            # Nothing is awaited until the turn has been taken, so concurrent messages get consecutive turns
+            now: float = asyncio.get_running_loop().time()
+            gap: float = 1 / self.overall
+            turn: float = max(now, self._next_chat.get(chat, 0.0))
+            # The earliest turn that is far enough from the turns already taken, which are kept in order
+            self._turns = [taken for taken in self._turns if taken > now - gap]
+            for taken in self._turns:
+                if taken - gap < turn < taken + gap:
+                    turn = taken + gap
+            bisect.insort(self._turns, turn)
+            self._next_chat[chat] = turn + self.per_chat
+            await asyncio.sleep(turn - now)
+        try:
+            return await callback(*args, **kwargs)
+        except RetryAfter as e:
+            logging.warning(f"The Bot API asked to wait {e.retry_after} seconds before sending '{endpoint}'")
+            await asyncio.sleep(e.retry_after)
+            return await callback(*args, **kwargs)
+
+
+class TelegramService:
+    """
+    This class runs a Telegram bot for as long as the program runs, next to the WatchDaemon. It answers the commands
+    below from the results of the latest scrape, which the daemon hands to it with update, so a user can see the
+    current state without waiting for the next notification and without a browser being started.
+        /status: When the last scrape was and how many courses it found per outcome.
+        /courses: Every followed course with its last outcome.
+        /check <code>: The last outcome of a single course.
+
+    Only the registered chats are answered. The bot runs its own event loop in a background thread and keeps one
+    connection to the Bot API for its messages, plus one for long polling the commands. All messages, including
+    the notifications sent through send_notification_async, go through a MessageRateLimiter.
+    """
+    def __init__(self, token: str, chat_ids: str | list[str], base_url="https://api.telegram.org/bot", poll_timeout=10,
+                 rate_limiter: MessageRateLimiter | None = None):
+        """
+        The initialiser method for the TelegramService class.
+
+        Args:
+            token (str): The token of the Telegram bot.
+            chat_ids (str | list[str]): The chats registered with the telegram init, the only chats the bot answers
+                and the chats the notifications are sent to.
+            base_url (str, optional): The Bot API endpoint, the token is appended to it. Only needs to be changed to
+                run against a local stand-in. Defaults to "https://api.telegram.org/bot".
+            poll_timeout (int, optional): How many seconds a single long poll for commands may wait. Defaults to 10.
+            rate_limiter (MessageRateLimiter | None, optional): Limits the outgoing messages. Defaults to a
+                MessageRateLimiter with the limits of the Bot API.
+        """
+        if isinstance(chat_ids, str):
+            chat_ids = [chat_ids]
+        if not token or not chat_ids:
+            raise ValueError("The Telegram token and chat ID need to be set to answer commands")
+        self.token: str = token
+        self.chat_ids: list[str] = [str(chat) for chat in chat_ids]
+        self.base_url: str = base_url
+        self.poll_timeout: int = poll_timeout
+        self.rate_limiter: MessageRateLimiter = rate_limiter or MessageRateLimiter()
+        self.courses: Courses = Courses([])
+        self.scraped_at: float | None = None
+        self.failures: list[str] = []
+        self._statuses: dict[str, tuple[CourseStatus, float]] = {}
+        self._lock: threading.Lock = threading.Lock()
+        self._application: Application | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stop_event: asyncio.Event | None = None
+        self._thread: threading.Thread | None = None
+        self._ready: threading.Event = threading.Event()
+        self._error: Exception | None = None
+
+    def __enter__(self) -> 'TelegramService':
+        self.start()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.stop()
+
+    def start(self, timeout=30.0) -> None:
+        """
+        Starts the bot in a background thread and waits until it is answering commands.
+
+        Args:
+            timeout (float, optional): How many seconds starting may take. Defaults to 30.0.
+
+        Raises:
+            RuntimeError: In case the bot could not be started, for example because the token is invalid.
+        """
+        self._thread = threading.Thread(target=asyncio.run, args=(self._serve(),), name="telegram", daemon=True)
+        self._thread.start()
+        if not self._ready.wait(timeout):
+            raise RuntimeError(f"The Telegram bot did not start within {timeout} seconds")
+        if self._error is not None:
+            raise RuntimeError(f"The Telegram bot could not be started: {self._error!r}")
+        logging.info("The Telegram bot is answering /status, /courses and /check")
+
+    def stop(self) -> None:
+        """
+        Stops answering commands and closes the connections.
+        """
+        if self._loop is not None and self._stop_event is not None:
+            self._loop.call_soon_threadsafe(self._stop_event.set)
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def update(self, courses: Courses, statuses: dict[str, CourseStatus], failures: list[str] | None = None) -> None:
+        """
+        Hands the results of a scrape to the bot. Courses that have not been checked keep their previous outcome.
+
+        Args:
+            courses (Courses): The followed courses.
+            statuses (dict[str, CourseStatus]): The outcome per course code of the scrape.
+            failures (list[str] | None, optional): The codes of the courses that could not be checked.
+                Defaults to None.
+        """
+        now: float = time.time()
+        with self._lock:
+            self.courses = courses
+            self.scraped_at = now
+            self.failures = list(failures or [])
+            self._statuses.update({code: (status, now) for code, status in statuses.items()})
+
+    async def send_notification_async(self, open_courses: Courses, chat_id: str | None = None) -> None:
+        """
+        Sends the notification of the TelegramBot through the running bot. Can be awaited from any event loop, so it
+        can be used as a channel of the Notifier, pass the chat to give every chat a channel of its own.
+
+        Args:
+            open_courses (Courses): The open courses according to the results of the scrape.
+            chat_id (str | None, optional): The chat to send to. Defaults to None, every registered chat.
+        """
+        await self.send(TelegramBot._create_body(open_courses), ParseMode.MARKDOWN_V2, chat_id)
+
+    async def send(self, text: str, parse_mode: str | None = None, chat_id: str | None = None) -> None:
+        """
+        Sends a message through the running bot, from any event loop.
+
+        Args:
+            text (str): The message.
+            parse_mode (str | None, optional): How Telegram formats the message. Defaults to None, plain text.
+            chat_id (str | None, optional): The chat to send to. Defaults to None, every registered chat.
+
+        Raises:
+            RuntimeError: In case the bot is not running.
+        """
+        if self._application is None or self._loop is None:
+            raise RuntimeError("The Telegram bot is not running")
+        chats: list[str] = self.chat_ids if chat_id is None else [str(chat_id)]
+        await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._send_all(text, parse_mode, chats),
+                                                                   self._loop))
+
+    async def _send_all(self, text: str, parse_mode: str | None, chats: list[str]) -> None:
+        """
+        Sends a message to several chats at once, runs in the event loop of the bot.
+        """
+        await asyncio.gather(*[self._application.bot.send_message(chat_id=chat, text=text, parse_mode=parse_mode)
+                               for chat in chats])
+
+    def status_text(self) -> str:
+        """
+        Returns:
+            str: The reply to /status.
+        """
+        with self._lock:
+            if self.scraped_at is None:
+                return "No scrape has been completed yet, try again in a minute."
+            counts: dict[CourseStatus, int] = {}
+            for status, _ in self._statuses.values():
+                counts[status] = counts.get(status, 0) + 1
+            open_courses: list[Course] = [course for course in self.courses.courses
+                                          if self._statuses.get(course.code, (None,))[0] == CourseStatus.AVAILABLE]
+            lines: list[str] = [f"The last scrape was {_ago(self.scraped_at)}."]
+            lines += [f"{amount} {STATUS_TEXT[status].rstrip('!')}" for status, amount in counts.items()]
+            if self.failures:
+                lines.append(f"{len(self.failures)} could not be checked: {', '.join(self.failures)}")
+        if open_courses:
+            lines.append("\nOpen for sign up:\n" + "\n".join(f"{course.code} {course.name}" for course in open_courses))
+        return "\n".join(lines)
+
+    def courses_text(self) -> str:
+        """
+        Returns:
+            str: The reply to /courses.
+        """
+        with self._lock:
+            if not self.courses.courses:
+                return "No courses are being followed."
+            return "\n".join(self._describe(course) for course in self.courses.courses)
+
+    def check_text(self, code: str) -> str:
+        """
+        Returns:
+            str: The reply to /check with a course code.
+        """
+        with self._lock:
+            course: Course | None = self.courses.get(code)
+            if course is None:
+                return f"'{code}' is not one of the followed courses, see /courses."
+            return self._describe(course)
+
+    async def _serve(self) -> None:
+        """
+        Runs the bot until stop is called.
+        """
+        try:
+            # HTTP/2 is only negotiated over TLS, a plain HTTP endpoint (like a local stand-in) needs HTTP/1.1
+            http_version: str = "2" if self.base_url.startswith("https") else "1.1"
+            self._application = Application.builder().token(self.token).base_url(self.base_url) \
+                .request(HTTPXRequest(connection_pool_size=1, http_version=http_version)) \
+                .get_updates_request(HTTPXRequest(connection_pool_size=1, http_version=http_version)) \
+                .rate_limiter(self.rate_limiter).build()
+            chat: filters.Chat = filters.Chat(chat_id=[int(chat) for chat in self.chat_ids])
+            self._application.add_handler(CommandHandler("status", self._status, chat))
+            self._application.add_handler(CommandHandler("courses", self._courses, chat))
+            self._application.add_handler(CommandHandler("check", self._check, chat))
+            self._stop_event = asyncio.Event()
+            async with self._application:
+                await self._application.updater.start_polling(timeout=self.poll_timeout)
+                await self._application.start()
+                self._loop = asyncio.get_running_loop()
+                self._ready.set()
+                await self._stop_event.wait()
+                await self._application.updater.stop()
+                await self._application.stop()
+        except Exception as e:
+            self._error = e
+            logging.error(f"The Telegram bot stopped:\n{e!r}")
+        finally:
+            self._loop = None
+            self._ready.set()
+
+    async def _status(self, update: Update, _: ContextTypes.DEFAULT_TYPE) -> None:
+        await update.effective_message.reply_text(self.status_text())
+
+    async def _courses(self, update: Update, _: ContextTypes.DEFAULT_TYPE) -> None:
+        await update.effective_message.reply_text(self.courses_text())
+
+    async def _check(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        if not context.args:
+            await update.effective_message.reply_text("Add the course code to check, like: /check CSE1100")
+            return
+        await update.effective_message.reply_text("\n".join(self.check_text(code) for code in context.args))
+
+    def _describe(self, course: Course) -> str:
+        """
+        Describes the last outcome of a course, should be called with the lock held.
+        """
+        last: tuple[CourseStatus, float] | None = self._statuses.get(course.code)
+        if last is None:
+            return f"{course.code} {course.name}: not checked yet"
+        return f"{course.code} {course.name}: {STATUS_TEXT[last[0]]} (checked {_ago(last[1])})"
+
+
+def _ago(moment: float) -> str:
+    seconds: float = max(0.0, time.time() - moment)
+    if seconds < 60:
+        return "just now"
+    if seconds < 3600:
+        return f"{seconds // 60:.0f} minutes ago"
+    return f"{seconds // 3600:.0f} hours ago"
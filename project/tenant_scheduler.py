@@ -0,0 +1,129 @@
+from project.browser_pool import BrowserPool
+from project.status import CourseStatus
+from project.tenants import Tenant
+from project.circuit_breaker import CircuitBreaker
+from project.constants import MYTUD_URL
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+import logging
+import time
+
+if TYPE_CHECKING:
+    from project.scraper import Scraper
+    from project.shared_cache import SharedResultCache
+
+
+class TenantScheduler:
+    """
+    This class scrapes for many tenants in one process. Tenants run concurrently, as many at a time as the
+    BrowserPool has browsers, so the total time grows with the number of tenants divided by the pool size instead of
+    with the number of tenants. A tenant that fails is logged and skipped, it does not stop the other tenants.
+    """
+    def __init__(self, tenants: list[Tenant], pool: BrowserPool, backend="selenium", navigation="spa", ttl=0.0,
+                 shared_cache: 'SharedResultCache | None' = None, breaker: CircuitBreaker | None = None,
+                 base_url=MYTUD_URL):
+        """
+        The initialiser method for the TenantScheduler class.
+
+        Args:
+            tenants (list[Tenant]): The tenants to scrape for, see TenantRegistry.
+            pool (BrowserPool): The browsers the tenants share.
+            backend (str, optional): The scraping backend, 'selenium' or 'http'. With 'http', a tenant only
+                borrows a browser when its saved session is no longer valid. Defaults to "selenium".
+            navigation (str, optional): How the browser returns to the search, see SeleniumScraper.
+                Defaults to "spa".
+            ttl (float, optional): How many seconds a recorded outcome stays valid, see Scraper. Defaults to 0.0.
+            shared_cache (SharedResultCache | None, optional): Shares the outcomes that are the same for every
+                tenant, so a course many tenants follow is only searched once while it is closed. Defaults to None.
+            breaker (CircuitBreaker | None, optional): Shared by all tenants, so they all stop checking once MyTUD
+                seems to be down. Defaults to a new CircuitBreaker.
+            base_url (str, optional): The MyTUD URL to scrape. Only needs to be changed to run against a stand-in
+                like the FakeMyTUD. Defaults to MYTUD_URL.
+        """
+        if backend != "selenium" and backend != "http":
+            raise ValueError(f"Backend must be 'selenium' or 'http', not: '{backend}'")
+        self.tenants: list[Tenant] = tenants
+        self.pool: BrowserPool = pool
+        self.backend: str = backend
+        self.navigation: str = navigation
+        self.ttl: float = ttl
+        self.shared_cache: 'SharedResultCache | None' = shared_cache
+        self.breaker: CircuitBreaker = breaker or CircuitBreaker()
+        self.base_url: str = base_url
+        self.statuses: dict[str, dict[str, CourseStatus]] = {}
+        self.failures: dict[str, Exception] = {}
+
+    def run(self) -> dict[str, dict[str, CourseStatus]]:
+        """
+        Scrapes and notifies for every tenant.
+
+        Returns:
+            dict[str, dict[str, CourseStatus]]: Per tenant name, the outcome per course code. Tenants that failed
+                are left out and can be found in failures instead.
+        """
+        self.statuses = {}
+        self.failures = {}
+        start: float = time.perf_counter()
+        logging.info(f"Scraping for {len(self.tenants)} tenants with {self.pool.size} browsers...")
+        with ThreadPoolExecutor(max_workers=self.pool.size) as executor:
+            list(executor.map(self._run_tenant, self.tenants))
+        for tenant in self.tenants:
+            tenant.close()
+        self.statuses = {tenant.name: self.statuses[tenant.name] for tenant in self.tenants
+                         if tenant.name in self.statuses}
+        logging.info(f"Scraped for {len(self.statuses)} of {len(self.tenants)} tenants "
+                     f"in {time.perf_counter() - start:.1f} seconds")
+        return self.statuses
+
+    def _run_tenant(self, tenant: Tenant) -> None:
+        """
+        Scrapes and notifies for a single tenant, recording a failure instead of raising.
+
+        Args:
+            tenant (Tenant): The tenant to scrape for.
+        """
+        try:
+            scraper: 'Scraper | None' = self._scrape_with_session(tenant) if self.backend == "http" else None
+            if scraper is None:
+                from project.selenium_scraper import SeleniumScraper
+                with self.pool.acquire() as driver:
+                    scraper = SeleniumScraper(driver, tenant.courses, session_cache=tenant.session_cache,
+                                              navigation=self.navigation, store=tenant.store, ttl=self.ttl,
+                                              creds_path=tenant.creds_path, shared_cache=self.shared_cache,
+                                              breaker=self.breaker, base_url=self.base_url)
+                    try:
+                        scraper.scrape_for_courses(close=False)
+                    finally:
+                        # A browser that stopped responding has been replaced, the pool takes the new one back
+                        if scraper.driver is not driver:
+                            self.pool.replace(driver, scraper.driver)
+            scraper.notify(tenant.notification_method)
+            self.statuses[tenant.name] = dict(scraper.statuses)
+        except Exception as e:
+            logging.error(f"Scraping for tenant '{tenant.name}' failed:\n{e!r}")
+            self.failures[tenant.name] = e
+
+    def _scrape_with_session(self, tenant: Tenant) -> 'Scraper | None':
+        """
+        Scrapes with the HttpScraper in case the tenant has a valid saved session.
+
+        Args:
+            tenant (Tenant): The tenant to scrape for.
+
+        Returns:
+            Scraper | None: The scraper after the scrape, or None in case the tenant needs to log in with a browser.
+        """
+        from project.http_scraper import HttpScraper
+        scraper: HttpScraper | None = HttpScraper.from_session_cache(tenant.session_cache, tenant.courses,
+                                                                     store=tenant.store, ttl=self.ttl,
+                                                                     creds_path=tenant.creds_path,
+                                                                     shared_cache=self.shared_cache,
+                                                                     breaker=self.breaker,
+                                                                     base_url=self.base_url)
+        if scraper is None or not scraper.has_valid_session():
+            logging.info(f"No valid session for tenant '{tenant.name}', logging in with a browser")
+            if scraper is not None:
+                scraper.close()
+            return None
+        scraper.scrape_for_courses()
+        return scraper
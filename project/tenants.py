@@ -0,0 +1,229 @@
+from project.courses import Courses
+from project.session import SessionCache
+from project.utils import read_from_json, save_to_json, write_atomically
+from typing import TYPE_CHECKING
+import logging
+import shutil
+import json
+import os
+import re
+
+if TYPE_CHECKING:
+    from project.status_store import StatusStore
+
+
+class Tenant:
+    """
+    A single user of a shared RegistrateTUD process. Every tenant has its own directory with the same files a single
+    user setup has: a courses.csv, a creds.json, a saved session and a status database. Nothing is shared between
+    tenants, so the courses, login and notifications of one tenant never mix with those of another.
+    """
+    def __init__(self, name: str, path: str):
+        """
+        The initialiser method for the Tenant class. Use TenantRegistry to create or look up tenants.
+
+        Args:
+            name (str): The name of the tenant, also the name of its directory.
+            path (str): The directory with the files of the tenant.
+        """
+        self.name: str = name
+        self.path: str = path
+        self._courses: Courses | None = None
+        self._store: 'StatusStore | None' = None
+
+    def __repr__(self) -> str:
+        return f"Tenant('{self.name}')"
+
+    @property
+    def courses_path(self) -> str:
+        return os.path.join(self.path, "courses.csv")
+
+    @property
+    def creds_path(self) -> str:
+        return os.path.join(self.path, "creds.json")
+
+    @property
+    def settings_path(self) -> str:
+        return os.path.join(self.path, "tenant.json")
+
+    @property
+    def courses(self) -> Courses:
+        if self._courses is None:
+            self._courses = Courses.create_courses_from_path(self.courses_path)
+        return self._courses
+
+    @property
+    def creds(self) -> dict[str]:
+        return read_from_json(self.creds_path)
+
+    @creds.setter
+    def creds(self, creds: dict[str]) -> None:
+        save_to_json(creds, self.creds_path)
+
+    @property
+    def notification_method(self) -> str:
+        return self._read_settings().get("notification_method", "m")
+
+    @notification_method.setter
+    def notification_method(self, value: str) -> None:
+        if "t" not in value and "m" not in value:
+            raise ValueError(f"Notification method must contain 't', 'm' or both, not: '{value}'")
+        settings: dict[str] = self._read_settings()
+        settings["notification_method"] = value
+        write_atomically(self.settings_path, json.dumps(settings))
+
+    @property
+    def session_cache(self) -> SessionCache:
+        return SessionCache(os.path.join(self.path, "session.json"))
+
+    @property
+    def store(self) -> 'StatusStore':
+        if self._store is None:
+            from project.status_store import StatusStore
+            self._store = StatusStore(os.path.join(self.path, "status.db"))
+        return self._store
+
+    def close(self) -> None:
+        """
+        Closes the status database of the tenant, in case it has been opened.
+        """
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+
+    def _read_settings(self) -> dict[str]:
+        if not os.path.exists(self.settings_path):
+            return {}
+        with open(self.settings_path) as f:
+            return json.load(f)
+
+
+class TenantRegistry:
+    """
+    This class keeps track of the tenants of a shared RegistrateTUD process, as one directory per tenant.
+    """
+    def __init__(self, path="./project/data/tenants"):
+        """
+        The initialiser method for the TenantRegistry class.
+
+        Args:
+            path (str, optional): The directory that holds a directory per tenant, created when it does not exist
+                yet. Defaults to "./project/data/tenants".
+        """
+        self.path: str = path
+        os.makedirs(path, exist_ok=True)
+
+    def __contains__(self, name: str) -> bool:
+        return os.path.isdir(os.path.join(self.path, name))
+
+    def __len__(self) -> int:
+        return len(self.names())
+
+    def names(self) -> list[str]:
+        """
+        Returns:
+            list[str]: The names of all tenants, sorted.
+        """
+        return sorted(entry.name for entry in os.scandir(self.path) if entry.is_dir())
+
+    def tenants(self) -> list[Tenant]:
+        """
+        Returns:
+            list[Tenant]: All tenants, sorted by name.
+        """
+        return [self.get(name) for name in self.names()]
+
+    def get(self, name: str) -> Tenant:
+        """
+        Looks up a tenant.
+
+        Args:
+            name (str): The name of the tenant.
+
+        Raises:
+            KeyError: In case there is no tenant with that name.
+
+        Returns:
+            Tenant: The tenant.
+        """
+        if name not in self:
+            raise KeyError(f"There is no tenant named '{name}'")
+        return Tenant(name, os.path.join(self.path, name))
+
+    def add(self, name: str, creds: dict[str], courses: Courses | None = None, notification_method="m") -> Tenant:
+        """
+        Adds a new tenant.
+
+        Args:
+            name (str): The name of the tenant. Only letters, digits, '-' and '_' are allowed, since it is used as
+                the name of a directory.
+            creds (dict[str]): The credentials of the tenant, in the format of the creds.json.
+            courses (Courses | None, optional): The courses the tenant follows. Defaults to None, no courses.
+            notification_method (str, optional): How the tenant is notified, see ./data/prefs.py. Defaults to "m".
+
+        Raises:
+            ValueError: In case the name is not allowed or a tenant with that name already exists.
+
+        Returns:
+            Tenant: The new tenant.
+        """
+        if not re.fullmatch(r"[A-Za-z0-9_-]+", name):
+            raise ValueError(f"A tenant name can only contain letters, digits, '-' and '_', not: '{name}'")
+        if name in self:
+            raise ValueError(f"A tenant named '{name}' already exists")
+        os.makedirs(os.path.join(self.path, name))
+        tenant: Tenant = Tenant(name, os.path.join(self.path, name))
+        tenant.creds = creds
+        tenant.notification_method = notification_method
+        (courses or Courses([])).save(tenant.courses_path)
+        logging.info(f"Added tenant '{name}'")
+        return tenant
+
+    def remove(self, name: str) -> None:
+        """
+        Removes a tenant and all of its files.
+
+        Args:
+            name (str): The name of the tenant.
+
+        Raises:
+            KeyError: In case there is no tenant with that name.
+        """
+        shutil.rmtree(self.get(name).path)
+        logging.info(f"Removed tenant '{name}'")
+
+
+if __name__ == "__main__":
+    import argparse
+    import getpass
+    from project.utils import encode_string
+    logging.basicConfig(format='%(asctime)s - %(name)s - %(message)s', level=logging.INFO)
+
+    argparser = argparse.ArgumentParser(prog="RegistrateTUD tenants", description="Manage the tenants of a shared run")
+    argparser.add_argument("action", choices=["add", "list", "remove"], help="What to do")
+    argparser.add_argument("name", nargs="?", help="The name of the tenant to add or remove")
+    argparser.add_argument("-c", "--courses", default=None, help="A courses.csv to copy the courses of the tenant from")
+    argparser.add_argument("-m", "--method", default="m", help="Notification method(s) of the tenant (default='m')")
+    args: dict[str] = vars(argparser.parse_args())
+    registry = TenantRegistry()
+
+    match args["action"]:
+        case "list":
+            for tenant in registry.tenants():
+                print(f"{tenant.name}: {len(tenant.courses)} courses, notified by '{tenant.notification_method}'")
+        case "remove":
+            registry.remove(args["name"])
+        case "add":
+            if not args["name"]:
+                argparser.error("A name is required to add a tenant")
+            creds: dict[str] = {"net_id": input("Please input the TU Delft net id of the tenant: ")}
+            creds["net_pass"] = encode_string(getpass.getpass("Please input the corresponding password (hidden): "))
+            if "m" in args["method"]:
+                creds["sender_mail"] = input("Please input the sender email: ")
+                creds["mail_pass"] = encode_string(getpass.getpass("Please input the corresponding password: "))
+                creds["receiver_mail"] = input("Please input the receiver email: ")
+            if "t" in args["method"]:
+                creds["telegram_token"] = input("Please enter the bot token: ")
+                creds["telegram_id"] = input("Please enter the chat ID of the tenant: ")
+            courses: Courses = Courses.create_courses_from_path(args["courses"]) if args["courses"] else Courses([])
+            registry.add(args["name"], creds, courses, args["method"])
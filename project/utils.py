@@ -1,16 +1,29 @@
-from selenium.webdriver import Chrome, ChromeOptions, Firefox, FirefoxOptions
 from platform import system
 from project.data.prefs import browser_path, browser_profile
+from project.constants import LEAN_BLOCKED_URLS, LEAN_CHROME_ARGUMENTS, LEAN_CHROME_PREFERENCES, \
+    LEAN_FIREFOX_PREFERENCES
+from typing import TYPE_CHECKING
 import logging
+import tempfile
 import base64
 import json
+import time
 import os
 
+if TYPE_CHECKING:
+    from selenium.webdriver import Chrome, Firefox
+    from project.metrics import RunMetrics
 
-def create_webdriver(browser: str, is_headless=False) -> Chrome | Firefox | None:
+
+def create_webdriver(browser: str, is_headless=False, metrics: 'RunMetrics | None' = None,
+                     profile="standard") -> 'Chrome | Firefox | None':
     """
     Create a webdriver for use in the Scraper class. NOTE: In order for this to work you will have to download
     a version of the chrome or firefox webdriver. Check the README.md for steps on how to download and set it up.
+    Selenium is only imported here, so the other helpers in this module can be used without loading it.
+    The 'lean' profile runs headless, does not load images and web fonts and turns off extensions and background
+    services like updates, safe browsing and telemetry. Chrome also blocks stylesheets, Firefox has no setting for
+    that, so it still loads them.
 
     Args:
         browser (str, 'firefox' | 'chrome'): Select which browser the driver should use. NOTE: Chrome gives
@@ -18,10 +31,15 @@ def create_webdriver(browser: str, is_headless=False) -> Chrome | Firefox | None
             been any performance issues with Chrome despite the warnings.
         is_headless (bool, optional): Whether or not to hide the browser window when the driver
             is being run. Defaults to False.
+        metrics (RunMetrics | None, optional): Where to record how long starting the driver took. Defaults to None.
+        profile (str, 'standard' | 'lean', optional): The driver profile, 'lean' skips everything the scraper does
+            not read and always runs headless. Defaults to "standard".
 
     Returns:
         Chrome | Firefox | None: The driver which will be used for scraping. In case there is an error, returns None.
     """
+    start: float = time.perf_counter()
+    from selenium.webdriver import Chrome, ChromeOptions, Firefox, FirefoxOptions
     logging.info(f"Creating {browser} webdriver...")
     current_system: str = get_system()
 
@@ -33,6 +51,10 @@ def create_webdriver(browser: str, is_headless=False) -> Chrome | Firefox | None
         case _:
             executable_path = "./project/[X]driver"
 
+    if profile != "standard" and profile != "lean":
+        logging.error(f"Driver profile '{profile}' not recognized. Did you set it correctly in data/prefs.py?")
+        return
+    is_lean: bool = profile == "lean"
     if browser != "chrome" and browser != "firefox":
         if browser == "":
             logging.error(f"Browser type 'browser' seems to be unset. Set it in ./data/prefs.py")
@@ -42,22 +64,34 @@ def create_webdriver(browser: str, is_headless=False) -> Chrome | Firefox | None
     try:
         if browser == "chrome":
             driver_options = ChromeOptions()
-            driver_options.headless = is_headless
+            driver_options.headless = is_headless or is_lean
             if browser_profile != "":
                 driver_options.add_argument(f"user-data-dir={browser_profile}")
+            if is_lean:
+                for argument in LEAN_CHROME_ARGUMENTS:
+                    driver_options.add_argument(argument)
+                driver_options.add_experimental_option("prefs", LEAN_CHROME_PREFERENCES)
             executable_path = executable_path.replace("[X]", "chrome")
             logging.info(f"Starting driver with exe path: {executable_path}")
             driver = Chrome(executable_path=executable_path, options=driver_options)
+            if is_lean:
+                driver.execute_cdp_cmd("Network.enable", {})
+                driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URLS})
         elif browser == "firefox":
             driver_options = FirefoxOptions()
-            driver_options.headless = is_headless
+            driver_options.headless = is_headless or is_lean
             driver_options.binary_location = browser_path
+            if is_lean:
+                for name, value in LEAN_FIREFOX_PREFERENCES.items():
+                    driver_options.set_preference(name, value)
             if browser_profile != "":
                 driver_options.add_argument("-profile")
                 driver_options.add_argument(browser_profile)
             executable_path = executable_path.replace("[X]", "gecko")
             logging.info(f"Starting driver with exe path: {executable_path}")
             driver = Firefox(executable_path=executable_path, options=driver_options)
+        if metrics is not None:
+            metrics.record("driver_startup", time.perf_counter() - start)
         return driver
     except Exception as e:
         # Catching WebDriverException is not allowed, which is what is called in this case. Hence 'Exception'...
@@ -100,16 +134,41 @@ def decode_string(value_b64: str) -> str:
     return value
 
 
+def write_atomically(path: str, content: str, mode=0o644) -> None:
+    """
+    Writes a file through a temporary file next to it, which then replaces the file, so a reader never sees half of
+    it. Every write gets a temporary file of its own, so threads can write the same file at the same time, in which
+    case the last write wins.
+
+    Args:
+        path (str): The file to write.
+        content (str): The new content of the file.
+        mode (int, optional): The permissions of the file, pass 0o600 for files with a login. Defaults to 0o644.
+    """
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=f".{os.path.basename(path)}.",
+                                     suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(content)
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
 def save_to_json(creds: dict[str], jpath="./project/data/creds.json") -> None:
     """
-    Saves credentials to the creds.json.
+    Saves credentials to the creds.json. The file is replaced atomically, so a reader never sees half of it.
 
     Args:
         creds (dict[str]): A dictionary with the user credentials. Passwords should be encoded before saving.
         jpath (str, optional): The file path to where to save the credentials. Defaults to "./data/creds.json".
     """
-    with open(jpath, 'w') as f:
-        json.dump(creds, f)
+    write_atomically(jpath, json.dumps(creds), mode=0o600)
 
 
 def read_from_json(jpath="./project/data/creds.json") -> dict[str]:
@@ -123,12 +182,31 @@ def read_from_json(jpath="./project/data/creds.json") -> dict[str]:
         dict[str]: A dictionary with all of the data read in the saved JSON file.
     """
     if not os.path.exists(jpath):
-        save_to_json({})
+        save_to_json({}, jpath)
         logging.warning("The creds.json file was not found, so an empty one was created!")
     with open(jpath) as f:
         creds: dict[str] = json.load(f)
     return creds
 
+
+def telegram_chats(creds: dict[str]) -> list[str]:
+    """
+    Returns the chats that receive the Telegram notifications. Older creds.json files only hold the telegram_id of a
+    single chat, setups that registered several chats also hold all of them in telegram_ids.
+
+    Args:
+        creds (dict[str]): A dictionary with the user credentials.
+
+    Returns:
+        list[str]: The registered chat IDs, empty in case no chat has been registered.
+    """
+    if creds.get("telegram_ids"):
+        return [str(chat) for chat in creds["telegram_ids"]]
+    if creds.get("telegram_id") is not None:
+        return [str(creds["telegram_id"])]
+    return []
+
+
 def get_system() -> str:
     supported_systems: list[str] = ["Windows", "Linux"]
     current_system: str = system()
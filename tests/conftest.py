@@ -0,0 +1,35 @@
+from project.status_store import StatusStore
+from project.utils import create_webdriver, save_to_json, encode_string
+import pytest
+
+
+@pytest.fixture
+def driver():
+    """
+    A headless Firefox for the tests of the SeleniumScraper, the test is skipped in case no browser is installed.
+    """
+    driver = create_webdriver("firefox", is_headless=True)
+    if driver is None:
+        pytest.skip("Firefox or its webdriver is not installed")
+    yield driver
+    driver.quit()
+
+
+@pytest.fixture
+def creds_path(tmp_path) -> str:
+    """
+    A creds.json with the login the FakeMyTUD accepts by default.
+    """
+    path: str = str(tmp_path / "creds.json")
+    save_to_json({"net_id": "student", "net_pass": encode_string("password")}, path)
+    return path
+
+
+@pytest.fixture
+def store(tmp_path):
+    """
+    A StatusStore in a temporary database.
+    """
+    store = StatusStore(str(tmp_path / "status.db"))
+    yield store
+    store.close()
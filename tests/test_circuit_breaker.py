@@ -0,0 +1,126 @@
+from project.circuit_breaker import CircuitBreaker
+from project.fakes.mytud import FakeMyTUD
+from project.http_scraper import HttpScraper
+from project.courses import Courses
+from project.course import Course
+from concurrent.futures import ThreadPoolExecutor
+from project.status import CourseStatus
+import project.circuit_breaker
+import threading
+import pytest
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now: list[float] = [1000.0]
+    monkeypatch.setattr(project.circuit_breaker.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_opens_after_the_threshold_of_failures_in_a_row(clock):
+    breaker = CircuitBreaker(threshold=3, cooldown=60)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.is_open
+    assert not breaker.allow()
+    assert breaker.retry_in == pytest.approx(60)
+
+
+def test_a_success_resets_the_failures(clock):
+    breaker = CircuitBreaker(threshold=3, cooldown=60)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.allow()
+    assert breaker.failures == 1
+
+
+def test_lets_a_check_through_after_the_cooldown(clock):
+    breaker = CircuitBreaker(threshold=1, cooldown=60)
+    breaker.record_failure()
+    clock[0] += 30
+    assert breaker.retry_in == pytest.approx(30)
+    clock[0] += 30
+    assert breaker.allow()
+
+
+def test_stays_open_for_another_cooldown_when_the_trial_check_fails(clock):
+    breaker = CircuitBreaker(threshold=2, cooldown=60)
+    breaker.record_failure()
+    breaker.record_failure()
+    clock[0] += 60
+    assert breaker.allow()
+    breaker.record_failure()
+    assert not breaker.allow()
+    assert breaker.retry_in == pytest.approx(60)
+
+
+def test_lets_only_a_single_trial_check_through_at_a_time(clock):
+    breaker = CircuitBreaker(threshold=1, cooldown=60)
+    breaker.record_failure()
+    clock[0] += 60
+    barrier = threading.Barrier(16)
+
+    def ask() -> bool:
+        barrier.wait()
+        return breaker.allow()
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        allowed: list[bool] = list(executor.map(lambda _: ask(), range(16)))
+    assert allowed.count(True) == 1
+    assert breaker.is_open
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.allow() and breaker.allow()
+
+
+def test_lets_another_trial_through_when_the_first_never_reports_back(clock):
+    breaker = CircuitBreaker(threshold=1, cooldown=60)
+    breaker.record_failure()
+    clock[0] += 60
+    assert breaker.allow()
+    clock[0] += 30
+    assert not breaker.allow()
+    assert breaker.retry_in == pytest.approx(30)
+    clock[0] += 30
+    assert breaker.allow()
+
+
+def test_closes_when_the_trial_check_succeeds(clock):
+    breaker = CircuitBreaker(threshold=1, cooldown=60)
+    breaker.record_failure()
+    clock[0] += 60
+    breaker.record_success()
+    assert not breaker.is_open
+    assert breaker.failures == 0
+
+
+def test_the_threshold_must_be_positive():
+    with pytest.raises(ValueError):
+        CircuitBreaker(threshold=0)
+
+
+def test_a_refused_login_fails_every_course_and_is_counted_by_the_breaker():
+    courses = Courses([Course("CSE1100", "Course"), Course("CSE1200", "Course")])
+    breaker = CircuitBreaker(threshold=1, cooldown=60)
+    with FakeMyTUD({"CSE1100": CourseStatus.AVAILABLE}) as fake:
+        scraper = HttpScraper(courses, {"JSESSIONID": "expired"}, base_url=fake.url, breaker=breaker, backoff=0.0)
+        scraper.scrape_for_courses()
+    assert scraper.statuses == {}
+    assert set(scraper.failures) == {"CSE1100", "CSE1200"}
+    assert all(isinstance(error, PermissionError) for error in scraper.failures.values())
+    assert breaker.is_open
+
+
+def test_a_login_that_keeps_failing_fails_every_course():
+    with FakeMyTUD({}) as fake:
+        url: str = fake.url
+    scraper = HttpScraper(Courses([Course("CSE1100", "Course")]), {"JSESSIONID": "fake-session"}, base_url=url,
+                          timeout=1.0, retries=2, backoff=0.0, breaker=CircuitBreaker(threshold=2))
+    scraper.scrape_for_courses()
+    assert list(scraper.failures) == ["CSE1100"]
+    assert scraper.breaker.failures == 1
+    assert scraper.metrics.total("failures") == 1
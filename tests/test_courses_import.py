@@ -0,0 +1,78 @@
+from project.courses import Courses
+from project.course import Course
+import json
+import pytest
+
+
+def write(path, content: str) -> str:
+    path.write_text(content)
+    return str(path)
+
+
+def test_a_csv_without_a_header_keeps_its_first_course(tmp_path):
+    courses = Courses([])
+    counts = courses.import_courses(write(tmp_path / "export.csv", "EE1000,Circuits,false\nCSE1100,CO,yes\n"))
+    assert counts == {"added": 2, "merged": 0, "skipped": 0}
+    assert [(course.code, course.name, course.completed) for course in courses.courses] == \
+        [("EE1000", "Circuits", False), ("CSE1100", "CO", True)]
+
+
+def test_the_columns_of_a_csv_are_found_by_their_header(tmp_path):
+    courses = Courses([])
+    courses.import_courses(write(tmp_path / "export.csv",
+                                 "ECTS,Title,Course Code,Passed\n5,Calculus,wi1421lr,no\n5,Circuits,EE1000,yes\n"))
+    assert [(course.code, course.name, course.completed) for course in courses.courses] == \
+        [("WI1421LR", "Calculus", False), ("EE1000", "Circuits", True)]
+
+
+def test_rows_of_known_courses_are_merged(tmp_path):
+    courses = Courses([Course("cse1100", ""), Course("CSE1200", "Calculus")])
+    counts = courses.import_courses(write(tmp_path / "export.csv", "code,name,completed\n"
+                                                                   " cse 1100,Computer Organisation,no\n"
+                                                                   "CSE1200,Other name,no\n"
+                                                                   "CSE1200,,yes\n"
+                                                                   "CSE1200,,no\n"))
+    assert counts == {"added": 0, "merged": 4, "skipped": 0}
+    assert len(courses) == 2
+    assert courses.get("CSE1100").name == "Computer Organisation"
+    # A course keeps its name and stays completed once any row says so
+    assert courses.get("CSE1200").name == "Calculus"
+    assert courses.get("CSE1200").completed
+
+
+def test_rows_without_a_course_code_are_skipped(tmp_path, caplog):
+    courses = Courses([])
+    counts = courses.import_courses(write(tmp_path / "export.csv", "code\nXX\n12345\n\nAE1110-I\n"))
+    assert counts == {"added": 1, "merged": 0, "skipped": 3}
+    assert [course.code for course in courses.courses] == ["AE1110-I"]
+    assert "'XX'" in caplog.text and "'12345'" in caplog.text
+
+
+def test_codes_with_letters_after_the_first_digit_are_accepted(tmp_path):
+    courses = Courses([])
+    counts = courses.import_courses(write(tmp_path / "export.csv", "code\nAR1A010\nee4c12\nIN4MA03\nTI3115TU\n"))
+    assert counts == {"added": 4, "merged": 0, "skipped": 0}
+    assert [course.code for course in courses.courses] == ["AR1A010", "EE4C12", "IN4MA03", "TI3115TU"]
+
+
+def test_json_lines_are_imported_and_broken_lines_skipped(tmp_path):
+    lines: list[str] = [json.dumps({"Code": "CSE1100", "name": "CO"}), "", "{broken", "[1]",
+                        json.dumps({"course_code": "cse1100", "passed": True}), json.dumps({"code": "TI1206TU"})]
+    courses = Courses([])
+    counts = courses.import_courses(write(tmp_path / "dump.jsonl", "\n".join(lines)))
+    assert counts == {"added": 2, "merged": 1, "skipped": 0}
+    assert courses.get("CSE1100").completed
+
+
+def test_the_result_can_be_read_back_after_saving(tmp_path):
+    courses = Courses([])
+    courses.import_courses(write(tmp_path / "export.csv", "EE1000,Circuits,true\nEE1000,Circuits,false\n"))
+    courses.save(str(tmp_path / "courses.csv"))
+    loaded = Courses.create_courses_from_path(str(tmp_path / "courses.csv"))
+    assert [(course.code, course.name, course.completed) for course in loaded.courses] == \
+        [("EE1000", "Circuits", True)]
+
+
+def test_only_csv_and_json_lines_can_be_imported(tmp_path):
+    with pytest.raises(ValueError):
+        Courses([]).import_courses(write(tmp_path / "export.txt", "EE1000"))
@@ -0,0 +1,22 @@
+from project.http_scraper import HttpScraper
+from project.daemon import WatchDaemon
+from project.fakes.mytud import FakeMyTUD
+from project.status import CourseStatus
+from project.courses import Courses
+from project.course import Course
+
+
+def test_a_failing_notification_does_not_stop_the_daemon(creds_path):
+    statuses: dict[str, CourseStatus] = {"CSE1100": CourseStatus.AVAILABLE, "CSE1200": CourseStatus.CLOSED}
+    with FakeMyTUD(statuses) as fake:
+        # The creds.json has no email credentials, so sending the email raises
+        daemon = WatchDaemon(lambda: HttpScraper(Courses([Course(code, "Course") for code in statuses]),
+                                                 dict([fake.cookie]), base_url=fake.url, creds_path=creds_path),
+                             "m", min_interval=60, max_interval=600)
+        daemon._scrape_once()
+        scraper: HttpScraper = daemon.scraper
+        daemon._scrape_once()
+    # The scraper is kept and the next scrape compares against the statuses of the first one
+    assert daemon.scraper is scraper
+    assert daemon._previous == statuses
+    assert daemon.interval == 60
@@ -0,0 +1,63 @@
+from project.selenium_scraper import SeleniumScraper
+from project.http_scraper import HttpScraper
+from project.fakes.mytud import FakeMyTUD
+from project.status import CourseStatus
+from project.courses import Courses
+from project.course import Course
+import pytest
+
+STATUSES: dict[str, CourseStatus] = {
+    "CSE1100": CourseStatus.AVAILABLE,
+    "CSE1200": CourseStatus.CLOSED,
+    "CSE1300": CourseStatus.NOT_FOUND,
+    "CSE1400": CourseStatus.UNABLE,
+    "CSE1500": CourseStatus.NOT_IN_PROGRAM,
+}
+
+
+class UnauthorisedMyTUD(FakeMyTUD):
+    """
+    A FakeMyTUD that answers every request of a logged in session with 401 Unauthorized.
+    """
+    def respond(self, method: str, path: str, body: bytes) -> tuple[int, bytes, str]:
+        return 401, b'{"error": "unauthorized"}', "application/json"
+
+
+def courses() -> Courses:
+    # CSE1600 is not known to MyTUD at all
+    return Courses([Course(code, "Course") for code in [*STATUSES, "CSE1600"]])
+
+
+def test_reads_the_status_of_every_course():
+    with FakeMyTUD(STATUSES) as fake:
+        scraper = HttpScraper(courses(), dict([fake.cookie]), base_url=fake.url)
+        scraper.scrape_for_courses()
+    assert scraper.statuses == {**STATUSES, "CSE1600": CourseStatus.NOT_FOUND}
+    assert [course.code for course in scraper.available_courses.courses] == ["CSE1100"]
+    assert scraper.failures == {}
+
+
+def test_a_redirect_to_the_login_page_is_refused():
+    with FakeMyTUD(STATUSES) as fake:
+        scraper = HttpScraper(courses(), {"JSESSIONID": "expired"}, base_url=fake.url)
+        assert not scraper.has_valid_session()
+        with pytest.raises(PermissionError, match="302"):
+            scraper._login()
+
+
+def test_an_unauthorised_session_is_refused():
+    with UnauthorisedMyTUD(STATUSES) as fake:
+        scraper = HttpScraper(courses(), dict([fake.cookie]), base_url=fake.url)
+        with pytest.raises(PermissionError, match="401"):
+            scraper._check_course(Course("CSE1100", "Course"))
+
+
+@pytest.mark.parametrize("batch", [True, False])
+def test_reads_the_same_statuses_as_the_browser(driver, creds_path, batch):
+    with FakeMyTUD(STATUSES, debounce=0.05) as fake:
+        http = HttpScraper(courses(), dict([fake.cookie]), base_url=fake.url)
+        http.scrape_for_courses()
+        browser = SeleniumScraper(driver, courses(), base_url=fake.url, batch=batch, creds_path=creds_path)
+        browser.scrape_for_courses(close=False)
+    assert browser.statuses == http.statuses
+    assert browser.failures == {}
@@ -0,0 +1,74 @@
+from project.mailer import Mailer, MailDigest, SMTPSessionPool
+from project.fakes.smtp import FakeSMTP
+from project.notifier import Notifier
+from project.courses import Courses
+from project.course import Course
+import time
+
+OPEN_COURSES: Courses = Courses([Course("CSE1100", "Computer Organisation")])
+
+
+def mailer(pool: SMTPSessionPool | None = None) -> Mailer:
+    return Mailer("student@example.com, parent@example.com", "script@example.com", "password",
+                  pool=pool or SMTPSessionPool())
+
+
+def test_the_emails_reuse_one_logged_in_connection():
+    pool = SMTPSessionPool()
+    with FakeSMTP() as smtp:
+        for _ in range(3):
+            mailer(pool).deliver(OPEN_COURSES, smtp.port, smtp.host, use_ssl=False, timeout=5)
+        pool.close()
+    assert smtp.connections == 1 and pool.connects == 1
+    assert len(smtp.messages) == 3
+    assert smtp.messages[0]["to"] == ["student@example.com", "parent@example.com"]
+
+
+def test_sends_again_over_a_new_connection_after_it_was_dropped():
+    pool = SMTPSessionPool()
+    with FakeSMTP(max_messages=1) as smtp:
+        for _ in range(3):
+            mailer(pool).deliver(OPEN_COURSES, smtp.port, smtp.host, use_ssl=False, timeout=5)
+        pool.close()
+    assert len(smtp.messages) == 3
+    assert smtp.connections == 3
+
+
+def test_a_timed_out_email_is_not_sent_twice():
+    with FakeSMTP(latency=0.1) as smtp:
+        sender: Mailer = mailer()
+        # Every attempt gives up long before the email is through, the retries wait for the first one
+        notifier = Notifier({"email": lambda: sender.send_mail_async(OPEN_COURSES, smtp.port, smtp.host,
+                                                                      use_ssl=False, timeout=5)},
+                            timeout=0.3, retries=5, backoff=0.01)
+        assert notifier.send() == {"email": True}
+        time.sleep(0.5)
+    assert smtp.connections == 1
+    assert len(smtp.messages) == 1
+
+
+def test_the_changes_within_a_window_are_sent_as_one_digest():
+    with FakeSMTP() as smtp, MailDigest(mailer(), window=0.3, port=smtp.port, smtp_host=smtp.host,
+                                        use_ssl=False, timeout=5) as digest:
+        digest.add(Courses([]), ["CSE1100"])
+        digest.add(OPEN_COURSES, ["CSE1100", "CSE1200"])
+        digest.add(OPEN_COURSES, ["CSE1300"])
+        assert smtp.messages == []
+        time.sleep(0.6)
+        assert digest.sent == 1
+        assert len(smtp.messages) == 1
+    data: str = smtp.messages[0]["data"]
+    assert "3 status changes were noticed" in data and "CSE1100, CSE1200" in data and "CSE1300" in data
+    assert "Subject: Open courses available!" in data
+
+
+def test_a_digest_that_could_not_be_sent_is_sent_with_the_next_one():
+    with FakeSMTP(fail_first=1) as smtp:
+        digest = MailDigest(mailer(), window=60, port=smtp.port, smtp_host=smtp.host, use_ssl=False, timeout=5)
+        digest.add(OPEN_COURSES, ["CSE1100"])
+        assert not digest.flush()
+        digest.add(OPEN_COURSES, ["CSE1200"])
+        digest.close()
+    assert digest.sent == 1
+    assert len(smtp.messages) == 1
+    assert "2 status changes were noticed" in smtp.messages[0]["data"]
@@ -0,0 +1,62 @@
+from project.fakes.smtp import FakeSMTP
+from project.fakes.telegram_api import FakeTelegramAPI
+from project.mailer import Mailer, SMTPSessionPool
+from project.telegram_bot import TelegramBot
+from project.notifier import Notifier
+from project.courses import Courses
+from project.course import Course
+import asyncio
+import pytest
+
+OPEN_COURSES: Courses = Courses([Course("CSE1100", "Computer Organisation")])
+
+
+def test_retries_a_failing_channel_until_it_succeeds():
+    with FakeSMTP(fail_first=2) as smtp:
+        mailer = Mailer("student@example.com", "script@example.com", "password", pool=SMTPSessionPool())
+        notifier = Notifier({"email": lambda: mailer.send_mail_async(OPEN_COURSES, smtp.port, smtp.host,
+                                                                      use_ssl=False, timeout=5)},
+                            timeout=5, retries=3, backoff=0.01)
+        assert notifier.send() == {"email": True}
+        assert smtp.connections == 3
+        assert len(smtp.messages) == 1
+        assert "CSE1100" in smtp.messages[0]["data"]
+
+
+def test_gives_up_after_the_last_attempt():
+    attempts: list[int] = []
+
+    async def fail() -> None:
+        attempts.append(1)
+        raise ConnectionError("down")
+
+    assert Notifier({"broken": fail}, retries=3, backoff=0.01).send() == {"broken": False}
+    assert len(attempts) == 3
+
+
+def test_a_failing_or_slow_channel_does_not_hold_up_the_others():
+    async def hang() -> None:
+        await asyncio.sleep(10)
+
+    async def fail() -> None:
+        raise RuntimeError("broken")
+
+    with FakeSMTP() as smtp, FakeTelegramAPI(fail_first=1) as telegram:
+        mailer = Mailer("student@example.com", "script@example.com", "password", pool=SMTPSessionPool())
+        bot = TelegramBot(telegram.token, "42", base_url=telegram.base_url)
+        channels = {
+            "email": lambda: mailer.send_mail_async(OPEN_COURSES, smtp.port, smtp.host, use_ssl=False, timeout=5),
+            "telegram": lambda: bot.send_notification_async(OPEN_COURSES),
+            "slow": hang,
+            "broken": fail,
+        }
+        results = Notifier(channels, timeout=0.5, retries=2, backoff=0.01).send()
+        assert results == {"email": True, "telegram": True, "slow": False, "broken": False}
+        assert len(smtp.messages) == 1
+        # The failed first attempt of the bot is retried without sending the email again
+        assert [message["chat_id"] for message in telegram.messages] == ["42"]
+
+
+def test_needs_at_least_one_attempt():
+    with pytest.raises(ValueError):
+        Notifier({}, retries=0)
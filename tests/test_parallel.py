@@ -0,0 +1,39 @@
+from project.fakes.mytud import FakeMyTUD, DEFAULT_MIX
+from project.selenium_scraper import SeleniumScraper
+from project.http_scraper import HttpScraper
+from project.status import CourseStatus
+from project.courses import Courses
+from project.course import Course
+
+STATUSES: dict[str, CourseStatus] = FakeMyTUD.generate_courses(24, DEFAULT_MIX, seed=1)
+
+
+def courses() -> Courses:
+    return Courses([Course(code, f"Course {code}") for code in STATUSES])
+
+
+def test_a_parallel_scrape_finds_the_same_as_a_sequential_one():
+    with FakeMyTUD(STATUSES, latency=0.005) as fake:
+        sequential = HttpScraper(courses(), dict([fake.cookie]), base_url=fake.url)
+        sequential.scrape_for_courses()
+        parallel = HttpScraper(courses(), dict([fake.cookie]), workers=4, base_url=fake.url)
+        parallel.scrape_for_courses()
+    assert sequential.statuses == STATUSES
+    assert parallel.statuses == sequential.statuses
+    assert list(parallel.statuses) == list(sequential.statuses)
+    assert [course.code for course in parallel.available_courses.courses] == \
+        [course.code for course in sequential.available_courses.courses]
+    assert parallel.failures == {}
+
+
+def test_parallel_browsers_find_the_same_as_a_single_one(driver, creds_path):
+    with FakeMyTUD(STATUSES, debounce=0.05) as fake:
+        sequential = SeleniumScraper(driver, courses(), base_url=fake.url, batch=False, creds_path=creds_path)
+        sequential.scrape_for_courses(close=False)
+        parallel = SeleniumScraper(driver, courses(), workers=2, base_url=fake.url, batch=False,
+                                   creds_path=creds_path)
+        parallel.scrape_for_courses(close=False)
+    assert sequential.statuses == STATUSES
+    assert parallel.statuses == sequential.statuses
+    assert [course.code for course in parallel.available_courses.courses] == \
+        [course.code for course in sequential.available_courses.courses]
@@ -0,0 +1,75 @@
+from project.fakes.replay import ReplayMyTUD, replay
+from project.fakes.mytud import FakeMyTUD
+from project.http_scraper import HttpScraper
+from project.recording import SessionRecording
+from project.constants import API_SEARCH_PATH
+from project.mytud_api import search_body
+from project.status import CourseStatus
+from project.courses import Courses
+from project.course import Course
+import urllib3
+import json
+import pytest
+
+STATUSES: dict[str, CourseStatus] = {
+    "CSE1100": CourseStatus.AVAILABLE,
+    "CSE1200": CourseStatus.CLOSED,
+    "CSE1300": CourseStatus.NOT_FOUND,
+    "CSE1400": CourseStatus.UNABLE,
+    "CSE1500": CourseStatus.NOT_IN_PROGRAM,
+}
+
+
+@pytest.fixture
+def recording() -> SessionRecording:
+    with FakeMyTUD(STATUSES) as fake:
+        recording = SessionRecording(fake.url)
+        scraper = HttpScraper(Courses([Course(code, "Course") for code in STATUSES]), dict([fake.cookie]),
+                              base_url=fake.url, recording=recording)
+        scraper.scrape_for_courses()
+    return recording
+
+
+def request(fake: FakeMyTUD, method: str, path: str, body: dict[str] | None = None) -> urllib3.HTTPResponse:
+    headers: dict[str, str] = {"Cookie": "=".join(fake.cookie), "Content-Type": "application/json"}
+    return urllib3.PoolManager().request(method, fake.url + path, body=json.dumps(body) if body else None,
+                                         headers=headers, redirect=False)
+
+
+def test_the_http_backend_replays_the_recorded_outcomes(recording):
+    result: dict[str] = replay(recording, "http", speed=0)
+    assert result["outcomes"] == {code: status.value for code, status in STATUSES.items()}
+    assert result["mismatches"] == [] and result["misses"] == []
+
+
+def test_the_browser_replays_the_recorded_outcomes(recording):
+    try:
+        result: dict[str] = replay(recording, "selenium", speed=0, batch=False)
+    except RuntimeError:
+        pytest.skip("Firefox or its webdriver is not installed")
+    assert result["mismatches"] == [] and result["misses"] == []
+
+
+def test_serves_every_recorded_exchange_with_its_status():
+    recording = SessionRecording("https://mytud.example/")
+    recording.add_exchange("GET", "https://mytud.example/api/profile", None, 200, '{"name": "student"}', 0.0)
+    recording.add_exchange("POST", API_SEARCH_PATH, search_body("CSE1100"), 500, '{"error": "down"}', 0.0)
+    recording.add_exchange("POST", API_SEARCH_PATH, search_body("CSE1200"), 200, '{"hits": {"hits": []}}', 0.0)
+    with ReplayMyTUD(recording, speed=0) as fake:
+        assert json.loads(request(fake, "GET", "api/profile").data) == {"name": "student"}
+        assert request(fake, "POST", API_SEARCH_PATH, search_body("cse1100")).status == 500
+        assert json.loads(request(fake, "POST", API_SEARCH_PATH, search_body("CSE1200")).data) == \
+            {"hits": {"hits": []}}
+        assert request(fake, "GET", "api/other").status == 404
+        assert json.loads(request(fake, "POST", API_SEARCH_PATH, search_body("CSE1300")).data)["hits"]["hits"] == []
+        assert fake.misses == ["search CSE1300"]
+
+
+def test_serves_the_recorded_pages():
+    recording = SessionRecording()
+    recording.add_snapshot("CSE1100", "course", "<p>Recorded page</p>", CourseStatus.AVAILABLE, 0.5)
+    with ReplayMyTUD(recording, speed=0) as fake:
+        response: urllib3.HTTPResponse = request(fake, "GET", "pages/course/cse1100")
+        assert response.status == 200 and response.data == b"<p>Recorded page</p>"
+        assert request(fake, "GET", "pages/search/CSE1100").status == 404
+        assert b'"/pages/"' in request(fake, "GET", "app.js").data
@@ -0,0 +1,73 @@
+from project.scheduler import SignupScheduler
+from project.status_store import StatusStore
+from project.status import CourseStatus
+from project.course import Course
+import pytest
+
+NOW: float = 1_700_000_000.0
+
+
+def courses(amount: int) -> list[Course]:
+    return [Course(f"CSE{1000 + i}") for i in range(amount)]
+
+
+def check(store: StatusStore, chosen: list[Course], now: float) -> None:
+    store.record({course.code: CourseStatus.CLOSED for course in chosen}, now)
+
+
+def test_no_more_courses_are_handed_out_than_the_budget_allows(store):
+    scheduler = SignupScheduler(store, checks_per_hour=5)
+    chosen: list[Course] = scheduler.due(courses(12), now=NOW)
+    assert len(chosen) == 5
+    check(store, chosen, NOW)
+    assert scheduler.due(courses(12), now=NOW + 60) == []
+    assert scheduler.next_due_in(courses(12), now=NOW + 60) == pytest.approx(3600 - 60)
+    # The checks of an hour ago no longer count against the budget
+    assert len(scheduler.due(courses(12), now=NOW + 3600)) == 5
+
+
+def test_only_recorded_checks_count_against_the_budget(store):
+    scheduler = SignupScheduler(store, checks_per_hour=5)
+    chosen: list[Course] = scheduler.due(courses(12), now=NOW)
+    # The checks failed, so nothing was recorded and the courses are handed out again
+    assert [course.code for course in scheduler.due(courses(12), now=NOW + 60)] == [course.code for course in chosen]
+    check(store, chosen[:3], NOW + 60)
+    assert len(scheduler.due(courses(12), now=NOW + 120)) == 2
+
+
+def test_runs_that_share_the_store_share_the_budget(store):
+    check(store, SignupScheduler(store, checks_per_hour=5).due(courses(12), now=NOW), NOW)
+    # A one-shot run starts with a new scheduler, the checks of the run before still count
+    scheduler = SignupScheduler(store, checks_per_hour=5)
+    assert scheduler.due(courses(12), now=NOW + 60) == []
+    assert scheduler.next_due_in(courses(12), now=NOW + 60) == pytest.approx(3600 - 60)
+
+
+def test_a_checked_course_is_not_due_before_its_interval(store):
+    scheduler = SignupScheduler(store, checks_per_hour=60, min_interval=300)
+    check(store, scheduler.due(courses(2), now=NOW), NOW)
+    assert scheduler.due(courses(2), now=NOW + 10) == []
+    assert scheduler.next_due_in(courses(2), now=NOW + 10) == pytest.approx(290)
+    assert len(scheduler.due(courses(2), now=NOW + 300)) == 2
+
+
+def test_the_courses_most_likely_to_open_are_checked_first(store):
+    store.record({"CSE1000": CourseStatus.NOT_FOUND, "CSE1001": CourseStatus.CLOSED}, NOW - 86400)
+    scheduler = SignupScheduler(store, checks_per_hour=1)
+    assert [course.code for course in scheduler.due(courses(2), now=NOW)] == ["CSE1001"]
+
+
+def test_a_course_is_checked_more_often_around_its_past_opening(store):
+    year: float = 365.25 * 24 * 3600
+    # Both sign ups opened before, CSE1000 around this date last year and CSE1001 half a year from it
+    store.record({"CSE1000": CourseStatus.AVAILABLE}, NOW - year)
+    store.record({"CSE1001": CourseStatus.AVAILABLE}, NOW - year / 2)
+    store.record({"CSE1000": CourseStatus.CLOSED, "CSE1001": CourseStatus.CLOSED}, NOW - 86400)
+    scheduler = SignupScheduler(store, checks_per_hour=10)
+    intervals: dict[str, float] = scheduler.intervals(scheduler.weights(["CSE1000", "CSE1001"], NOW))
+    assert intervals["CSE1000"] < intervals["CSE1001"]
+
+
+def test_the_budget_must_allow_a_check(store):
+    with pytest.raises(ValueError):
+        SignupScheduler(store, checks_per_hour=0)
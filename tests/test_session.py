@@ -0,0 +1,80 @@
+from project.fakes.mytud import FakeMyTUD
+from project.selenium_scraper import SeleniumScraper
+from project.http_scraper import HttpScraper
+from project.session import SessionCache
+from project.status import CourseStatus
+from project.courses import Courses
+from project.course import Course
+import json
+import os
+
+SESSION: dict[str] = {"cookies": [{"name": "JSESSIONID", "value": "abc", "domain": "127.0.0.1"}],
+                      "local_storage": {"token": "xyz"}}
+
+
+class SessionDriver:
+    """
+    Stands in for a logged in driver, it only answers what SessionCache.save asks for.
+    """
+    def __init__(self, session: dict[str]):
+        self.session: dict[str] = session
+
+    def get_cookies(self) -> list[dict[str]]:
+        return self.session["cookies"]
+
+    def execute_script(self, script: str, *args) -> dict[str]:
+        return self.session["local_storage"]
+
+
+def test_saves_and_loads_the_session(tmp_path):
+    cache = SessionCache(str(tmp_path / "session.json"))
+    assert cache.load() is None
+    cache.save(SessionDriver(SESSION))
+    assert cache.load() == SESSION
+    cache.clear()
+    assert cache.load() is None
+
+
+def test_replaces_the_session_atomically_and_only_readable_by_the_owner(tmp_path):
+    path: str = str(tmp_path / "session.json")
+    with open(path, 'w') as f:
+        f.write("old")
+    os.chmod(path, 0o644)
+    SessionCache(path).save(SessionDriver(SESSION))
+    assert os.stat(path).st_mode & 0o777 == 0o600
+    assert os.listdir(tmp_path) == ["session.json"]
+    with open(path) as f:
+        assert json.load(f) == SESSION
+
+
+def test_ignores_an_unreadable_session(tmp_path):
+    path: str = str(tmp_path / "session.json")
+    with open(path, 'w') as f:
+        f.write("{not json")
+    assert SessionCache(path).load() is None
+
+
+def test_reuses_a_valid_saved_session_without_logging_in(tmp_path):
+    cache = SessionCache(str(tmp_path / "session.json"))
+    with FakeMyTUD({"CSE1100": CourseStatus.AVAILABLE}) as fake:
+        cache.save(SessionDriver(fake.session()))
+        scraper: HttpScraper = HttpScraper.from_session_cache(cache, Courses([Course("CSE1100", "Course")]),
+                                                              base_url=fake.url, backoff=0.0)
+        assert scraper.has_valid_session()
+        scraper.scrape_for_courses()
+        assert scraper.statuses == {"CSE1100": CourseStatus.AVAILABLE}
+
+        expired: dict[str] = fake.session()
+        expired["cookies"][0]["value"] = "expired"
+        cache.save(SessionDriver(expired))
+        assert not HttpScraper.from_session_cache(cache, Courses([]), base_url=fake.url).has_valid_session()
+
+
+def test_the_browser_skips_the_login_form_with_a_valid_saved_session(tmp_path, driver):
+    cache = SessionCache(str(tmp_path / "session.json"))
+    with FakeMyTUD({}) as fake:
+        cache.save(SessionDriver(fake.session()))
+        assert not SeleniumScraper.open_sign_up(driver, fake.url, cache)
+        driver.delete_all_cookies()
+        cache.clear()
+        assert SeleniumScraper.open_sign_up(driver, fake.url, cache)
@@ -0,0 +1,64 @@
+from project.shared_cache import SharedResultCache
+from project.http_scraper import HttpScraper
+from project.fakes.mytud import FakeMyTUD
+from project.status import CourseStatus
+from project.courses import Courses
+from project.course import Course
+import pytest
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def cache(request, tmp_path):
+    cache = SharedResultCache(str(tmp_path / "shared.db") if request.param == "sqlite" else None, ttl=300)
+    yield cache
+    cache.close()
+
+
+def test_an_outcome_expires_after_the_ttl(cache):
+    cache.put("cse1100", CourseStatus.CLOSED, checked_at=1000.0)
+    assert cache.get("CSE1100", now=1299.0) == CourseStatus.CLOSED
+    assert cache.get("CSE1100", now=1300.0) is None
+
+
+def test_only_outcomes_that_are_the_same_for_everyone_are_shared(cache):
+    cache.put("CSE1100", CourseStatus.NOT_FOUND, checked_at=1000.0)
+    cache.put("CSE1200", CourseStatus.UNABLE, checked_at=1000.0)
+    cache.put("CSE1300", CourseStatus.NOT_IN_PROGRAM, checked_at=1000.0)
+    assert cache.get("CSE1100", now=1000.0) == CourseStatus.NOT_FOUND
+    assert cache.get("CSE1200", now=1000.0) is None
+    assert cache.get("CSE1300", now=1000.0) is None
+
+
+def test_an_open_outcome_removes_the_shared_one(cache):
+    cache.put("CSE1100", CourseStatus.CLOSED, checked_at=1000.0)
+    cache.put("CSE1100", CourseStatus.UNKNOWN, checked_at=1010.0)
+    assert cache.get("CSE1100", now=1020.0) == CourseStatus.CLOSED
+    cache.put("CSE1100", CourseStatus.AVAILABLE, checked_at=1030.0)
+    assert cache.get("CSE1100", now=1040.0) is None
+
+
+def test_outcomes_are_shared_through_the_database_file(tmp_path):
+    path: str = str(tmp_path / "shared.db")
+    first, second = SharedResultCache(path, ttl=300), SharedResultCache(path, ttl=300)
+    first.put("CSE1100", CourseStatus.CLOSED, checked_at=1000.0)
+    assert second.get("CSE1100", now=1100.0) == CourseStatus.CLOSED
+    second.put("CSE1100", CourseStatus.AVAILABLE, checked_at=1100.0)
+    assert first.get("CSE1100", now=1100.0) is None
+    first.close()
+    second.close()
+
+
+def test_a_second_user_does_not_search_a_shared_course_again(tmp_path):
+    statuses: dict[str, CourseStatus] = {"CSE1100": CourseStatus.CLOSED, "CSE1200": CourseStatus.AVAILABLE}
+    courses: list[Course] = [Course(code, "Course") for code in statuses]
+    cache = SharedResultCache(str(tmp_path / "shared.db"))
+    with FakeMyTUD(statuses) as fake:
+        first = HttpScraper(Courses(courses), dict([fake.cookie]), base_url=fake.url, shared_cache=cache)
+        first.scrape_for_courses()
+        second = HttpScraper(Courses(courses), dict([fake.cookie]), base_url=fake.url, shared_cache=cache)
+        second.scrape_for_courses()
+    cache.close()
+    assert second.statuses == first.statuses == statuses
+    # The second user only logs in and checks the open course, the closed course is taken from the first one
+    assert first.metrics.total("round_trips") == 4
+    assert second.metrics.total("round_trips") == 3
@@ -0,0 +1,53 @@
+from project.status_store import StatusStore
+from project.status import CourseStatus
+
+
+def test_courses_recorded_for_the_first_time_count_as_changed(store):
+    assert store.record({"CSE1100": CourseStatus.CLOSED, "CSE1200": CourseStatus.NOT_FOUND}, 1000.0) == \
+        ["CSE1100", "CSE1200"]
+    assert store.get("CSE1100") == (CourseStatus.CLOSED, 1000.0)
+
+
+def test_only_a_different_status_counts_as_changed(store):
+    store.record({"CSE1100": CourseStatus.CLOSED, "CSE1200": CourseStatus.CLOSED}, 1000.0)
+    assert store.record({"CSE1100": CourseStatus.CLOSED, "CSE1200": CourseStatus.AVAILABLE}, 2000.0) == ["CSE1200"]
+    assert store.get("CSE1100") == (CourseStatus.CLOSED, 2000.0)
+    assert store.changes(CourseStatus.AVAILABLE) == {"CSE1200": [2000.0]}
+    assert store.changes(CourseStatus.CLOSED) == {"CSE1100": [1000.0], "CSE1200": [1000.0]}
+
+
+def test_an_unknown_outcome_keeps_the_last_known_status(store):
+    store.record({"CSE1100": CourseStatus.CLOSED}, 1000.0)
+    assert store.record({"CSE1100": CourseStatus.UNKNOWN}, 2000.0) == []
+    assert store.get("CSE1100") == (CourseStatus.CLOSED, 2000.0)
+    # Coming back with the same status after a failed check is not a change either
+    assert store.record({"CSE1100": CourseStatus.CLOSED}, 3000.0) == []
+
+
+def test_a_course_is_fresh_within_the_ttl(store):
+    assert not store.is_fresh("CSE1100", 300, now=1000.0)
+    store.record({"CSE1100": CourseStatus.CLOSED}, 1000.0)
+    assert store.is_fresh("CSE1100", 300, now=1299.0)
+    assert not store.is_fresh("CSE1100", 300, now=1300.0)
+    assert not store.is_fresh("CSE1100", 0, now=1000.0)
+
+
+def test_the_statuses_are_kept_between_runs(tmp_path):
+    path: str = str(tmp_path / "status.db")
+    store = StatusStore(path)
+    store.record({"CSE1100": CourseStatus.AVAILABLE}, 1000.0)
+    store.close()
+    store = StatusStore(path)
+    assert store.record({"CSE1100": CourseStatus.AVAILABLE}, 2000.0) == []
+    store.close()
+
+
+def test_every_check_is_logged(store):
+    store.record({"CSE1100": CourseStatus.CLOSED, "CSE1200": CourseStatus.CLOSED}, 1000.0)
+    store.record({"CSE1100": CourseStatus.UNKNOWN}, 2000.0)
+    store.record({"CSE1100": CourseStatus.CLOSED}, 3000.0)
+    assert store.checks_since(0.0) == [1000.0, 1000.0, 2000.0, 3000.0]
+    assert store.checks_since(2000.0) == [3000.0]
+    # Checks older than a day are dropped
+    store.record({"CSE1100": CourseStatus.CLOSED}, 1000.0 + 24 * 3600 + 1)
+    assert store.checks_since(0.0) == [2000.0, 3000.0, 1000.0 + 24 * 3600 + 1]
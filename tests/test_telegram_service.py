@@ -0,0 +1,118 @@
+from project.telegram_service import TelegramService, MessageRateLimiter
+from project.fakes.telegram_api import FakeTelegramAPI
+from project.status import CourseStatus
+from project.courses import Courses
+from project.course import Course
+from telegram.error import RetryAfter
+import asyncio
+import time
+import pytest
+
+COURSES: Courses = Courses([Course("CSE1100", "Computer Organisation"), Course("CSE1200", "Calculus"),
+                            Course("CSE1300", "Reasoning")])
+
+
+@pytest.fixture
+def telegram():
+    with FakeTelegramAPI() as telegram:
+        yield telegram
+
+
+@pytest.fixture
+def service(telegram):
+    service = TelegramService(telegram.token, ["1001", "1002"], base_url=telegram.base_url, poll_timeout=1,
+                              rate_limiter=MessageRateLimiter(per_chat=0.0, overall=1000.0))
+    with service:
+        service.update(COURSES, {"CSE1100": CourseStatus.AVAILABLE, "CSE1200": CourseStatus.CLOSED}, ["CSE1300"])
+        yield service
+
+
+def ask(telegram: FakeTelegramAPI, chat: int, command: str) -> str:
+    sent: int = len(telegram.messages)
+    telegram.push_message(chat, command)
+    assert telegram.wait_for_messages(sent + 1)
+    assert telegram.messages[sent]["chat_id"] == str(chat)
+    return telegram.messages[sent]["text"]
+
+
+def test_answers_the_commands_from_the_last_scrape(telegram, service):
+    status: str = ask(telegram, 1001, "/status")
+    assert "just now" in status and "1 open for sign up" in status and "1 the sign up is closed" in status
+    assert "1 could not be checked: CSE1300" in status and "CSE1100 Computer Organisation" in status
+    assert ask(telegram, 1002, "/courses").splitlines() == [
+        "CSE1100 Computer Organisation: open for sign up! (checked just now)",
+        "CSE1200 Calculus: the sign up is closed (checked just now)",
+        "CSE1300 Reasoning: not checked yet",
+    ]
+    assert ask(telegram, 1001, "/check cse1200") == "CSE1200 Calculus: the sign up is closed (checked just now)"
+    assert "not one of the followed courses" in ask(telegram, 1001, "/check CSE9999")
+    assert "Add the course code" in ask(telegram, 1001, "/check")
+
+
+def test_only_answers_the_registered_chats(telegram, service):
+    telegram.push_message(666, "/status")
+    assert not telegram.wait_for_messages(1, timeout=1.0)
+    assert ask(telegram, 1002, "/status")
+
+
+def test_sends_to_every_chat_or_a_single_one(telegram, service):
+    asyncio.run(service.send_notification_async(Courses([Course("CSE1100", "Computer Organisation")])))
+    asyncio.run(service.send("Only for you", chat_id="1002"))
+    assert telegram.wait_for_messages(3)
+    assert sorted(message["chat_id"] for message in telegram.messages[:2]) == ["1001", "1002"]
+    assert all("CSE1100" in message["text"] for message in telegram.messages[:2])
+    assert (telegram.messages[2]["chat_id"], telegram.messages[2]["text"]) == ("1002", "Only for you")
+
+
+def test_sending_without_a_running_bot_fails():
+    service = TelegramService("123456:fake-token", "1001")
+    with pytest.raises(RuntimeError):
+        asyncio.run(service.send("Hello"))
+
+
+def test_the_rate_limiter_spaces_the_messages_to_a_chat():
+    limiter = MessageRateLimiter(per_chat=0.2, overall=1000.0)
+    sent: dict[str, list[float]] = {"1": [], "2": []}
+
+    async def message(chat: str) -> None:
+        async def callback() -> None:
+            sent[chat].append(time.monotonic())
+        await limiter.process_request(callback, (), {}, "sendMessage", {"chat_id": chat}, None)
+
+    async def main() -> None:
+        await asyncio.gather(*[message(chat) for chat in ["1", "1", "1", "2"]])
+
+    start: float = time.monotonic()
+    asyncio.run(main())
+    assert [moment - start for moment in sent["1"]] == pytest.approx([0.0, 0.2, 0.4], abs=0.05)
+    # The other chat is not held up by the first one
+    assert sent["2"][0] - start < 0.1
+
+
+def test_the_rate_limiter_keeps_to_the_overall_limit():
+    limiter = MessageRateLimiter(per_chat=0.0, overall=20.0)
+    sent: list[float] = []
+
+    async def callback() -> None:
+        sent.append(time.monotonic())
+
+    async def main() -> None:
+        await asyncio.gather(*[limiter.process_request(callback, (), {}, "sendMessage", {"chat_id": str(chat)}, None)
+                               for chat in range(5)])
+
+    start: float = time.monotonic()
+    asyncio.run(main())
+    assert sent[-1] - start == pytest.approx(0.2, abs=0.05)
+
+
+def test_the_rate_limiter_tries_again_after_a_retry_after():
+    attempts: list[int] = []
+
+    async def callback() -> str:
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RetryAfter(0)
+        return "sent"
+
+    result = asyncio.run(MessageRateLimiter().process_request(callback, (), {}, "sendMessage", {"chat_id": "1"}, None))
+    assert result == "sent" and len(attempts) == 2
@@ -0,0 +1,67 @@
+from project.tenant_scheduler import TenantScheduler
+from project.tenants import TenantRegistry, Tenant
+from project.browser_pool import BrowserPool
+from project.fakes.mytud import FakeMyTUD
+from project.status import CourseStatus
+from project.utils import write_atomically
+from project.courses import Courses
+from project.course import Course
+import json
+import pytest
+
+STATUSES: dict[str, CourseStatus] = {"CSE1100": CourseStatus.AVAILABLE, "CSE1200": CourseStatus.CLOSED}
+CREDS: dict[str] = {"net_id": "student", "net_pass": ""}
+
+
+@pytest.fixture
+def registry(tmp_path) -> TenantRegistry:
+    return TenantRegistry(str(tmp_path / "tenants"))
+
+
+def test_every_tenant_keeps_its_own_files(registry):
+    registry.add("alice", CREDS, Courses([Course("CSE1100", "Course")]), notification_method="t")
+    registry.add("bob", {**CREDS, "net_id": "bob"}, Courses([Course("CSE1200", "Course")]))
+    assert registry.names() == ["alice", "bob"] and len(registry) == 2
+    alice, bob = registry.get("alice"), registry.get("bob")
+    assert [course.code for course in alice.courses.courses] == ["CSE1100"]
+    assert [course.code for course in bob.courses.courses] == ["CSE1200"]
+    assert (alice.creds["net_id"], bob.creds["net_id"]) == ("student", "bob")
+    assert (alice.notification_method, bob.notification_method) == ("t", "m")
+    registry.remove("alice")
+    assert "alice" not in registry and registry.get("bob").creds["net_id"] == "bob"
+
+
+def test_a_tenant_name_and_notification_method_are_checked(registry):
+    with pytest.raises(ValueError, match="letters"):
+        registry.add("../alice", CREDS)
+    tenant: Tenant = registry.add("alice", CREDS)
+    with pytest.raises(ValueError, match="already exists"):
+        registry.add("alice", CREDS)
+    with pytest.raises(ValueError, match="Notification method"):
+        tenant.notification_method = "x"
+    tenant.notification_method = "mt"
+    assert registry.get("alice").notification_method == "mt"
+    with pytest.raises(KeyError):
+        registry.get("bob")
+
+
+def test_a_failing_tenant_does_not_stop_the_others(registry):
+    courses = Courses([Course(code, "Course") for code in STATUSES])
+    # Notifies by Telegram without a registered chat, so nothing is sent
+    for name in ["alice", "bob", "carol"]:
+        registry.add(name, CREDS, courses, notification_method="t")
+    with FakeMyTUD(STATUSES) as fake:
+        # Bob has no saved session and the pool cannot start a browser for him to log in with
+        for name in ["alice", "carol"]:
+            write_atomically(registry.get(name).session_cache.path, json.dumps(fake.session()))
+        with BrowserPool(lambda: None) as pool:
+            scheduler = TenantScheduler(registry.tenants(), pool, backend="http", base_url=fake.url)
+            statuses: dict[str, dict[str, CourseStatus]] = scheduler.run()
+    assert statuses == {"alice": STATUSES, "carol": STATUSES}
+    assert list(scheduler.failures) == ["bob"]
+    assert isinstance(scheduler.failures["bob"], RuntimeError)
+    # Every tenant records its outcomes in its own database
+    for name in ["alice", "carol"]:
+        tenant: Tenant = registry.get(name)
+        assert tenant.store.get("CSE1100")[0] == CourseStatus.AVAILABLE
+        tenant.close()